@@ -1 +1 @@
-from app import db, routing, services, schemas
+from app import db, middleware, monitoring, routing, services, schemas
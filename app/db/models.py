@@ -1,6 +1,17 @@
 import uuid
 
-from sqlalchemy import UUID, Float, ForeignKey, String
+from sqlalchemy import (
+    UUID,
+    Boolean,
+    Computed,
+    Float,
+    ForeignKey,
+    Index,
+    String,
+    false,
+    text
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, declarative_base, mapped_column, relationship
 
 Base = declarative_base()
@@ -8,6 +19,10 @@ Base = declarative_base()
 
 class Menu(Base):  # type: ignore
     __tablename__ = 'menus'
+    __table_args__ = (
+        # Few menus wait for purge at a time, reads check them on every query
+        Index('ix_menus_deleted', 'id', postgresql_where=text('deleted')),
+    )
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         default=uuid.uuid4,
@@ -22,6 +37,14 @@ class Menu(Base):  # type: ignore
         String(512),
         nullable=False
     )
+    # Menu deleted in tombstone mode, it is hidden from reads until purge
+    # task removes it with its submenus and dishes
+    deleted: Mapped[Boolean] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=False,
+        server_default=false()
+    )
     submenus: Mapped[list['SubMenu']] = relationship(
         'SubMenu',
         back_populates='menu',
@@ -31,6 +54,9 @@ class Menu(Base):  # type: ignore
 
 class SubMenu(Base):  # type: ignore
     __tablename__ = 'submenus'
+    __table_args__ = (
+        Index('ix_submenus_menu_id', 'menu_id'),
+    )
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         default=uuid.uuid4,
@@ -62,6 +88,16 @@ class SubMenu(Base):  # type: ignore
 
 class Dish(Base):  # type: ignore
     __tablename__ = 'dishes'
+    __table_args__ = (
+        Index('ix_dishes_search_vector', 'search_vector',
+              postgresql_using='gin'),
+        # Keyset pagination of dishes list sorted by price or title, ids
+        # break ties
+        Index('ix_dishes_effective_price_id', 'effective_price', 'id'),
+        Index('ix_dishes_title_id', 'title', 'id'),
+        Index('ix_dishes_submenu_id_effective_price', 'submenu_id',
+              'effective_price', 'id'),
+    )
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         default=uuid.uuid4,
@@ -84,6 +120,27 @@ class Dish(Base):  # type: ignore
         Float,
         nullable=False
     )
+    # Sale discount in percents synchronized from the sheet, NULL if dish is
+    # not on sale
+    discount: Mapped[Float] = mapped_column(
+        Float,
+        nullable=True
+    )
+    # Price with sale discount applied, kept by database for filtering and
+    # sorting, prices shown are still formatted by DishRead
+    effective_price: Mapped[Float] = mapped_column(
+        Float,
+        Computed('price * (1 - coalesce(discount, 0) / 100)', persisted=True),
+        deferred=True
+    )
+    # Words of title and description for full-text search, kept by database
+    # and not loaded with dishes
+    search_vector: Mapped[TSVECTOR] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', title || ' ' || "
+                 "coalesce(description, ''))", persisted=True),
+        deferred=True
+    )
     submenu: Mapped[SubMenu] = relationship(
         SubMenu,
         back_populates='dishes'
@@ -3,12 +3,23 @@ from uuid import UUID
 
 from fastapi import Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy import delete, distinct, func, select, update
+from sqlalchemy import (
+    delete,
+    distinct,
+    func,
+    literal,
+    select,
+    tuple_,
+    union_all,
+    update
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
+import settings
 from app.db.models import Dish, Menu, SubMenu
 from app.db.session import get_db
+from app.db.tombstones import DELETED_MENU_IDS
 
 
 class Repository:
@@ -173,6 +184,37 @@ class MenuCrud(Repository):
 
         return objects.scalars().unique()
 
+    async def read_objects_by_ids(
+            self,
+            object_class: type[Menu | SubMenu | Dish],
+            object_ids: list[UUID]
+    ) -> list[Any]:
+        """
+        The read_objects_by_ids function is used to retrieve objects of one
+        class with single IN query. Related objects are loaded as in
+        read_object, missing ids are skipped.
+
+        :param object_class: The class of the objects to be retrieved.
+        :param object_ids: UUIDs of the objects to be retrieved.
+        :return: The function returns list of found objects.
+        """
+        query = select(object_class).where(object_class.id.in_(object_ids))
+
+        if object_class is Menu:
+            query = query.options(
+                joinedload(object_class.submenus).
+                joinedload(SubMenu.dishes)
+            )
+
+        elif object_class is SubMenu:
+            query = query.options(
+                joinedload(SubMenu.dishes)
+            )
+
+        objects = (await self.db_session.execute(query)).scalars().unique()
+        await self.db_session.commit()
+        return list(objects)
+
     async def update_object(
             self,
             object_id: UUID,
@@ -243,6 +285,99 @@ class MenuCrud(Repository):
         await self.db_session.commit()
         return True
 
+    async def delete_tree(self,
+                          object_class: type[Menu | SubMenu],
+                          object_id: UUID) -> dict[str, list[UUID]]:
+        """
+        The delete_tree function deletes menu or submenu together with its
+        submenus and dishes in one statement: chained DELETE ... RETURNING
+        CTEs remove the rows the cascade would remove and return their ids,
+        so no tree is loaded to know what to invalidate. In tombstone mode
+        submenu of a menu marked deleted is not found, as for reads.
+
+        :param object_class: Menu or SubMenu.
+        :param object_id: UUID of the object to be deleted.
+        :return: The function returns ids of deleted objects by kind:
+        'menu', 'submenu' and 'dish'.
+
+        :Error Handling
+        - The function may raise an HTTPException with a status code of 404 if
+        the object with the specified ID is not found in the database.
+        """
+        root = delete(object_class).where(object_class.id == object_id)
+        if object_class is SubMenu and settings.MENU_TOMBSTONES:
+            # Loader criteria hiding deleted menus do not apply to DELETE
+            root = root.where(SubMenu.menu_id.not_in(DELETED_MENU_IDS))
+        deleted = (root.returning(object_class.id)
+                   .cte(f'deleted_{object_class.__tablename__}'))
+        parts = [select(literal(object_class.__name__.lower()).label('kind'),
+                        deleted.c.id)]
+        deleted_submenus = deleted
+        if object_class is Menu:
+            deleted_submenus = (delete(SubMenu)
+                                .where(SubMenu.menu_id.in_(
+                                    select(deleted.c.id)))
+                                .returning(SubMenu.id)
+                                .cte('deleted_submenus'))
+            parts.append(select(literal('submenu'), deleted_submenus.c.id))
+        deleted_dishes = (delete(Dish)
+                          .where(Dish.submenu_id.in_(
+                              select(deleted_submenus.c.id)))
+                          .returning(Dish.id)
+                          .cte('deleted_dishes'))
+        parts.append(select(literal('dish'), deleted_dishes.c.id))
+
+        return await self.read_ids_by_kind(union_all(*parts), object_class)
+
+    async def mark_menu_deleted(self, menu_id: UUID) -> dict[str, list[UUID]]:
+        """
+        The mark_menu_deleted function deletes menu in tombstone mode: menu
+        is only marked deleted, which hides it with its submenus and dishes
+        from reads, and purge task removes the rows later. Ids of submenus
+        and dishes are read in the same statement for invalidation.
+
+        :param menu_id: UUID of the menu to be deleted.
+        :return: The function returns ids of hidden objects by kind.
+
+        :Error Handling
+        - The function may raise an HTTPException with a status code of 404 if
+        the menu is not found or is already deleted.
+        """
+        marked = (update(Menu)
+                  .where(Menu.id == menu_id, Menu.deleted.is_(False))
+                  .values(deleted=True)
+                  .returning(Menu.id)
+                  .cte('marked_menus'))
+        query = union_all(
+            select(literal('menu').label('kind'), marked.c.id),
+            select(literal('submenu'), SubMenu.id)
+            .where(SubMenu.menu_id.in_(select(marked.c.id))),
+            select(literal('dish'), Dish.id)
+            .join(SubMenu, SubMenu.id == Dish.submenu_id)
+            .where(SubMenu.menu_id.in_(select(marked.c.id))),
+        )
+        return await self.read_ids_by_kind(query, Menu)
+
+    async def read_ids_by_kind(self, query: Any,
+                               object_class: type[Menu | SubMenu]
+                               ) -> dict[str, list[UUID]]:
+        """
+        Execute query returning kind and id rows of a deleted tree, raise 404
+        when the root object of object_class is not among them
+        """
+        rows = (await self.db_session.execute(
+            query.execution_options(include_deleted=True))).all()
+        await self.db_session.commit()
+        ids: dict[str, list[UUID]] = {'menu': [], 'submenu': [], 'dish': []}
+        for kind, deleted_id in rows:
+            ids[kind].append(deleted_id)
+        if not ids[object_class.__name__.lower()]:
+            raise HTTPException(
+                status_code=404,
+                detail=f'{object_class.__name__} not found'
+            )
+        return ids
+
     async def read_menu_with_counts(self, menu_id: UUID
                                     ) -> tuple[Any] | None:
         check_exist = await self.read_object(object_class=Menu,
@@ -263,3 +398,111 @@ class MenuCrud(Repository):
         result = (await self.db_session.execute(query)).fetchone()
         await self.db_session.commit()
         return result
+
+    async def read_menus_with_counts(self) -> list[Any]:
+        """Read all menus with submenus and dishes counts in one query"""
+        query = (select(
+            Menu.id,
+            Menu.title,
+            Menu.description,
+            func.count(distinct(SubMenu.id)).label('submenu_count'),
+            func.count(distinct(Dish.id)).label('dish_count')
+        ).select_from(Menu)
+                 .outerjoin(SubMenu, SubMenu.menu_id == Menu.id)
+                 .outerjoin(Dish, Dish.submenu_id == SubMenu.id)
+                 .group_by(Menu.id))
+        result = (await self.db_session.execute(query)).all()
+        await self.db_session.commit()
+        return result
+
+    async def read_menus_with_submenus(self) -> tuple[list[Menu],
+                                                      dict[UUID, int]]:
+        """
+        Read all menus with their submenus, but without dishes, and dishes
+        count of every submenu counted by database
+        """
+        menus_query = select(Menu).options(joinedload(Menu.submenus))
+        counts_query = (select(Dish.submenu_id, func.count(Dish.id))
+                        .group_by(Dish.submenu_id))
+        menus = (await self.db_session.execute(menus_query)).scalars().unique()
+        counts = (await self.db_session.execute(counts_query)).all()
+        await self.db_session.commit()
+        return list(menus), dict(counts)
+
+    async def search_dishes(self, search_query: str, limit: int,
+                            offset: int) -> list[Any]:
+        """
+        Find dishes matching full-text query over titles and descriptions
+        with GIN index, best ranked first, together with ids of their
+        submenu and menu
+        """
+        tsquery = func.to_tsquery('simple', search_query)
+        query = (select(
+            Dish.id,
+            Dish.title,
+            Dish.description,
+            Dish.price,
+            Dish.discount,
+            Dish.submenu_id,
+            SubMenu.menu_id
+        ).join(SubMenu, SubMenu.id == Dish.submenu_id)
+                 .where(Dish.search_vector.bool_op('@@')(tsquery))
+                 .order_by(func.ts_rank(Dish.search_vector, tsquery).desc(),
+                           Dish.id)
+                 .limit(limit)
+                 .offset(offset))
+        result = (await self.db_session.execute(query)).all()
+        await self.db_session.commit()
+        return result
+
+    async def filter_dishes(
+            self,
+            sort_column: str,
+            descending: bool,
+            limit: int,
+            after: tuple[Any, UUID] | None = None,
+            min_price: float | None = None,
+            max_price: float | None = None,
+            on_sale: bool = False,
+            menu_id: UUID | None = None,
+            submenu_id: UUID | None = None) -> list[Any]:
+        """
+        Read page of dishes of the whole catalog, one menu or one submenu,
+        filtered by price with discount and sale and sorted by that price or
+        title. Page continues after sort value and id of the last dish of
+        the previous one, so it is a range scan of an index, not an offset
+        """
+        column = Dish.effective_price if sort_column == 'price' else Dish.title
+        query = select(
+            Dish.id,
+            Dish.title,
+            Dish.description,
+            Dish.price,
+            Dish.discount,
+            Dish.submenu_id,
+            SubMenu.menu_id,
+            column.label('sort_value')
+        ).join(SubMenu, SubMenu.id == Dish.submenu_id)
+
+        if min_price is not None:
+            query = query.where(Dish.effective_price >= min_price)
+        if max_price is not None:
+            query = query.where(Dish.effective_price <= max_price)
+        if on_sale:
+            query = query.where(Dish.discount.is_not(None))
+        if menu_id is not None:
+            query = query.where(SubMenu.menu_id == menu_id)
+        if submenu_id is not None:
+            query = query.where(Dish.submenu_id == submenu_id)
+        if after is not None:
+            position = tuple_(column, Dish.id)
+            query = query.where(position < after if descending
+                                else position > after)
+
+        if descending:
+            query = query.order_by(column.desc(), Dish.id.desc())
+        else:
+            query = query.order_by(column, Dish.id)
+        result = (await self.db_session.execute(query.limit(limit))).all()
+        await self.db_session.commit()
+        return result
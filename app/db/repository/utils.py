@@ -1,6 +1,18 @@
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+    UUID as UUID_TYPE,
+    Float,
+    String,
+    and_,
+    column,
+    delete,
+    exists,
+    select,
+    update,
+    values,
+)
 
 from app.db.models import Dish, Menu, SubMenu
 from app.db.repository.crud import MenuCrud
@@ -23,9 +35,112 @@ class AdvancedMenuRepository(MenuCrud):
             return obj.id
         return None
 
+    async def read_ids_by_titles_descriptions(
+            self,
+            obj_class: type[Menu | SubMenu | Dish],
+            pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], UUID]:
+        """
+        Read ids of objects matching any of (title, description) pairs with
+        single query joining the table with VALUES list of pairs
+        """
+        if not pairs:
+            return {}
+
+        pairs_values = values(
+            column('title', String),
+            column('description', String),
+            name='pairs'
+        ).data(list(set(pairs)))
+        query = select(
+            obj_class.id, obj_class.title, obj_class.description
+        ).join(
+            pairs_values,
+            and_(obj_class.title == pairs_values.c.title,
+                 obj_class.description == pairs_values.c.description)
+        )
+        rows = (await self.db_session.execute(query)).all()
+        await self.db_session.commit()
+        return {(title, description): obj_id
+                for obj_id, title, description in rows}
+
     async def get_all_ids(self, object_class: type[Menu | SubMenu | Dish]
                           ) -> list[str]:
         """Read all objects of passed class and return ids"""
         query = select(object_class.id)
-        ids = await self.db_session.execute(query)
+        ids = (await self.db_session.execute(query)).all()
+        await self.db_session.commit()
         return [str(i) for (i,) in ids]
+
+    async def update_dish_discounts(self, discounts: dict[UUID, float]
+                                    ) -> list[Any]:
+        """
+        Set sale discounts of dishes in one batch: dishes from discounts dict
+        get new discount, other dishes on sale lose it. Only dishes whose
+        discount really changed are updated, they are returned with price,
+        discount and ids of parent submenu and menu.
+        """
+        # Core table update, so RETURNING may include parent submenu columns
+        returning = (Dish.id, Dish.price, Dish.discount, Dish.submenu_id,
+                     SubMenu.menu_id)
+        changed = []
+
+        if discounts:
+            discounts_values = values(
+                column('id', UUID_TYPE(as_uuid=True)),
+                column('discount', Float),
+                name='discounts'
+            ).data(list(discounts.items()))
+            set_query = (
+                update(Dish.__table__)
+                .where(Dish.id == discounts_values.c.id,
+                       Dish.submenu_id == SubMenu.id,
+                       Dish.discount.is_distinct_from(
+                           discounts_values.c.discount))
+                .values(discount=discounts_values.c.discount)
+                .returning(*returning)
+            )
+            changed.extend(await self.db_session.execute(set_query))
+
+        reset_query = (
+            update(Dish.__table__)
+            .where(Dish.submenu_id == SubMenu.id,
+                   Dish.discount.is_not(None),
+                   Dish.id.not_in(list(discounts)))
+            .values(discount=None)
+            .returning(*returning)
+        )
+        changed.extend(await self.db_session.execute(reset_query))
+        await self.db_session.commit()
+        return changed
+
+    async def purge_deleted_menus(self, batch_size: int) -> int:
+        """
+        Delete one batch of rows of menus marked deleted, in its own short
+        transaction: dishes first, submenus once their dishes are gone and
+        menus once their submenus are gone, so no delete cascades. Returns
+        number of deleted rows, 0 when nothing is left to purge.
+        """
+        dishes, submenus, menus = (Dish.__table__, SubMenu.__table__,
+                                   Menu.__table__)
+        deleted_menu_ids = select(menus.c.id).where(menus.c.deleted)
+        deleted_submenu_ids = select(submenus.c.id).where(
+            submenus.c.menu_id.in_(deleted_menu_ids))
+        batches = (
+            delete(dishes).where(dishes.c.id.in_(
+                select(dishes.c.id)
+                .where(dishes.c.submenu_id.in_(deleted_submenu_ids))
+                .limit(batch_size))),
+            delete(submenus).where(submenus.c.id.in_(
+                deleted_submenu_ids.limit(batch_size))),
+            delete(menus).where(menus.c.id.in_(
+                deleted_menu_ids
+                .where(~exists().where(submenus.c.menu_id == menus.c.id))
+                .limit(batch_size))),
+        )
+        for query in batches:
+            result = await self.db_session.execute(query)
+            await self.db_session.commit()
+            if result.rowcount:
+                return result.rowcount
+        return 0
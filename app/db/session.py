@@ -1,10 +1,13 @@
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Callable
 
 import aioredis
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 import settings
+from app.db import tombstones  # noqa: F401, registers read filters
+from app.monitoring import queries  # noqa: F401, registers engine hooks
+from app.monitoring.timing import TimedRedis
 
 engine = create_async_engine(
     settings.REAL_DATABASE_URL,
@@ -18,23 +21,51 @@ async_session = sessionmaker(
 )
 
 
+class LazySession:
+    """
+    Proxy of AsyncSession which creates the session on first use, so requests
+    answered from cache never create one. Session takes connection from the
+    pool on its first statement and returns it on commit, which repository
+    does after every query.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession]) -> None:
+        self.session_factory = session_factory
+        self.session: AsyncSession | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self.session is None:
+            self.session = self.session_factory()
+        return getattr(self.session, name)
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+
+
 async def get_db() -> AsyncGenerator:
+    session = LazySession(async_session)
     try:
-        session: AsyncSession = async_session()
         yield session
     finally:
         await session.close()
 
 
-def create_redis() -> aioredis.ConnectionPool:
+def create_redis(decode_responses: bool = True) -> aioredis.ConnectionPool:
     return aioredis.ConnectionPool.from_url(
         'redis://redis:6379',
-        decode_responses=True
+        decode_responses=decode_responses
     )
 
 
 redis_pool = create_redis()
+# Pool for reading binary values such as compressed response bodies
+binary_redis_pool = create_redis(decode_responses=False)
 
 
 def get_redis() -> aioredis.Redis:
-    return aioredis.Redis(connection_pool=redis_pool)
+    return TimedRedis(connection_pool=redis_pool)
+
+
+def get_binary_redis() -> aioredis.Redis:
+    return TimedRedis(connection_pool=binary_redis_pool)
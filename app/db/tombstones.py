@@ -0,0 +1,39 @@
+from sqlalchemy import event, select
+from sqlalchemy.orm import ORMExecuteState, Session, with_loader_criteria
+
+import settings
+from app.db.models import Dish, Menu, SubMenu
+
+# Core tables, so criteria below are not applied to their own subqueries
+menus = Menu.__table__
+submenus = SubMenu.__table__
+
+DELETED_MENU_IDS = select(menus.c.id).where(menus.c.deleted)
+DELETED_SUBMENU_IDS = (select(submenus.c.id)
+                       .where(submenus.c.menu_id.in_(DELETED_MENU_IDS)))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def hide_deleted_menus(execute_state: ORMExecuteState) -> None:
+    """
+    Listener adding criteria to every ORM select in tombstone mode, which
+    hide menus marked deleted together with their submenus and dishes, in
+    joins and relationship loads too. Statements executed with
+    include_deleted execution option see everything.
+    """
+    if (not settings.MENU_TOMBSTONES
+            or not execute_state.is_select
+            or execute_state.is_column_load
+            or execute_state.is_relationship_load
+            or execute_state.execution_options.get('include_deleted')):
+        return
+    execute_state.statement = execute_state.statement.options(
+        with_loader_criteria(Menu, Menu.deleted.is_(False),
+                             include_aliases=True),
+        with_loader_criteria(SubMenu,
+                             SubMenu.menu_id.not_in(DELETED_MENU_IDS),
+                             include_aliases=True),
+        with_loader_criteria(Dish,
+                             Dish.submenu_id.not_in(DELETED_SUBMENU_IDS),
+                             include_aliases=True),
+    )
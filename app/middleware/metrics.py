@@ -0,0 +1,76 @@
+import time
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.monitoring.metrics import (
+    BACKGROUND_TASKS_DURATION,
+    BACKGROUND_TASKS_PENDING,
+    REQUEST_DURATION,
+    REQUESTS_IN_PROGRESS,
+    observe_redis_pools
+)
+
+
+class MetricsMiddleware:
+    """
+    Middleware measuring requests by route template: latency until the
+    response body is sent, requests in flight, and background tasks which
+    run after the response, when the request is still held by the worker.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        method = scope['method']
+        started = time.perf_counter()
+        status = 500
+        sent = None
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status, sent
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+            if (message['type'] == 'http.response.body'
+                    and not message.get('more_body', False)):
+                sent = time.perf_counter()
+                REQUEST_DURATION.labels(method, self.get_route(scope),
+                                        status).observe(sent - started)
+                BACKGROUND_TASKS_PENDING.inc()
+
+        REQUESTS_IN_PROGRESS.labels(method).inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            REQUESTS_IN_PROGRESS.labels(method).dec()
+            if sent is None:
+                REQUEST_DURATION.labels(method, self.get_route(scope),
+                                        status).observe(
+                    time.perf_counter() - started)
+            else:
+                BACKGROUND_TASKS_PENDING.dec()
+                BACKGROUND_TASKS_DURATION.labels(
+                    self.get_route(scope)).observe(time.perf_counter() - sent)
+            observe_redis_pools()
+
+    @staticmethod
+    def get_route(scope: Scope) -> str:
+        """
+        Method returns template of the route which handled request, requests
+        answered by middleware before routing are matched here
+        """
+        route = scope.get('route')
+        if route is not None:
+            return route.path
+        for route in scope['app'].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return 'unmatched'
@@ -0,0 +1,88 @@
+import asyncio
+import random
+import time
+
+from pyinstrument import Profiler
+from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+from pyinstrument.session import Session
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+import settings
+from app.services.profiling_services import (
+    ProfilingService,
+    is_profiling_authorized
+)
+
+RENDERERS = {'html': HTMLRenderer, 'speedscope': SpeedscopeRenderer}
+
+
+class ProfilingMiddleware:
+    """
+    Middleware profiling requests with sampling profiler which follows
+    awaits of the request task, so time spent waiting for database and Redis
+    is attributed to the awaiting code. Requests are profiled when they carry
+    profiling token in X-Profile header, or are sampled with
+    PROFILING_SAMPLE_RATE. Requests with the token are marked in scope state,
+    so the response cache passes them to the route they profile. Profile name is returned in
+    X-Profile-Id header, profiles are listed by GET /profiles.
+    """
+
+    def __init__(self, app: ASGIApp, prefix: str = '/api/v1') -> None:
+        self.app = app
+        # Reading profiles with the token is not profiled itself
+        self.profiles_path = f'{prefix}/profiles'
+        self.service = ProfilingService()
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        if scope['type'] != 'http' or not self.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = Profiler(interval=settings.PROFILING_INTERVAL,
+                            async_mode='enabled')
+        started = time.perf_counter()
+        name = None
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal name
+            if message['type'] == 'http.response.start':
+                # Name is known before the body is sent, duration is the
+                # time until response start
+                name = self.service.make_profile_name(
+                    scope['method'], scope['path'],
+                    time.perf_counter() - started)
+                MutableHeaders(scope=message).append('X-Profile-Id', name)
+            await send(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            session = profiler.stop()
+            if name is None:
+                name = self.service.make_profile_name(
+                    scope['method'], scope['path'],
+                    time.perf_counter() - started)
+            # Rendering takes longer than most requests, keep it off the loop
+            await asyncio.to_thread(self.save, name, session)
+
+    def save(self, name: str, session: Session) -> None:
+        renderer = RENDERERS[settings.PROFILING_FORMAT]()
+        self.service.save_profile(name, renderer.render(session))
+
+    def should_profile(self, scope: Scope) -> bool:
+        """
+        Method decides whether request is profiled and marks requests which
+        carry the token
+        """
+        if scope['path'].startswith(self.profiles_path):
+            return False
+        # Token is taken only from the header, query strings end up in access
+        # logs and browser history
+        if is_profiling_authorized(Headers(scope=scope).get('x-profile')):
+            scope.setdefault('state', {})['profiling'] = True
+            return True
+        return (settings.PROFILING_SAMPLE_RATE > 0
+                and random.random() < settings.PROFILING_SAMPLE_RATE)
@@ -0,0 +1,35 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+import settings
+from app.monitoring.queries import QueryAccount
+
+
+class QueryBudgetMiddleware:
+    """
+    Middleware counting database statements of every request, including its
+    background tasks, and checking them against QUERY_BUDGET and
+    QUERY_REPEAT_LIMIT. Totals are logged when the request finishes.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        account = QueryAccount(f'{scope["method"]} {scope["path"]}',
+                               settings.QUERY_BUDGET,
+                               settings.QUERY_REPEAT_LIMIT,
+                               settings.QUERY_BUDGET_STRICT)
+        try:
+            with account.activate():
+                await self.app(scope, receive, send)
+        finally:
+            route = scope.get('route')
+            if route is not None:
+                # Route template groups requests of one route in logs
+                account.name = f'{scope["method"]} {route.path}'
+            account.finish()
@@ -0,0 +1,136 @@
+import re
+from urllib.parse import parse_qs
+from uuid import UUID
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.db.session import get_redis
+from app.routing.responses import choose_encoding, respond_from_cache
+from app.schemas.menu_schemas import MenuDepth
+from app.services.cache.cache_service import MenuCacheService
+from app.services.menu_services import MenuService
+
+UUID_PATTERN = r'[0-9a-fA-F-]{32,36}'
+
+# Menus list without depth and fields selection is cached under 'menus' key
+DEFAULT_MENUS_VARIANT = MenuService.make_variant(MenuDepth.dish, None)
+
+# Cached GET routes, cache keys of their responses built from path ids, the
+# same keys services use, and paths the entries must be stored under. Keys
+# named by a bare object id are shared by menus, submenus and dishes, so
+# without the path a submenu would answer as a menu, or under another menu.
+CACHED_ROUTES = [
+    (re.compile(pattern), key, path) for pattern, key, path in (
+        (r'/menus', 'menus', None),
+        (rf'/menus/(?P<menu>{UUID_PATTERN})', '{menu}', '{menu}'),
+        (rf'/menus/(?P<menu>{UUID_PATTERN})/counts', '{menu}_counts', None),
+        (rf'/menus/(?P<menu>{UUID_PATTERN})/submenus', '{menu}_submenus',
+         None),
+        (rf'/menus/(?P<menu>{UUID_PATTERN})'
+         rf'/submenus/(?P<submenu>{UUID_PATTERN})',
+         '{submenu}', '{menu}/{submenu}'),
+        (rf'/menus/(?P<menu>{UUID_PATTERN})'
+         rf'/submenus/(?P<submenu>{UUID_PATTERN})/dishes',
+         '{submenu}_dishes', '{menu}/{submenu}'),
+        (rf'/menus/(?P<menu>{UUID_PATTERN})'
+         rf'/submenus/(?P<submenu>{UUID_PATTERN})'
+         rf'/dishes/(?P<dish>{UUID_PATTERN})',
+         '{dish}', '{menu}/{submenu}/{dish}'),
+    )
+]
+
+
+class ResponseCacheMiddleware:
+    """
+    Middleware answering cached GET routes from response bodies stored next
+    to cache entries, before routing and dependencies, so a hit opens no
+    database session. Entries are the ones services fill and invalidate,
+    requests which miss are passed to the application, as well as requests
+    marked for profiling, which profile the route and not the cache.
+    """
+
+    def __init__(self, app: ASGIApp, prefix: str = '/api/v1') -> None:
+        self.app = app
+        self.prefix = prefix
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        if (scope['type'] != 'http' or scope['method'] != 'GET'
+                or scope.get('state', {}).get('profiling')):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = choose_encoding(headers.get('accept-encoding'))
+        parts = await self.read_response_parts(scope, encoding)
+        if parts is not None:
+            response = respond_from_cache(headers.get('if-none-match'),
+                                          *parts, encoding)
+            if response is not None:
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+    async def read_response_parts(self, scope: Scope, encoding: str | None
+                                  ) -> tuple[str | None, bytes | None] | None:
+        """
+        Method finds cache entry of requested route and reads its ETag and
+        body, None means route is not cached
+        """
+        path = scope['path']
+        if not path.startswith(self.prefix):
+            return None
+        path = path[len(self.prefix):].rstrip('/')
+        query = parse_qs(scope['query_string'].decode(),
+                         keep_blank_values=True)
+        cache = MenuCacheService(get_redis())
+
+        if path == '/menus' and query:
+            variant = self.make_menus_variant(query)
+            if variant is None:
+                return None
+            if variant != DEFAULT_MENUS_VARIANT:
+                return await cache.get_menus_variant_response_parts(
+                    variant, encoding)
+        elif query:
+            return None
+
+        cache_key = self.make_cache_key(path)
+        if cache_key is None:
+            return None
+        key, entry_path = cache_key
+        return await cache.get_response_parts(key, encoding, entry_path)
+
+    @staticmethod
+    def make_cache_key(path: str) -> tuple[str, str | None] | None:
+        """
+        Method returns cache key of route and path its entry must be stored
+        under, None means route is not cached
+        """
+        for pattern, key, entry_path in CACHED_ROUTES:
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            try:
+                ids = {name: str(UUID(value))
+                       for name, value in match.groupdict().items()}
+            except ValueError:
+                return None
+            return (key.format(**ids),
+                    entry_path.format(**ids) if entry_path else None)
+        return None
+
+    @staticmethod
+    def make_menus_variant(query: dict[str, list[str]]) -> str | None:
+        """Method makes menus list variant of depth and fields parameters"""
+        if set(query) - {'depth', 'fields'}:
+            return None
+        try:
+            depth = MenuDepth(query.get('depth', [MenuDepth.dish.value])[-1])
+            fields = MenuService.parse_fields(
+                depth, query['fields'][-1] if 'fields' in query else None)
+        except (ValueError, HTTPException):
+            return None
+        return MenuService.make_variant(depth, fields)
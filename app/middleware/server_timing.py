@@ -0,0 +1,49 @@
+import json
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+import settings
+from app.monitoring.timing import RequestTimings
+
+logger = logging.getLogger('app.timing')
+
+
+class ServerTimingMiddleware:
+    """
+    Middleware collecting Redis, database, schema building and encoding time
+    of every request and returning it in Server-Timing header, so it is seen
+    whether slow response is a cache miss, a slow query or serialization.
+    Time is measured until the response starts, background tasks which fill
+    cache after the response are not included.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        if scope['type'] != 'http' or not (settings.SERVER_TIMING
+                                           or settings.SERVER_TIMING_LOG):
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+
+        async def send_with_timings(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                if settings.SERVER_TIMING:
+                    MutableHeaders(scope=message).append('Server-Timing',
+                                                         timings.to_header())
+                if settings.SERVER_TIMING_LOG:
+                    logger.info(json.dumps({
+                        'method': scope['method'],
+                        'path': scope['path'],
+                        'status': message['status'],
+                        **timings.to_dict(),
+                    }))
+            await send(message)
+
+        with timings.activate():
+            await self.app(scope, receive, send_with_timings)
@@ -0,0 +1,89 @@
+import atexit
+import os
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+from sqlalchemy import event
+
+from app.db.session import binary_redis_pool, engine, redis_pool
+
+# With PROMETHEUS_MULTIPROC_DIR set every uvicorn worker writes its samples
+# to files in the directory and /metrics aggregates files of all workers.
+# Gauges are summed over live workers.
+MULTIPROCESS = 'PROMETHEUS_MULTIPROC_DIR' in os.environ
+
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds',
+    'Time until response body is sent, by route template',
+    ['method', 'route', 'status'])
+REQUESTS_IN_PROGRESS = Gauge(
+    'http_requests_in_progress',
+    'Requests being handled',
+    ['method'], multiprocess_mode='livesum')
+BACKGROUND_TASKS_PENDING = Gauge(
+    'background_tasks_pending',
+    'Responses sent whose background tasks have not finished yet',
+    multiprocess_mode='livesum')
+BACKGROUND_TASKS_DURATION = Histogram(
+    'background_tasks_duration_seconds',
+    'Time background tasks of a request run after its response',
+    ['route'])
+DB_POOL_CHECKED_OUT = Gauge(
+    'db_pool_checked_out_connections',
+    'Database connections checked out from the pool',
+    multiprocess_mode='livesum')
+DB_POOL_OVERFLOW = Gauge(
+    'db_pool_overflow_connections',
+    'Database connections opened over the pool size',
+    multiprocess_mode='livesum')
+REDIS_POOL_IN_USE = Gauge(
+    'redis_pool_connections_in_use',
+    'Redis connections in use',
+    ['pool'], multiprocess_mode='livesum')
+REDIS_POOL_CREATED = Gauge(
+    'redis_pool_connections_created',
+    'Redis connections opened by the pool',
+    ['pool'], multiprocess_mode='livesum')
+
+REDIS_POOLS = {'text': redis_pool, 'binary': binary_redis_pool}
+
+
+def observe_db_pool(*args) -> None:
+    pool = engine.sync_engine.pool
+    DB_POOL_CHECKED_OUT.set(pool.checkedout())
+    DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+
+event.listen(engine.sync_engine.pool, 'checkout', observe_db_pool)
+event.listen(engine.sync_engine.pool, 'checkin', observe_db_pool)
+
+
+def observe_redis_pools() -> None:
+    """
+    Function samples usage of Redis pools of this worker, aioredis pools have
+    no hooks, so it is called when requests finish and on scrape
+    """
+    for name, pool in REDIS_POOLS.items():
+        REDIS_POOL_IN_USE.labels(name).set(len(pool._in_use_connections))
+        REDIS_POOL_CREATED.labels(name).set(pool._created_connections)
+
+
+def generate_metrics() -> bytes:
+    """Function renders metrics of all workers in Prometheus text format"""
+    observe_redis_pools()
+    if not MULTIPROCESS:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+if MULTIPROCESS:
+    # Live gauges of stopped worker must not be summed any more
+    atexit.register(multiprocess.mark_process_dead, os.getpid())
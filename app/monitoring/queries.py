@@ -0,0 +1,120 @@
+import logging
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+import settings
+from app.monitoring.timing import current_timings
+
+logger = logging.getLogger('app.queries')
+
+# Account of the request or Celery run executing in current context
+current_queries: ContextVar['QueryAccount | None'] = ContextVar(
+    'current_query_account', default=None)
+
+# Length of statements and parameters in log lines
+LOGGED_LENGTH = 1000
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode by the statement which goes over the budget"""
+
+
+class QueryAccount:
+    """
+    Counts statements and database time of one request or Celery run and
+    checks them against the budget: total number of statements, and number
+    of executions of the same statement, which grows with data in N+1
+    patterns. Strict mode raises on the statement over the budget.
+    """
+
+    def __init__(self, name: str, budget: int = 0, repeat_limit: int = 0,
+                 strict: bool = False) -> None:
+        self.name = name
+        self.budget = budget
+        self.repeat_limit = repeat_limit
+        self.strict = strict
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter = Counter()
+
+    @contextmanager
+    def activate(self) -> Iterator['QueryAccount']:
+        """Makes account current for the code running inside the block"""
+        token = current_queries.set(self)
+        try:
+            yield self
+        finally:
+            current_queries.reset(token)
+
+    def add(self, statement: str) -> None:
+        self.count += 1
+        self.statements[statement] += 1
+        if self.strict:
+            problems = self.check()
+            if problems:
+                raise QueryBudgetExceeded(
+                    f'{self.name}: {"; ".join(problems)}')
+
+    def check(self) -> list[str]:
+        """Method returns descriptions of exceeded limits"""
+        problems = []
+        if self.budget and self.count > self.budget:
+            problems.append(f'{self.count} statements over budget of '
+                            f'{self.budget}')
+        if self.repeat_limit:
+            for statement, number in self.statements.most_common():
+                if number <= self.repeat_limit:
+                    break
+                problems.append(f'statement executed {number} times: '
+                                f'{statement[:LOGGED_LENGTH]}')
+        return problems
+
+    def finish(self) -> None:
+        """Method logs the totals, as warning when limits are exceeded"""
+        problems = self.check()
+        log = logger.warning if problems else logger.debug
+        log('%s: %d statements, %.1f ms in database%s', self.name,
+            self.count, self.duration * 1000,
+            ''.join(f'\n  {problem}' for problem in problems))
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_query(conn: Any, cursor: Any, statement: str, parameters: Any,
+                context: Any, executemany: bool) -> None:
+    account = current_queries.get()
+    if account is not None:
+        account.add(statement)
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def finish_query(conn: Any, cursor: Any, statement: str, parameters: Any,
+                 context: Any, executemany: bool) -> None:
+    started = conn.info.get('query_started')
+    if not started:
+        return
+    duration = time.perf_counter() - started.pop()
+
+    timings = current_timings.get()
+    if timings is not None:
+        timings.add('db', duration)
+    account = current_queries.get()
+    if account is not None:
+        account.duration += duration
+    if duration * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning('Slow query, %.1f ms: %s\n  parameters: %s',
+                       duration * 1000, statement[:LOGGED_LENGTH],
+                       repr(parameters)[:LOGGED_LENGTH])
+
+
+@event.listens_for(Engine, 'handle_error')
+def fail_query(context: Any) -> None:
+    if context.connection is not None:
+        context.connection.info.pop('query_started', None)
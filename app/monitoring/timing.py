@@ -0,0 +1,137 @@
+import inspect
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, TypeVar
+
+from aioredis import Redis
+
+# Timings of the request handled in current context, database, cache and
+# service hooks below report into it
+current_timings: ContextVar['RequestTimings | None'] = ContextVar(
+    'current_request_timings', default=None)
+
+# Server-Timing metrics in header order with their descriptions
+METRICS = {
+    'redis': 'Redis',
+    'db': 'Postgres',
+    'schema': 'schema building',
+    'render': 'JSON encoding',
+}
+
+ServiceClass = TypeVar('ServiceClass', bound=type)
+
+
+class RequestTimings:
+    """
+    Collects time one request spends in Redis commands, database queries,
+    service code between them, where schemas are built, and response
+    encoding. Durations are accumulated over all calls of the request.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.durations: dict[str, float] = defaultdict(float)
+        self.counters: dict[str, int] = defaultdict(int)
+        self.in_service = False
+
+    @contextmanager
+    def activate(self) -> Iterator['RequestTimings']:
+        """Makes timings current for the code running inside the block"""
+        token = current_timings.set(self)
+        try:
+            yield self
+        finally:
+            current_timings.reset(token)
+
+    def add(self, name: str, duration: float) -> None:
+        self.durations[name] += duration
+        self.counters[name] += 1
+
+    def io_duration(self) -> float:
+        return self.durations.get('db', 0.0) + self.durations.get('redis', 0.0)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def to_header(self) -> str:
+        """Method formats timings as Server-Timing header value in ms"""
+        metrics = []
+        for name, description in METRICS.items():
+            if name not in self.durations:
+                continue
+            if name in ('db', 'redis'):
+                description = (f'{description}, {self.counters[name]} '
+                               f'{"queries" if name == "db" else "commands"}')
+            metrics.append(f'{name};dur={self.durations[name] * 1000:.2f};'
+                           f'desc="{description}"')
+        metrics.append(f'total;dur={self.elapsed() * 1000:.2f}')
+        return ', '.join(metrics)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'total_ms': round(self.elapsed() * 1000, 3),
+            **{f'{name}_ms': round(duration * 1000, 3)
+               for name, duration in self.durations.items()},
+            **{f'{name}_calls': number
+               for name, number in self.counters.items()
+               if name in ('db', 'redis')},
+        }
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Adds time spent inside the block to metric of current request"""
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+def timed_service(method: Callable) -> Callable:
+    """
+    Decorator adding time of service method, except Redis and database
+    time inside it, to 'schema' metric. Nested service calls are counted by
+    the outermost one.
+    """
+    @wraps(method)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        timings = current_timings.get()
+        if timings is None or timings.in_service:
+            return await method(*args, **kwargs)
+        timings.in_service = True
+        io_before = timings.io_duration()
+        started = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            io = timings.io_duration() - io_before
+            timings.durations['schema'] += max(
+                time.perf_counter() - started - io, 0.0)
+            timings.in_service = False
+
+    return wrapper
+
+
+def instrument_service(cls: ServiceClass) -> ServiceClass:
+    """Class decorator timing every public coroutine method of a service"""
+    for name, member in list(vars(cls).items()):
+        if not name.startswith('_') and inspect.iscoroutinefunction(member):
+            setattr(cls, name, timed_service(member))
+    return cls
+
+
+class TimedRedis(Redis):
+    """Redis client which adds time of its commands to current request"""
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        with timed('redis'):
+            return await super().execute_command(*args, **options)
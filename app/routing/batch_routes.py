@@ -0,0 +1,21 @@
+from fastapi import APIRouter, BackgroundTasks, Depends
+
+from app.routing.responses import PydanticJSONResponse
+from app.schemas.batch_schemas import BatchReadRequest, BatchReadResponse
+from app.services.batch_services import BatchService
+
+batch_router = APIRouter(tags=['batch-router'])
+
+
+@batch_router.post(
+    '/batch',
+    status_code=200,
+    response_model=BatchReadResponse,
+    name='batch-read')
+async def batch_read(
+        batch_request: BatchReadRequest,
+        background_tasks: BackgroundTasks,
+        service: BatchService = Depends(),
+) -> PydanticJSONResponse:
+    response = await service.read(batch_request.reads, background_tasks)
+    return PydanticJSONResponse(response)
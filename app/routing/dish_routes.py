@@ -1,12 +1,17 @@
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
 
+import settings
+from app.routing.responses import PydanticJSONResponse
 from app.schemas.dish_schemas import (
     DishCreate,
     DishCreateWithSubmenuId,
     DishIdOnly,
+    DishPage,
     DishRead,
+    DishSearchPage,
+    DishSort,
 )
 from app.schemas.errors import DatabaseErrorResponseSchema
 from app.services.dish_services import DishService
@@ -28,13 +33,13 @@ async def dish_patch(
         dish_update: DishCreate,
         background_tasks: BackgroundTasks,
         service: DishService = Depends(),
-) -> DishRead:
+) -> PydanticJSONResponse:
     dish = await service.patch(target_dish_id,
                                target_menu_id,
                                target_submenu_id,
                                dish_update,
                                background_tasks)
-    return dish
+    return PydanticJSONResponse(dish)
 
 
 @dish_router.get(
@@ -49,10 +54,11 @@ async def list_dishes(
         target_submenu_id: UUID,
         background_tasks: BackgroundTasks,
         service: DishService = Depends(),
-) -> list[DishRead]:
+) -> PydanticJSONResponse:
     dishes = await service.read_many(target_submenu_id,
+                                     target_menu_id,
                                      background_tasks)
-    return dishes
+    return PydanticJSONResponse(dishes)
 
 
 @dish_router.post(
@@ -68,14 +74,14 @@ async def dish_create(
         dish_schema: DishCreate,
         background_tasks: BackgroundTasks,
         service: DishService = Depends()
-) -> DishRead:
+) -> PydanticJSONResponse:
     dish_schema = DishCreateWithSubmenuId(**dish_schema.model_dump(),
                                           submenu_id=target_submenu_id)
     new_dish = await service.create(dish_schema,
                                     target_menu_id,
                                     target_submenu_id,
                                     background_tasks)
-    return new_dish
+    return PydanticJSONResponse(new_dish, status_code=201)
 
 
 @dish_router.delete(
@@ -91,12 +97,12 @@ async def dish_delete(
         target_menu_id: UUID,
         background_tasks: BackgroundTasks,
         service: DishService = Depends()
-) -> DishIdOnly:
+) -> PydanticJSONResponse:
     delete_dish = await service.delete(target_dish_id,
                                        target_submenu_id,
                                        target_menu_id,
                                        background_tasks)
-    return delete_dish
+    return PydanticJSONResponse(delete_dish)
 
 
 @dish_router.get(
@@ -110,8 +116,57 @@ async def dish_read(
         target_submenu_id: UUID,
         target_dish_id: UUID,
         background_tasks: BackgroundTasks,
-        service: DishService = Depends()
-) -> DishRead:
+        service: DishService = Depends(),
+) -> PydanticJSONResponse:
     dish = await service.read(target_dish_id,
+                              target_submenu_id,
+                              target_menu_id,
                               background_tasks)
-    return dish
+    return PydanticJSONResponse(dish)
+
+
+@dish_router.get(
+    '/dishes/search',
+    response_model=DishSearchPage,
+    status_code=200,
+    name='dish-search')
+async def search_dishes(
+        background_tasks: BackgroundTasks,
+        q: str = Query(
+            min_length=1, max_length=256,
+            description='Words to find in dish titles and descriptions, '
+                        'words may be unfinished'),
+        limit: int = Query(20, ge=1, le=settings.DISH_SEARCH_MAX_LIMIT),
+        offset: int = Query(0, ge=0),
+        service: DishService = Depends(),
+) -> PydanticJSONResponse:
+    page = await service.search(q, limit, offset, background_tasks)
+    return PydanticJSONResponse(page)
+
+
+@dish_router.get(
+    '/dishes',
+    response_model=DishPage,
+    status_code=200,
+    name='dishes-read')
+async def read_dishes(
+        min_price: float | None = Query(
+            None, ge=0, description='Lowest price with sale discount'),
+        max_price: float | None = Query(
+            None, ge=0, description='Highest price with sale discount'),
+        on_sale: bool = Query(False, description='Only dishes on sale'),
+        menu_id: UUID | None = Query(None),
+        submenu_id: UUID | None = Query(None),
+        sort: DishSort = Query(DishSort.price),
+        cursor: str | None = Query(
+            None, description='next_cursor of the previous page'),
+        limit: int = Query(20, ge=1, le=settings.DISH_SEARCH_MAX_LIMIT),
+        service: DishService = Depends(),
+) -> PydanticJSONResponse:
+    page = await service.read_filtered(sort, limit, cursor,
+                                       min_price=min_price,
+                                       max_price=max_price,
+                                       on_sale=on_sale,
+                                       menu_id=menu_id,
+                                       submenu_id=submenu_id)
+    return PydanticJSONResponse(page)
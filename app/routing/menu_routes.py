@@ -1,10 +1,12 @@
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
 
+from app.routing.responses import PydanticJSONResponse
 from app.schemas.errors import DatabaseErrorResponseSchema
 from app.schemas.menu_schemas import (
     MenuCreate,
+    MenuDepth,
     MenuIdOnly,
     MenuRead,
     MenuReadCounts
@@ -25,9 +27,9 @@ async def read_menu_with_counts(
         target_menu_id: UUID,
         background_tasks: BackgroundTasks,
         service: MenuService = Depends(),
-) -> MenuReadCounts:
+) -> PydanticJSONResponse:
     menu = await service.read_with_counts(target_menu_id, background_tasks)
-    return menu
+    return PydanticJSONResponse(menu)
 
 
 @menu_router.get(
@@ -38,9 +40,22 @@ async def read_menu_with_counts(
 async def read_all_menus(
         background_tasks: BackgroundTasks,
         service: MenuService = Depends(),
-) -> list[MenuRead]:
+        depth: MenuDepth = Query(
+            MenuDepth.dish,
+            description='Load only menus, menus with submenus or everything'),
+        fields: str | None = Query(
+            None,
+            description='Comma separated menu fields to return'),
+) -> PydanticJSONResponse:
+    if depth is not MenuDepth.dish or fields is not None:
+        selected_fields = service.parse_fields(depth, fields)
+        variant = service.make_variant(depth, selected_fields)
+        menus = await service.read_many_selected(depth, selected_fields,
+                                                 background_tasks)
+        return PydanticJSONResponse(menus)
+
     menus = await service.read_many(background_tasks)
-    return [menu for menu in menus]
+    return PydanticJSONResponse(menus)
 
 
 @menu_router.post(
@@ -53,10 +68,10 @@ async def menu_create(
         background_tasks: BackgroundTasks,
         menu_schema: MenuCreate,
         service: MenuService = Depends(),
-) -> MenuRead:
+) -> PydanticJSONResponse:
     new_menu = await service.create(menu_schema,
                                     background_tasks)
-    return new_menu
+    return PydanticJSONResponse(new_menu, status_code=201)
 
 
 @menu_router.get(
@@ -70,9 +85,9 @@ async def menu_read(
         target_menu_id: UUID,
         background_tasks: BackgroundTasks,
         service: MenuService = Depends(),
-) -> MenuRead:
+) -> PydanticJSONResponse:
     menu = await service.read(target_menu_id, background_tasks)
-    return menu
+    return PydanticJSONResponse(menu)
 
 
 @menu_router.patch(
@@ -87,12 +102,12 @@ async def menu_patch(
         menu_update: MenuCreate,
         background_tasks: BackgroundTasks,
         service: MenuService = Depends(),
-) -> MenuRead:
+) -> PydanticJSONResponse:
     update_menu = await service.patch(
         target_id=target_menu_id,
         menu_update=menu_update,
         background_tasks=background_tasks)
-    return update_menu
+    return PydanticJSONResponse(update_menu)
 
 
 @menu_router.delete(
@@ -106,7 +121,7 @@ async def menu_delete(
         target_menu_id: UUID,
         background_tasks: BackgroundTasks,
         service: MenuService = Depends(),
-) -> MenuIdOnly:
+) -> PydanticJSONResponse:
     delete_menu = await service.delete(target_id=target_menu_id,
                                        background_tasks=background_tasks)
-    return delete_menu
+    return PydanticJSONResponse(delete_menu)
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from app.monitoring.metrics import generate_metrics
+
+metrics_router = APIRouter(tags=['metrics-router'])
+
+
+@metrics_router.get(
+    '/metrics',
+    status_code=200,
+    include_in_schema=False,
+    name='metrics-read')
+async def read_metrics() -> Response:
+    return Response(generate_metrics(), media_type=CONTENT_TYPE_LATEST)
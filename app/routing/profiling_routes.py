@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import FileResponse
+
+from app.routing.responses import PydanticJSONResponse
+from app.schemas.profiling_schemas import ProfileRead
+from app.services.profiling_services import (
+    ProfilingService,
+    check_profiling_token
+)
+
+profiling_router = APIRouter(tags=['profiling-router'],
+                             dependencies=[Depends(check_profiling_token)])
+
+
+@profiling_router.get(
+    '/profiles',
+    status_code=200,
+    response_model=list[ProfileRead],
+    name='profiles-read')
+async def read_profiles(
+        limit: int = Query(default=50, ge=1, le=1000),
+        service: ProfilingService = Depends(),
+) -> PydanticJSONResponse:
+    return PydanticJSONResponse(service.list_profiles(limit))
+
+
+@profiling_router.get(
+    '/profiles/{profile_name}',
+    status_code=200,
+    name='profile-read')
+async def read_profile(
+        profile_name: str,
+        service: ProfilingService = Depends(),
+) -> FileResponse:
+    path = service.get_profile_path(profile_name)
+    media_type = 'text/html' if path.endswith('.html') else 'application/json'
+    return FileResponse(path, media_type=media_type)
@@ -0,0 +1,103 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+
+from app.monitoring.timing import timed
+from app.services.cache.encoding import ENCODINGS, render_json
+
+
+def choose_encoding(accept_encoding: str | None) -> str | None:
+    """
+    Function picks the most preferred of supported encodings which
+    Accept-Encoding header allows, or None for identity
+    """
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in ENCODINGS:
+        if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+
+def make_encoded_etag(etag: str, encoding: str) -> str:
+    """Function makes ETag of compressed representation of cached entry"""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    Response used for all routes. Routes return it directly with schemas they
+    built, so FastAPI does not validate them against response_model a second
+    time, response_model is kept for documentation only.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with timed('render'):
+            return render_json(content)
+
+
+class CachedJSONResponse(Response):
+    """
+    Response sending body which was rendered, and compressed if encoding is
+    passed, when cache was filled
+    """
+    media_type = 'application/json'
+
+    def __init__(self, body: bytes, etag: str,
+                 encoding: str | None = None) -> None:
+        headers = {'ETag': etag, 'Vary': 'Accept-Encoding'}
+        if encoding is not None:
+            headers['Content-Encoding'] = encoding
+            headers['ETag'] = make_encoded_etag(etag, encoding)
+        super().__init__(body, headers=headers)
+
+
+class NotModifiedResponse(Response):
+    """Empty 304 response for conditional GET with matching ETag"""
+
+    def __init__(self, etag: str) -> None:
+        super().__init__(status_code=304, headers={'ETag': etag})
+
+
+def etag_matches(if_none_match: str | None, etag: str | None) -> bool:
+    """
+    Function checks If-None-Match header against ETag of cached entry, ETags
+    of its compressed representations match too
+    """
+    if etag is None or not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    etags = {etag, *(make_encoded_etag(etag, encoding)
+                     for encoding in ENCODINGS)}
+    return any(tag.strip().removeprefix('W/') in etags
+               for tag in if_none_match.split(','))
+
+
+def respond_from_cache(if_none_match: str | None,
+                       etag: str | None,
+                       body: bytes | None,
+                       encoding: str | None) -> Response | None:
+    """
+    Function answers GET from cached entry parts without building schemas:
+    304 if client has it already, or pre-rendered body. None means the
+    request has to be handled by the route
+    """
+    if etag_matches(if_none_match, etag):
+        if body is not None and encoding is not None:
+            etag = make_encoded_etag(etag, encoding)
+        return NotModifiedResponse(etag)
+    if etag is not None and body is not None:
+        return CachedJSONResponse(body, etag, encoding)
+    return None
@@ -2,6 +2,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, BackgroundTasks, Depends
 
+from app.routing.responses import PydanticJSONResponse
 from app.schemas.errors import DatabaseErrorResponseSchema
 from app.schemas.submenu_schemas import (
     SubmenuCreate,
@@ -24,11 +25,11 @@ submenu_router = APIRouter(tags=['submenu-router'])
 async def submenus_read(
         target_menu_id: UUID,
         background_tasks: BackgroundTasks,
-        service: SubmenuService = Depends()
-) -> list[SubmenuRead]:
+        service: SubmenuService = Depends(),
+) -> PydanticJSONResponse:
     submenu_list = await service.read_many(target_menu_id,
                                            background_tasks)
-    return submenu_list
+    return PydanticJSONResponse(submenu_list)
 
 
 @submenu_router.post(
@@ -43,14 +44,14 @@ async def submenu_create(
         submenu_schema: SubmenuCreate,
         background_tasks: BackgroundTasks,
         service: SubmenuService = Depends()
-) -> SubmenuRead:
+) -> PydanticJSONResponse:
     submenu_schema_with_menu_id = SubmenuCreateWithMenuId(
         menu_id=target_menu_id, **submenu_schema.model_dump())
     new_submenu = await service.create(submenu_schema_with_menu_id,
                                        target_menu_id,
                                        background_tasks)
 
-    return new_submenu
+    return PydanticJSONResponse(new_submenu, status_code=201)
 
 
 @submenu_router.get(
@@ -63,11 +64,11 @@ async def submenu_read(
         target_menu_id: UUID,
         target_submenu_id: UUID,
         background_tasks: BackgroundTasks,
-        service: SubmenuService = Depends()
-) -> SubmenuRead:
+        service: SubmenuService = Depends(),
+) -> PydanticJSONResponse:
     target_submenu = await service.read(target_submenu_id, target_menu_id,
                                         background_tasks)
-    return target_submenu.get_dishes_count()
+    return PydanticJSONResponse(target_submenu.get_dishes_count())
 
 
 @submenu_router.delete(
@@ -82,10 +83,10 @@ async def submenu_delete(
         target_submenu_id: UUID,
         background_tasks: BackgroundTasks,
         service: SubmenuService = Depends()
-) -> SubmenuIdOnly:
+) -> PydanticJSONResponse:
     delete_submenu = await service.delete(target_submenu_id, target_menu_id,
                                           background_tasks)
-    return delete_submenu
+    return PydanticJSONResponse(delete_submenu)
 
 
 @submenu_router.patch(
@@ -100,9 +101,9 @@ async def submenu_patch(
         submenu_update: SubmenuCreate,
         background_tasks: BackgroundTasks,
         service: SubmenuService = Depends()
-) -> SubmenuRead:
+) -> PydanticJSONResponse:
     submenu = await service.patch(target_submenu_id,
                                   target_menu_id,
                                   submenu_update,
                                   background_tasks)
-    return submenu
+    return PydanticJSONResponse(submenu)
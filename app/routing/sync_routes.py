@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.routing.responses import PydanticJSONResponse
+from app.schemas.sync_schemas import SyncRunRead
+from app.services.sync_services import SyncService
+
+sync_router = APIRouter(tags=['sync-router'])
+
+
+@sync_router.get(
+    '/sync/runs',
+    status_code=200,
+    response_model=list[SyncRunRead],
+    name='sync-runs-read')
+async def read_sync_runs(
+        limit: int = Query(default=20, ge=1, le=100),
+        service: SyncService = Depends(),
+) -> PydanticJSONResponse:
+    runs = await service.read_runs(limit)
+    return PydanticJSONResponse(runs)
@@ -0,0 +1,30 @@
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+import settings
+from app.schemas.dish_schemas import DishRead
+from app.schemas.menu_schemas import MenuRead
+from app.schemas.submenu_schemas import SubmenuRead
+
+
+class BatchReadItem(BaseModel):
+    type: Literal['menu', 'submenu', 'dish']
+    id: UUID
+
+
+class BatchReadRequest(BaseModel):
+    reads: list[BatchReadItem] = Field(min_length=1,
+                                       max_length=settings.BATCH_MAX_READS)
+
+
+class BatchReadResult(BaseModel):
+    type: Literal['menu', 'submenu', 'dish']
+    id: UUID
+    status: int
+    data: MenuRead | SubmenuRead | DishRead | None = None
+
+
+class BatchReadResponse(BaseModel):
+    results: list[BatchReadResult]
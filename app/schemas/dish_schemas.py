@@ -1,7 +1,7 @@
-import logging
+from enum import Enum
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.schemas.base_schemas import TunedModel
 
@@ -11,27 +11,29 @@ class DishRead(TunedModel):
     title: str
     description: str
     price: float | str
+    # Discount is taken from database object and is never cached or shown,
+    # cached price already has it applied
+    discount: float | None = Field(default=None, exclude=True)
 
     def round_price(self) -> 'DishRead':
         self.price = ('%.2f' % float(self.price))
         return self
 
-    async def check_sale(self, cache):
+    def apply_discount(self) -> 'DishRead':
         """
-        Function that checks for a sale discount in the cache
-        service and updates the price of an item accordingly.
+        Function that applies sale discount of the dish to its price and
+        formats the effective price for output.
         """
-        sale = await cache.check_sale(self.id)
-
-        v = float(self.price)
-
-        if sale is not None:
-            logging.warning(f'Found sale for {self.title} is {sale}%')
-            v -= (v * float(sale) / 100)
-        self.price = ('%.2f' % v)
-
+        self.price = self.make_effective_price(float(self.price),
+                                               self.discount)
         return self
 
+    @staticmethod
+    def make_effective_price(price: float, discount: float | None) -> str:
+        if discount:
+            price -= price * discount / 100
+        return '%.2f' % price
+
 
 class DishCreate(BaseModel):
     title: str
@@ -45,3 +47,30 @@ class DishCreateWithSubmenuId(DishCreate):
 
 class DishIdOnly(BaseModel):
     id: UUID
+
+
+class DishSearchResult(DishRead):
+    menu_id: UUID
+    submenu_id: UUID
+
+
+class DishSearchPage(BaseModel):
+    items: list[DishSearchResult]
+    limit: int
+    offset: int
+    # Offset of the next page, None on the last page
+    next_offset: int | None = None
+
+
+class DishSort(str, Enum):
+    """Order of dishes list, minus sorts descending"""
+    price = 'price'
+    price_desc = '-price'
+    title = 'title'
+    title_desc = '-title'
+
+
+class DishPage(BaseModel):
+    items: list[DishSearchResult]
+    # Opaque cursor of the next page, None on the last page
+    next_cursor: str | None = None
@@ -1,3 +1,4 @@
+from enum import Enum
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -35,6 +36,13 @@ class MenuRead(TunedModel):
         return self
 
 
+class MenuDepth(str, Enum):
+    """How deep menus list is loaded: menus, menus with submenus or all"""
+    menu = 'menu'
+    submenu = 'submenu'
+    dish = 'dish'
+
+
 class MenuListSchema(BaseModel):
     menus: list[MenuRead]
 
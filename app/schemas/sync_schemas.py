@@ -0,0 +1,12 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class SyncRunRead(BaseModel):
+    started_at: datetime
+    duration: float
+    outcome: str
+    error: str | None = None
+    stages: dict[str, float] = {}
+    counters: dict[str, int] = {}
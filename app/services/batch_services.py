@@ -0,0 +1,128 @@
+import json
+from typing import Any
+from uuid import UUID
+
+from fastapi import BackgroundTasks, Depends
+from pydantic import BaseModel
+
+from app.db.models import Dish, Menu, SubMenu
+from app.db.repository.crud import MenuCrud
+from app.monitoring.timing import instrument_service
+from app.schemas.batch_schemas import (
+    BatchReadItem,
+    BatchReadResponse,
+    BatchReadResult
+)
+from app.schemas.dish_schemas import DishRead
+from app.schemas.menu_schemas import MenuRead
+from app.schemas.submenu_schemas import SubmenuRead
+from app.services.cache.cache_service import BatchCacheService
+
+# Database class, schema and field which only cached schema of this type has
+BATCH_TYPES: dict[str, tuple[type[Menu | SubMenu | Dish], type[BaseModel],
+                             str]] = {
+    'menu': (Menu, MenuRead, 'submenus'),
+    'submenu': (SubMenu, SubmenuRead, 'dishes'),
+    'dish': (Dish, DishRead, 'price'),
+}
+
+
+@instrument_service
+class BatchService:
+
+    def __init__(self,
+                 db: MenuCrud = Depends(),
+                 cache_manager: BatchCacheService = Depends()) -> None:
+        self.cache_manager = cache_manager
+        self.database_manager = db
+
+    async def read(self,
+                   reads: list[BatchReadItem],
+                   background_tasks: BackgroundTasks) -> BatchReadResponse:
+        """
+        Method serves many menu, submenu and dish reads at once. All cached
+        objects are taken with single MGET, missing ones are read with one IN
+        query per object type and cached after response is sent. Results keep
+        order of reads, objects not found get 404 status
+        """
+        keys = list(dict.fromkeys((item.type, item.id) for item in reads))
+        found: dict[tuple[str, UUID], BaseModel] = {}
+
+        cached_values = await self.cache_manager.get_many(
+            [object_id for _, object_id in keys])
+        missing: dict[str, list[UUID]] = {}
+        for (object_type, object_id), value in zip(keys, cached_values):
+            schema = self.parse_cached(object_type, value)
+            if schema is None:
+                missing.setdefault(object_type, []).append(object_id)
+            else:
+                found[(object_type, object_id)] = schema
+
+        for object_type, object_ids in missing.items():
+            object_class, _, _ = BATCH_TYPES[object_type]
+            objects = await self.database_manager.read_objects_by_ids(
+                object_class=object_class,
+                object_ids=object_ids
+            )
+            for obj in objects:
+                schema = self.make_schema(object_type, obj)
+                found[(object_type, obj.id)] = schema
+                background_tasks.add_task(
+                    self.cache_manager.set_model_cache,
+                    obj.id,
+                    schema
+                )
+
+        results = []
+        for item in reads:
+            schema = found.get((item.type, item.id))
+            results.append(BatchReadResult(
+                type=item.type,
+                id=item.id,
+                status=200 if schema is not None else 404,
+                data=self.prepare_output(schema)
+            ))
+        return BatchReadResponse(results=results)
+
+    @staticmethod
+    def parse_cached(object_type: str, value: str | None) -> BaseModel | None:
+        """
+        Method parses cached value with schema of requested type, value of
+        another type cached under the same id is treated as miss
+        """
+        if value is None:
+            return None
+        _, schema, marker_field = BATCH_TYPES[object_type]
+        data = json.loads(value)
+        if marker_field not in data:
+            return None
+        return schema(**data)
+
+    @staticmethod
+    def make_schema(object_type: str, obj: Any) -> BaseModel:
+        """Method builds schema of database object as its read service does"""
+        if object_type == 'dish':
+            return DishRead(**obj.__dict__).apply_discount()
+
+        if object_type == 'submenu':
+            submenu_schema = SubmenuRead(**obj.__dict__)
+            submenu_schema.dishes = [DishRead(**dish.__dict__).apply_discount()
+                                     for dish in obj.dishes]
+            return submenu_schema.get_dishes_count()
+
+        menu_schema = MenuRead(**obj.__dict__)
+        submenus_schemas = []
+        for submenu in obj.submenus:
+            submenu_schema = SubmenuRead(**submenu.__dict__)
+            submenu_schema.dishes = [DishRead(**dish.__dict__).apply_discount()
+                                     for dish in submenu.dishes]
+            submenus_schemas.append(submenu_schema.get_dishes_count())
+        menu_schema.submenus = submenus_schemas
+        return menu_schema.get_counts()
+
+    @staticmethod
+    def prepare_output(schema: BaseModel | None) -> BaseModel | None:
+        """Method sets dishes count of submenu like submenu read route does"""
+        if isinstance(schema, SubmenuRead):
+            return schema.model_copy().get_dishes_count()
+        return schema
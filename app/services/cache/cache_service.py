@@ -1,19 +1,45 @@
 import json
+from collections.abc import Callable, Iterable
+from hashlib import blake2b
+from typing import Any
 from uuid import UUID
 
 import aioredis
+from aioredis.exceptions import WatchError
 from fastapi import Depends
 from pydantic import BaseModel
 
-from app.db.session import get_redis
+import settings
+from app.db.session import get_binary_redis, get_redis
+from app.schemas.dish_schemas import DishRead, DishSearchPage
 from app.schemas.menu_schemas import MenuRead, MenuReadCounts
 from app.schemas.submenu_schemas import SubmenuRead
+from app.services.cache.encoding import ENCODINGS, compress_body, render_json
+
+# Hash with menus list variants loaded with depth and fields selection, it is
+# invalidated together with 'menus'
+MENUS_VARIANTS_KEY = 'menus_variants'
+
+# Values stored next to every cached entry: its ETag, its rendered response
+# body, the body compressed with each supported encoding and path of ids of
+# the object parents and the object itself
+COMPANION_SUFFIXES = ('etag', 'body', 'path', *ENCODINGS)
+
+# Stream of keys to invalidate, it is consumed by invalidation_consumer
+INVALIDATION_STREAM = 'cache_invalidations'
+
+# Patch of cached entry: schema of the value, whether the value is a list of
+# them and function returning patched value
+EntryPatch = tuple[type[BaseModel], bool, Callable[[Any], Any]]
 
 
 class CacheService:
 
     def __init__(self, cache: aioredis.Redis = Depends(get_redis)) -> None:
         self.cache = cache
+        # Compressed bodies are bytes, they are read with client which does
+        # not decode responses
+        self.binary_cache = get_binary_redis()
 
     @staticmethod
     async def deserialize_schema(schema: type[BaseModel]) -> str:
@@ -25,15 +51,112 @@ class CacheService:
                                schema: type[BaseModel]) -> BaseModel:
         return schema(**json.loads(json_str))
 
-    async def set_list(self, key: UUID | str, value: list[BaseModel]) -> None:
+    @staticmethod
+    def make_etag(value: str) -> str:
+        """Function returns strong ETag computed from cached value"""
+        return f'"{blake2b(value.encode(), digest_size=16).hexdigest()}"'
+
+    @classmethod
+    def make_companions(cls, prefix: str, value: str,
+                        body: bytes) -> dict[str, str | bytes]:
+        """
+        Function makes ETag of cached value, response body built from it and
+        compressed variants of the body, keyed with suffixes after prefix
+        """
+        companions: dict[str, str | bytes] = {
+            f'{prefix}etag': cls.make_etag(value),
+            f'{prefix}body': body,
+        }
+        for encoding, compressed in compress_body(body).items():
+            companions[f'{prefix}{encoding}'] = compressed
+        return companions
+
+    @staticmethod
+    def make_path(*ids: UUID | str) -> str:
+        """
+        Function joins ids of menu, submenu and dish into path of cached
+        object, it tells which route the entry may answer
+        """
+        return '/'.join(str(object_id) for object_id in ids)
+
+    async def set_value(self, key: UUID | str, value: str,
+                        body: bytes, path: str | None = None) -> None:
+        """
+        Function stores value together with its ETag and compressed response
+        body in one command, so a hit never hashes or compresses anything
+        """
+        entries = {str(key): value,
+                   **self.make_companions(f'{key}_', value, body)}
+        if path is not None:
+            entries[f'{key}_path'] = path
+        await self.cache.mset(entries)
+
+    async def get_response_parts(self, key: UUID | str,
+                                 encoding: str | None,
+                                 path: str | None = None
+                                 ) -> tuple[str | None, bytes | None]:
+        """
+        Function returns ETag of cached entry and its response body,
+        compressed with encoding if one is accepted, in one round trip.
+        When path is given, entry stored under another path is not returned:
+        ids of different objects share one key space, and the entry may
+        belong to another parent.
+        """
+        if path is None:
+            etag, body = await self.binary_cache.mget(
+                f'{key}_etag', f'{key}_{encoding or "body"}')
+        else:
+            etag, body, cached_path = await self.binary_cache.mget(
+                f'{key}_etag', f'{key}_{encoding or "body"}', f'{key}_path')
+            if cached_path is None or cached_path.decode() != path:
+                return None, None
+        return etag.decode() if etag is not None else None, body
+
+    @staticmethod
+    def make_delete_keys(keys: Iterable[UUID | str]) -> list[str]:
+        """Function returns keys of values together with their companions"""
+        keys = [str(key) for key in keys]
+        cache_keys = keys + [f'{key}_{suffix}' for key in keys
+                             for suffix in COMPANION_SUFFIXES]
+        if 'menus' in keys:
+            cache_keys.append(MENUS_VARIANTS_KEY)
+        return cache_keys
+
+    async def delete(self, *keys: UUID | str) -> None:
+        """Function deletes values with their companions in one command"""
+        await self.cache.delete(*self.make_delete_keys(keys))
+
+    async def invalidate(self, *keys: UUID | str) -> None:
+        """
+        Function publishes keys to invalidation stream, consumer deletes them
+        with their companions, merging duplicates published close together
+        """
+        await self.cache.xadd(INVALIDATION_STREAM,
+                              {'keys': json.dumps([str(key) for key in keys])})
+
+    async def set_list(self, key: UUID | str, value: list[BaseModel],
+                       path: str | None = None) -> None:
         serialized_list = [val.model_dump_json() for val in value]
-        await self.cache.set(str(key), json.dumps(serialized_list))
+        await self.set_value(key, json.dumps(serialized_list),
+                             render_json(value), path)
+
+    async def get_path_value(self, key: UUID | str,
+                             path: str | None) -> str | None:
+        """
+        Function returns cached value, if path is given only value stored
+        under the same path
+        """
+        if path is None:
+            return await self.cache.get(str(key))
+        value, cached_path = await self.cache.mget(str(key), f'{key}_path')
+        return value if cached_path == path else None
 
     async def get_model_cache(self,
                               key: str | UUID,
-                              schema: type[BaseModel]) -> BaseModel | None:
+                              schema: type[BaseModel],
+                              path: str | None = None) -> BaseModel | None:
         """Function checks for cache wth received key and return schema or None"""
-        value = await self.cache.get(str(key))
+        value = await self.get_path_value(key, path)
         if value is None:
             return None
         result = await self.serialize_schema(value, schema)
@@ -41,108 +164,415 @@ class CacheService:
 
     async def get_model_list_cache(self,
                                    key: str | None,
-                                   schema: type[BaseModel]
+                                   schema: type[BaseModel],
+                                   path: str | None = None
                                    ) -> list[BaseModel] | None:
         """
         Function used to get many cached schemas it checks for cache with received key
         and returns list of schemas value or None
         """
-        cached_list = await self.cache.get(key)
+        cached_list = await self.get_path_value(key, path)
         if cached_list is None:
             return None
         return [schema(**json.loads(cache)) for cache in
                 json.loads(cached_list)]
 
-    async def set_model_cache(self, key: UUID, value: type[BaseModel]) -> None:
-        await self.cache.set(str(key), await self.deserialize_schema(value))
+    async def set_model_cache(self, key: UUID, value: type[BaseModel],
+                              path: str | None = None) -> None:
+        await self.set_value(key, await self.deserialize_schema(value),
+                             render_json(value), path)
 
-    async def check_sale(self, dish_id: UUID) -> None | str:
-        sales_data = await self.cache.get('sales_data')
 
-        if sales_data is None:
-            return None
+class TreeCacheService(CacheService):
+    """
+    Write paths patch changed menu, submenu or dish inside every cached entry
+    which contains it, instead of dropping big derived entries, so the next
+    reader of a hot menu does not rebuild it. Entries are patched in one
+    WATCH/MULTI transaction, entries which are not cached are left alone.
+    When the transaction keeps conflicting, or write_through is off as in
+    bulk sheet synchronization, the entries are invalidated instead.
+    """
 
-        sales = json.loads(sales_data.replace("'", '"'))
-        if str(dish_id) not in sales:
-            return None
-        return sales[str(dish_id)]
+    write_through = True
+
+    async def patch_entries(self, patches: dict[str, EntryPatch],
+                            values: dict[str, BaseModel] | None = None,
+                            deleted: Iterable[UUID | str] = (),
+                            paths: dict[str, str] | None = None) -> None:
+        """
+        Function applies patches to cached entries, stores new values with
+        their paths and deletes keys with their companions in one
+        transaction. Menus list variants are dropped, patching every variant
+        is not worth it.
+        """
+        values = values or {}
+        deleted = [str(key) for key in deleted]
+        if self.write_through:
+            for _ in range(settings.CACHE_PATCH_RETRIES):
+                try:
+                    await self.apply_patches(patches, values, deleted,
+                                             paths or {})
+                    return
+                except WatchError:
+                    continue
+                except ValueError:
+                    # Cached value of unexpected shape
+                    break
+        await self.invalidate(*patches, *values, *deleted)
+
+    async def apply_patches(self, patches: dict[str, EntryPatch],
+                            values: dict[str, BaseModel],
+                            deleted: list[str],
+                            paths: dict[str, str]) -> None:
+        keys = list(patches)
+        async with self.cache.pipeline(transaction=True) as pipeline:
+            await pipeline.watch(*keys)
+            entries: dict[str, str | bytes] = {}
+            for key, cached in zip(keys, await pipeline.mget(keys)):
+                if cached is not None:
+                    entries.update(self.make_entry(key, cached,
+                                                   *patches[key]))
+            for key, value in values.items():
+                serialized = value.model_dump_json()
+                entries[key] = serialized
+                entries.update(self.make_companions(f'{key}_', serialized,
+                                                    render_json(value)))
+                if key in paths:
+                    entries[f'{key}_path'] = paths[key]
+            pipeline.multi()
+            if entries:
+                pipeline.mset(entries)
+            pipeline.delete(MENUS_VARIANTS_KEY,
+                            *self.make_delete_keys(deleted))
+            await pipeline.execute()
+
+    def make_entry(self, key: str, cached: str, schema: type[BaseModel],
+                   is_list: bool,
+                   patch: Callable[[Any], Any]) -> dict[str, str | bytes]:
+        """Function patches cached value and makes it with its companions"""
+        if is_list:
+            value = patch([schema(**json.loads(item))
+                           for item in json.loads(cached)])
+            serialized = json.dumps([item.model_dump_json()
+                                     for item in value])
+        else:
+            value = patch(schema(**json.loads(cached)))
+            serialized = value.model_dump_json()
+        return {key: serialized,
+                **self.make_companions(f'{key}_', serialized,
+                                       render_json(value))}
+
+    @staticmethod
+    def apply_to(item_id: UUID | str,
+                 change: Callable[[Any], Any]) -> Callable[[list], list]:
+        """Function makes patch of a list changing item with given id"""
+        def patch(items: list) -> list:
+            return [change(item) if str(item.id) == str(item_id) else item
+                    for item in items]
+        return patch
+
+    @staticmethod
+    def replace_item(items: list, new_item: BaseModel) -> list:
+        return [new_item if str(item.id) == str(new_item.id) else item
+                for item in items]
+
+    @staticmethod
+    def append_item(items: list, new_item: BaseModel) -> list:
+        return [item for item in items
+                if str(item.id) != str(new_item.id)] + [new_item]
+
+    @staticmethod
+    def remove_item(items: list, item_id: UUID | str) -> list:
+        return [item for item in items if str(item.id) != str(item_id)]
+
+    @staticmethod
+    def copy_fields(source: BaseModel) -> Callable[[Any], Any]:
+        """Function makes patch copying title and description of source"""
+        def patch(value: Any) -> Any:
+            value.title = source.title
+            value.description = source.description
+            return value
+        return patch
+
+    @staticmethod
+    def shift_counts(submenus: int = 0,
+                     dishes: int = 0) -> Callable[[Any], Any]:
+        def patch(counts: MenuReadCounts) -> MenuReadCounts:
+            counts.submenus_count += submenus
+            counts.dishes_count += dishes
+            return counts
+        return patch
+
+    def change_submenus(self, menu_id: UUID | str,
+                        change: Callable[[list], list],
+                        counts: EntryPatch | None = None,
+                        values: dict[str, BaseModel] | None = None,
+                        deleted: Iterable[UUID | str] = (),
+                        paths: dict[str, str] | None = None) -> dict:
+        """
+        Function makes patches of entries holding submenus of the menu:
+        submenus list, menu tree and menus list, with recounted menus
+        """
+        def change_menu(menu: MenuRead) -> MenuRead:
+            menu.submenus = change(menu.submenus)
+            return menu.get_counts()
+
+        patches: dict[str, EntryPatch] = {
+            f'{menu_id}_submenus': (SubmenuRead, True, change),
+            str(menu_id): (MenuRead, False, change_menu),
+            'menus': (MenuRead, True, self.apply_to(menu_id, change_menu)),
+        }
+        if counts is not None:
+            patches[f'{menu_id}_counts'] = counts
+        return {'patches': patches, 'values': values, 'deleted': deleted,
+                'paths': paths}
 
 
-class MenuCacheService(CacheService):
+class MenuCacheService(TreeCacheService):
 
-    async def invalidate_menu_cache(self, menu: MenuRead) -> None:
+    async def remove_menu(self, deleted: dict[str, list[UUID]]) -> None:
         """
-        Function used to invalidate menu cache with all related values.
-        Function takes menu schema, create list of ids,
-        then fills it  with all related submenus and dishes id by using loop
-        and deletes from cache each value from list
+        Function removes deleted menu from cached menus list and deletes
+        entries of the menu, its submenus and dishes by ids returned from
+        the delete
         """
-        ids = [menu.id, 'menus', f'{menu.id}_counts', f'{menu.id}_submenus']
-        if menu.submenus is not None:
-            for submenu in menu.submenus:
-                if submenu.dishes:
-                    for dish in submenu.dishes:
-                        ids.append(dish.id)
-                ids.append(submenu.id)
-                ids.append(f'{submenu.id}_dishes')
-        for item in ids:
-            await self.cache.delete(str(item))
+        menu_id = deleted['menu'][0]
+        keys = [menu_id, f'{menu_id}_counts', f'{menu_id}_submenus',
+                *deleted['dish']]
+        for submenu_id in deleted['submenu']:
+            keys += [submenu_id, f'{submenu_id}_dishes']
+        await self.patch_entries(
+            {'menus': (MenuRead, True,
+                       lambda menus: self.remove_item(menus, menu_id))},
+            deleted=keys)
 
-    async def create_menu_cache(self, key: UUID | str,
-                                value: MenuRead) -> None:
-        await self.cache.delete('menus')
-        deserialized_schema = await self.deserialize_schema(value)
-        await self.cache.set(str(key), deserialized_schema)
+    async def add_menu(self, menu: MenuRead) -> None:
+        """Function caches new menu and appends it to cached menus list"""
+        await self.patch_entries(
+            {'menus': (MenuRead, True,
+                       lambda menus: self.append_item(menus, menu))},
+            values={str(menu.id): menu},
+            paths={str(menu.id): self.make_path(menu.id)})
 
-    async def update_menu_cache(self, key: UUID, value: MenuRead) -> None:
-        await self.cache.delete('menus')
-        await self.cache.delete(f'{key}_counts')
-        value.id = str(value.id)
-        await self.cache.set(str(key), json.dumps(value.model_dump()))
+    async def patch_menu(self, menu: MenuRead) -> None:
+        """Function patches changed menu fields in entries holding the menu"""
+        copy_fields = self.copy_fields(menu)
+        await self.patch_entries({
+            str(menu.id): (MenuRead, False, copy_fields),
+            f'{menu.id}_counts': (MenuReadCounts, False, copy_fields),
+            'menus': (MenuRead, True, self.apply_to(menu.id, copy_fields)),
+        })
 
     async def set_menu_cache_with_counts(self, key: UUID,
                                          value: MenuReadCounts) -> None:
-        await self.cache.set(f'{key}_counts',
-                             await self.deserialize_schema(value))
-
-
-class SubmenuCacheService(CacheService):
-
-    async def invalidate_submenu_cache(self, submenu: SubmenuRead,
-                                       menu_id) -> None:
-        """
-        Function used to invalidate submenu cache with all related values.
-        Function takes submenu schema and menu id, creates list of ids,
-        then fills it by using loop and deletes from cache each value from list
-        """
-        ids = [menu_id, f'{menu_id}_submenus', f'{menu_id}_counts', 'menus']
-        if submenu.dishes:
-            for dish in submenu.dishes:
-                ids.append(dish.id)
-        ids.append(submenu.id)
-        for id in ids:
-            await self.cache.delete(str(id))
-
-    async def update_submenu_cache(self, menu_id: UUID,
-                                   submenu: SubmenuRead) -> None:
-        [await self.cache.delete(str(key)) for key in ['menus',
-                                                       f'{menu_id}',
-                                                       f'{menu_id}_submenus',
-                                                       f'{menu_id}_counts',
-                                                       ]]
-        await self.cache.set(str(submenu.id),
-                             await self.deserialize_schema(submenu))
-
-
-class DishCacheService(CacheService):
-
-    async def invalidate_dish_cache(self, key: UUID, submenu_key: UUID,
-                                    menu_key: UUID) -> None:
-        [await self.cache.delete(str(key)) for key in [key,
-                                                       menu_key,
-                                                       submenu_key,
-                                                       'menus'
-                                                       f'{menu_key}_counts',
-                                                       f'{menu_key}_submenus',
-                                                       f'{submenu_key}_dishes',
-                                                       ]]
+        await self.set_value(f'{key}_counts',
+                             await self.deserialize_schema(value),
+                             render_json(value))
+
+    async def get_menus_variant(self, variant: str) -> list[dict] | None:
+        value = await self.cache.hget(MENUS_VARIANTS_KEY, variant)
+        if value is None:
+            return None
+        return json.loads(value)
+
+    async def get_menus_variant_response_parts(
+            self, variant: str,
+            encoding: str | None) -> tuple[str | None, bytes | None]:
+        """Function works like get_response_parts for menus list variant"""
+        etag, body = await self.binary_cache.hmget(
+            MENUS_VARIANTS_KEY, f'{variant}_etag',
+            f'{variant}_{encoding or "body"}')
+        return etag.decode() if etag is not None else None, body
+
+    async def set_menus_variant(self, variant: str,
+                                value: list[dict]) -> None:
+        """
+        Function stores menus list variant with its ETag and compressed
+        bodies in one hash
+        """
+        serialized = json.dumps(value)
+        await self.cache.hset(MENUS_VARIANTS_KEY, mapping={
+            variant: serialized,
+            **self.make_companions(f'{variant}_', serialized,
+                                   render_json(value))
+        })
+
+
+class SubmenuCacheService(TreeCacheService):
+
+    async def add_submenu(self, menu_id: UUID, submenu: SubmenuRead) -> None:
+        """Function caches new submenu and adds it to entries of its menu"""
+        await self.patch_entries(**self.change_submenus(
+            menu_id, lambda submenus: self.append_item(submenus, submenu),
+            counts=(MenuReadCounts, False, self.shift_counts(submenus=1)),
+            values={str(submenu.id): submenu},
+            paths={str(submenu.id): self.make_path(menu_id, submenu.id)}))
+
+    async def patch_submenu(self, menu_id: UUID,
+                            submenu: SubmenuRead) -> None:
+        """Function patches changed submenu fields in entries holding it"""
+        copy_fields = self.copy_fields(submenu)
+        changes = self.change_submenus(menu_id,
+                                       self.apply_to(submenu.id, copy_fields))
+        changes['patches'][str(submenu.id)] = (SubmenuRead, False,
+                                               copy_fields)
+        await self.patch_entries(**changes)
+
+    async def remove_submenu(self, menu_id: UUID,
+                             deleted: dict[str, list[UUID]]) -> None:
+        """
+        Function removes submenu from entries of its menu and deletes entries
+        of the submenu and its dishes by ids returned from the delete
+        """
+        submenu_id = deleted['submenu'][0]
+        dish_ids = deleted['dish']
+        await self.patch_entries(**self.change_submenus(
+            menu_id, lambda submenus: self.remove_item(submenus, submenu_id),
+            counts=(MenuReadCounts, False,
+                    self.shift_counts(submenus=-1, dishes=-len(dish_ids))),
+            deleted=[submenu_id, f'{submenu_id}_dishes', *dish_ids]))
+
+
+class DishCacheService(TreeCacheService):
+
+    async def change_dishes(self, menu_id: UUID, submenu_id: UUID,
+                            change: Callable[[list], list],
+                            dishes_delta: int = 0,
+                            values: dict[str, BaseModel] | None = None,
+                            deleted: Iterable[UUID | str] = (),
+                            paths: dict[str, str] | None = None) -> None:
+        """
+        Function patches dishes of the submenu in its dishes list, submenu,
+        submenus list, menu tree and menus list and shifts dish counts
+        """
+        def change_submenu(submenu: SubmenuRead) -> SubmenuRead:
+            submenu.dishes = change(submenu.dishes)
+            return submenu.get_dishes_count()
+
+        changes = self.change_submenus(
+            menu_id, self.apply_to(submenu_id, change_submenu),
+            counts=(MenuReadCounts, False,
+                    self.shift_counts(dishes=dishes_delta))
+            if dishes_delta else None,
+            values=values, deleted=deleted, paths=paths)
+        changes['patches'].update({
+            f'{submenu_id}_dishes': (DishRead, True, change),
+            str(submenu_id): (SubmenuRead, False, change_submenu),
+        })
+        await self.patch_entries(**changes)
+
+    async def add_dish(self, menu_id: UUID, submenu_id: UUID,
+                       dish: DishRead) -> None:
+        await self.change_dishes(
+            menu_id, submenu_id,
+            lambda dishes: self.append_item(dishes, dish),
+            dishes_delta=1, values={str(dish.id): dish},
+            paths={str(dish.id): self.make_path(menu_id, submenu_id,
+                                                dish.id)})
+
+    async def patch_dish(self, menu_id: UUID, submenu_id: UUID,
+                         dish: DishRead) -> None:
+        await self.change_dishes(
+            menu_id, submenu_id,
+            lambda dishes: self.replace_item(dishes, dish),
+            values={str(dish.id): dish},
+            paths={str(dish.id): self.make_path(menu_id, submenu_id,
+                                                dish.id)})
+
+    async def remove_dish(self, menu_id: UUID, submenu_id: UUID,
+                          dish_id: UUID) -> None:
+        await self.change_dishes(
+            menu_id, submenu_id,
+            lambda dishes: self.remove_item(dishes, dish_id),
+            dishes_delta=-1, deleted=[dish_id])
+
+    @staticmethod
+    def make_search_key(query: str, limit: int, offset: int) -> str:
+        digest = blake2b(f'{query}:{limit}:{offset}'.encode(),
+                         digest_size=16).hexdigest()
+        return f'dish_search_{digest}'
+
+    async def get_search_page(self, key: str) -> DishSearchPage | None:
+        cached = await self.cache.get(key)
+        if cached is None:
+            return None
+        return DishSearchPage.model_validate_json(cached)
+
+    async def set_search_page(self, key: str, page: DishSearchPage) -> None:
+        """
+        Function caches search results with short TTL, they are not
+        invalidated on writes
+        """
+        await self.cache.setex(key, settings.DISH_SEARCH_CACHE_TTL,
+                               page.model_dump_json())
+
+
+class PriceCacheService(TreeCacheService):
+
+    async def update_dish_prices(self, dishes: list[Any]) -> None:
+        """
+        Function takes dishes with changed effective prices together with
+        their submenu and menu ids and rewrites prices in cached entries which
+        contain these dishes: dish itself, submenu and its dishes list, menu,
+        its submenus list and menus list. Entries are patched in one
+        transaction, entries which are not cached are left alone, menus list
+        variants are dropped.
+        """
+        if not dishes:
+            return
+        prices = {}
+        schemas: dict[str, tuple[type[BaseModel], bool]] = {
+            'menus': (MenuRead, True)
+        }
+        for dish in dishes:
+            prices[str(dish.id)] = DishRead.make_effective_price(
+                dish.price, dish.discount)
+            schemas[str(dish.id)] = (DishRead, False)
+            schemas[str(dish.submenu_id)] = (SubmenuRead, False)
+            schemas[f'{dish.submenu_id}_dishes'] = (DishRead, True)
+            schemas[str(dish.menu_id)] = (MenuRead, False)
+            schemas[f'{dish.menu_id}_submenus'] = (SubmenuRead, True)
+
+        def patch(value: Any) -> Any:
+            if isinstance(value, list):
+                return [patch(item) for item in value]
+            return type(value)(**self.patch_prices(
+                value.model_dump(mode='json'), prices))
+
+        await self.patch_entries({key: (schema, is_list, patch)
+                                  for key, (schema, is_list)
+                                  in schemas.items()})
+
+    @classmethod
+    def patch_prices(cls, obj: Any, prices: dict[str, str]) -> Any:
+        """Function replaces prices of dishes found in nested cached object"""
+        if isinstance(obj, dict):
+            if 'price' in obj and obj.get('id') in prices:
+                obj['price'] = prices[obj['id']]
+            for value in obj.values():
+                cls.patch_prices(value, prices)
+        elif isinstance(obj, list):
+            for value in obj:
+                cls.patch_prices(value, prices)
+        return obj
+
+
+class BatchCacheService(CacheService):
+
+    async def get_many(self, keys: list[UUID | str]) -> list[str | None]:
+        """Function returns cached values of all keys with single MGET"""
+        return await self.cache.mget([str(key) for key in keys])
+
+
+class SyncRunCacheService(CacheService):
+
+    async def add_sync_run(self, run: dict) -> None:
+        """Function stores sync run telemetry keeping only the latest runs"""
+        await self.cache.lpush('sync_runs', json.dumps(run))
+        await self.cache.ltrim('sync_runs', 0,
+                               settings.SYNC_TELEMETRY_HISTORY - 1)
+
+    async def get_sync_runs(self, limit: int) -> list[dict]:
+        """Function returns telemetry of the latest sync runs, newest first"""
+        runs = await self.cache.lrange('sync_runs', 0, limit - 1)
+        return [json.loads(run) for run in runs]
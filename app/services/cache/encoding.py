@@ -0,0 +1,38 @@
+import gzip
+from functools import lru_cache
+from typing import Any
+
+import brotli
+import orjson
+from pydantic import BaseModel, TypeAdapter
+
+import settings
+
+# Content encodings of pre-compressed bodies in order of preference
+ENCODINGS = ('br', 'gzip')
+
+
+@lru_cache
+def get_type_adapter(content_type: Any) -> TypeAdapter:
+    return TypeAdapter(content_type)
+
+
+def render_json(content: Any) -> bytes:
+    """
+    Function encodes pydantic model or list of models to JSON bytes with
+    pydantic-core serializer in one pass, other content is encoded with orjson
+    """
+    if isinstance(content, BaseModel):
+        return get_type_adapter(type(content)).dump_json(content)
+    if isinstance(content, list) and content and isinstance(content[0],
+                                                            BaseModel):
+        return get_type_adapter(list[type(content[0])]).dump_json(content)
+    return orjson.dumps(content)
+
+
+def compress_body(body: bytes) -> dict[str, bytes]:
+    """Function compresses response body with every supported encoding"""
+    return {
+        'br': brotli.compress(body, quality=settings.CACHE_BROTLI_QUALITY),
+        'gzip': gzip.compress(body, compresslevel=settings.CACHE_GZIP_LEVEL),
+    }
@@ -0,0 +1,163 @@
+"""
+Consumer applying cache invalidations published to the stream by
+CacheService.invalidate. Run one or more: python -m
+app.services.cache.invalidation_consumer
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from typing import Any
+
+import aioredis
+from aioredis.exceptions import RedisError, ResponseError
+
+import settings
+from app.db.session import get_redis
+from app.services.cache.cache_service import (
+    INVALIDATION_STREAM,
+    CacheService
+)
+
+INVALIDATION_GROUP = 'cache_invalidators'
+
+logger = logging.getLogger('app.invalidations')
+
+
+class InvalidationConsumer:
+    """
+    Member of the consumer group of the invalidation stream. Keys of entries
+    read within the window are merged, so a burst of writes to one menu
+    deletes its entries once, and deleted in pipelined batches. Entries are
+    acknowledged and removed from the stream only after their keys are
+    deleted, entries of a consumer which stopped before that are claimed by
+    others after INVALIDATION_CLAIM_IDLE_MS. Malformed entries are logged and
+    acknowledged, so they do not stop the entries after them.
+    """
+
+    def __init__(self, cache: aioredis.Redis, name: str) -> None:
+        self.cache = cache
+        self.name = name
+
+    async def ensure_group(self) -> None:
+        try:
+            await self.cache.xgroup_create(INVALIDATION_STREAM,
+                                           INVALIDATION_GROUP, id='0',
+                                           mkstream=True)
+        except ResponseError as error:
+            if 'BUSYGROUP' not in str(error):
+                raise
+
+    async def claim_stale(self) -> list[tuple[str, dict | None]]:
+        """Method takes over entries pending too long with other consumers"""
+        # XAUTOCLAIM has no wrapper in aioredis 2.0
+        response = await self.cache.execute_command(
+            'XAUTOCLAIM', INVALIDATION_STREAM, INVALIDATION_GROUP, self.name,
+            settings.INVALIDATION_CLAIM_IDLE_MS, '0-0',
+            'COUNT', settings.INVALIDATION_BATCH_SIZE)
+        return [(entry_id, dict(zip(fields[::2], fields[1::2]))
+                 if fields else None)
+                for entry_id, fields in response[1]]
+
+    async def read_new(self, count: int,
+                       block: int | None) -> list[tuple[str, Any]]:
+        response = await self.cache.xreadgroup(
+            INVALIDATION_GROUP, self.name, {INVALIDATION_STREAM: '>'},
+            count=count, block=block)
+        return response[0][1] if response else []
+
+    async def process(self, block: int | None = None,
+                      window: float = 0.0) -> int:
+        """
+        Method reads entries for the window after the first one, deletes
+        their keys and acknowledges them, returns number of entries
+        """
+        batch_size = settings.INVALIDATION_BATCH_SIZE
+        entries = await self.claim_stale()
+        if not entries:
+            entries = await self.read_new(batch_size, block)
+        if not entries:
+            return 0
+
+        deadline = time.monotonic() + window
+        while len(entries) < batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            more = await self.read_new(batch_size - len(entries),
+                                       max(int(remaining * 1000), 1))
+            if not more:
+                break
+            entries.extend(more)
+
+        keys: set[str] = set()
+        for entry_id, fields in entries:
+            # Entry deleted from the stream is claimed without fields
+            if fields:
+                keys.update(self.parse_keys(entry_id, fields))
+        await self.delete(keys)
+
+        entry_ids = [entry_id for entry_id, _ in entries]
+        async with self.cache.pipeline(transaction=True) as pipeline:
+            pipeline.xack(INVALIDATION_STREAM, INVALIDATION_GROUP, *entry_ids)
+            pipeline.xdel(INVALIDATION_STREAM, *entry_ids)
+            await pipeline.execute()
+        logger.debug('Applied %d invalidations, %d keys', len(entries),
+                     len(keys))
+        return len(entries)
+
+    @staticmethod
+    def parse_keys(entry_id: str, fields: dict) -> list[str]:
+        """Method returns keys of entry, none if entry is malformed"""
+        try:
+            keys = json.loads(fields['keys'])
+        except (KeyError, TypeError, ValueError):
+            keys = None
+        if (not isinstance(keys, list)
+                or not all(isinstance(key, str) for key in keys)):
+            logger.error('Skipping malformed invalidation %s: %r', entry_id,
+                         fields)
+            return []
+        return keys
+
+    async def delete(self, keys: set[str]) -> None:
+        """Method deletes keys with companions in pipelined batches"""
+        cache_keys = CacheService.make_delete_keys(sorted(keys))
+        batch_size = settings.INVALIDATION_BATCH_SIZE
+        async with self.cache.pipeline(transaction=False) as pipeline:
+            for start in range(0, len(cache_keys), batch_size):
+                pipeline.delete(*cache_keys[start:start + batch_size])
+            await pipeline.execute()
+
+    async def drain(self) -> int:
+        """Method applies all published invalidations without waiting"""
+        await self.ensure_group()
+        processed = 0
+        while number := await self.process():
+            processed += number
+        return processed
+
+    async def run(self) -> None:
+        window = settings.INVALIDATION_WINDOW_MS / 1000
+        group_ready = False
+        while True:
+            try:
+                if not group_ready:
+                    await self.ensure_group()
+                    group_ready = True
+                await self.process(block=1000, window=window)
+            except RedisError:
+                # Unapplied entries stay pending and are read again, group
+                # is created again in case the stream was flushed with it
+                logger.exception('Applying invalidations failed, retrying')
+                group_ready = False
+                await asyncio.sleep(1)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    consumer = InvalidationConsumer(
+        get_redis(), f'{socket.gethostname()}-{os.getpid()}')
+    asyncio.run(consumer.run())
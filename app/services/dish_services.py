@@ -1,18 +1,29 @@
+import base64
+import binascii
+import json
+import re
+from typing import Any
 from uuid import UUID
 
-from fastapi import BackgroundTasks, Depends
+from fastapi import BackgroundTasks, Depends, HTTPException
 
 from app.db.models import Dish, SubMenu
 from app.db.repository.crud import MenuCrud
+from app.monitoring.timing import instrument_service
 from app.schemas.dish_schemas import (
     DishCreate,
     DishCreateWithSubmenuId,
     DishIdOnly,
+    DishPage,
     DishRead,
+    DishSearchPage,
+    DishSearchResult,
+    DishSort,
 )
 from app.services.cache.cache_service import DishCacheService
 
 
+@instrument_service
 class DishService:
 
     def __init__(self,
@@ -38,31 +49,24 @@ class DishService:
             object_id=target_id,
             object_schema=dish_update
         )
-        dish = DishRead(**update_result.__dict__).round_price()
+        dish = DishRead(**update_result.__dict__).apply_discount()
 
-        background_tasks.add_task(
-            self.cache.invalidate_dish_cache,
-            key=target_id,
-            menu_key=target_menu_id,
-            submenu_key=target_submenu_id
-        )
-        background_tasks.add_task(
-            self.cache.set_model_cache,
-            dish.id,
-            dish
-        )
+        await self.cache.patch_dish(target_menu_id, target_submenu_id, dish)
         return dish
 
     async def read_many(self, target_id: UUID,
+                        target_menu_id: UUID,
                         background_tasks: BackgroundTasks) -> list[DishRead]:
         """
         Method takes submenu id and sends it to cache manager, returns list
         of dish if value exists in cache, otherwise function sends id to
         database manager, then return list of submenus if are in
         """
+        path = self.cache.make_path(target_menu_id, target_id)
         cached = await self.cache.get_model_list_cache(
             f'{target_id}_dishes',
-            DishRead
+            DishRead,
+            path
         )
         if cached is not None:
             return cached
@@ -71,13 +75,13 @@ class DishService:
             object_class=Dish,
             submenu_id=target_id
         )
-        dishes_schemas = [await (DishRead(**dish.__dict__)
-                                 .check_sale(self.cache))
+        dishes_schemas = [DishRead(**dish.__dict__).apply_discount()
                           for dish in dishes]
         background_tasks.add_task(
             self.cache.set_list,
             f'{target_id}_dishes',
-            dishes_schemas
+            dishes_schemas,
+            path
         )
         return dishes_schemas
 
@@ -97,32 +101,27 @@ class DishService:
             parent_id=dish_schema.submenu_id,
             parent_class=SubMenu
         )
-        new_dish_schema = await DishRead(**new_dish.__dict__).check_sale(
-            self.cache)
+        new_dish_schema = DishRead(**new_dish.__dict__).apply_discount()
 
-        background_tasks.add_task(
-            self.cache.invalidate_dish_cache,
-            key=new_dish.id,
-            menu_key=target_menu_id,
-            submenu_key=target_submenu_id
-        )
-        background_tasks.add_task(
-            self.cache.set_model_cache,
-            new_dish.id,
-            new_dish_schema
-        )
+        await self.cache.add_dish(target_menu_id, target_submenu_id,
+                                  new_dish_schema)
         return new_dish_schema
 
     async def read(self, target_id: UUID,
+                   target_submenu_id: UUID,
+                   target_menu_id: UUID,
                    background_tasks: BackgroundTasks) -> DishRead:
         """
         Method takes id and sends it checks if target menu in cache if it is
         returns cached value otherwise firstly gets data from database manager,
          then saves with cache manager and returns submenu schema
         """
+        path = self.cache.make_path(target_menu_id, target_submenu_id,
+                                    target_id)
         cached = await self.cache.get_model_cache(
             target_id,
-            DishRead
+            DishRead,
+            path
         )
         if cached is not None:
             return cached.round_price()
@@ -131,12 +130,15 @@ class DishService:
             object_id=target_id,
             object_class=Dish
         )
-        dish = await DishRead(**dish_db.__dict__).check_sale(self.cache)
+        if dish_db.submenu_id != target_submenu_id:
+            raise HTTPException(status_code=404, detail='dish not found')
+        dish = DishRead(**dish_db.__dict__).apply_discount()
 
         background_tasks.add_task(
             self.cache.set_model_cache,
             target_id,
-            dish
+            dish,
+            path
         )
         return dish
 
@@ -156,10 +158,84 @@ class DishService:
         )
         dish_id_only = DishIdOnly(id=target_id)
 
-        background_tasks.add_task(
-            self.cache.invalidate_dish_cache,
-            key=target_id,
-            menu_key=target_menu_id,
-            submenu_key=target_submenu_id
-        )
+        await self.cache.remove_dish(target_menu_id, target_submenu_id,
+                                     target_id)
         return dish_id_only
+
+    @staticmethod
+    def make_search_query(text: str) -> str:
+        """
+        Method makes tsquery matching dishes which have words starting with
+        every word of the text, so unfinished words match too
+        """
+        words = re.findall(r'\w+', text.lower())
+        if not words:
+            raise HTTPException(status_code=422,
+                                detail='Search query has no words')
+        return ' & '.join(f'{word}:*' for word in words)
+
+    async def search(self, text: str, limit: int, offset: int,
+                     background_tasks: BackgroundTasks) -> DishSearchPage:
+        """
+        Method returns page of dishes found by full-text search with ids of
+        their parents and sale prices, pages are cached for a short time
+        """
+        search_query = self.make_search_query(text)
+        key = self.cache.make_search_key(search_query, limit, offset)
+        cached = await self.cache.get_search_page(key)
+        if cached is not None:
+            return cached
+
+        # One extra row tells whether there is a next page
+        rows = await self.database_manager.search_dishes(search_query,
+                                                         limit + 1, offset)
+        items = [DishSearchResult(**row._mapping).apply_discount()
+                 for row in rows[:limit]]
+        page = DishSearchPage(
+            items=items, limit=limit, offset=offset,
+            next_offset=offset + limit if len(rows) > limit else None)
+
+        background_tasks.add_task(self.cache.set_search_page, key, page)
+        return page
+
+    @staticmethod
+    def make_cursor(sort: DishSort, sort_value: Any, dish_id: UUID) -> str:
+        """Method encodes order and position of the last dish of a page"""
+        position = json.dumps([sort.value, sort_value, str(dish_id)])
+        return base64.urlsafe_b64encode(position.encode()).decode()
+
+    @staticmethod
+    def parse_cursor(cursor: str, sort: DishSort) -> tuple[Any, UUID]:
+        """Method decodes cursor, it is valid only for the same order"""
+        try:
+            cursor_sort, sort_value, dish_id = json.loads(
+                base64.urlsafe_b64decode(cursor.encode()))
+            if cursor_sort != sort.value:
+                raise ValueError
+            return sort_value, UUID(dish_id)
+        except (binascii.Error, ValueError, TypeError):
+            raise HTTPException(status_code=422, detail='Invalid cursor')
+
+    async def read_filtered(self, sort: DishSort, limit: int,
+                            cursor: str | None = None,
+                            **filters: Any) -> DishPage:
+        """
+        Method returns page of dishes across the catalog filtered and sorted
+        in database, with cursor of the next page
+        """
+        after = (self.parse_cursor(cursor, sort) if cursor is not None
+                 else None)
+        rows = await self.database_manager.filter_dishes(
+            sort_column=sort.value.lstrip('-'),
+            descending=sort.value.startswith('-'),
+            limit=limit + 1,
+            after=after,
+            **filters)
+
+        items = [DishSearchResult(**row._mapping).apply_discount()
+                 for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = self.make_cursor(sort, last.sort_value, last.id)
+        return DishPage(items=items, next_cursor=next_cursor)
@@ -1,12 +1,15 @@
 from uuid import UUID
 
-from fastapi import BackgroundTasks, Depends
+from fastapi import BackgroundTasks, Depends, HTTPException
 
+import settings
 from app.db.models import Menu
 from app.db.repository.crud import MenuCrud
+from app.monitoring.timing import instrument_service
 from app.schemas.dish_schemas import DishRead
 from app.schemas.menu_schemas import (
     MenuCreate,
+    MenuDepth,
     MenuIdOnly,
     MenuRead,
     MenuReadCounts
@@ -15,6 +18,7 @@ from app.schemas.submenu_schemas import SubmenuRead
 from app.services.cache.cache_service import MenuCacheService
 
 
+@instrument_service
 class MenuService:
 
     def __init__(self,
@@ -80,8 +84,7 @@ class MenuService:
 
             for submenu in menu.submenus:
                 submenu_schema = SubmenuRead(**submenu.__dict__)
-                dishes_schemas = [await (DishRead(**dish.__dict__)
-                                         .check_sale(self.cache_manager))
+                dishes_schemas = [DishRead(**dish.__dict__).apply_discount()
                                   for dish in submenu.dishes]
                 submenu_schema.dishes = dishes_schemas
                 submenu_schema.get_dishes_count()
@@ -98,6 +101,89 @@ class MenuService:
         )
         return result
 
+    @staticmethod
+    def parse_fields(depth: MenuDepth, fields: str | None) -> list[str] | None:
+        """
+        Method splits comma separated fields of menus selection and checks
+        them, submenus can not be selected when only menus are loaded
+        """
+        if fields is None:
+            return None
+        selected = sorted({field.strip() for field in fields.split(',')
+                           if field.strip()})
+        allowed = set(MenuRead.model_fields)
+        if depth is MenuDepth.menu:
+            allowed.discard('submenus')
+        unknown = [field for field in selected if field not in allowed]
+        if unknown or not selected:
+            raise HTTPException(
+                status_code=422,
+                detail=f'Unknown fields: {", ".join(unknown)}. '
+                       f'Allowed fields: {", ".join(sorted(allowed))}'
+            )
+        return selected
+
+    @staticmethod
+    def make_variant(depth: MenuDepth, fields: list[str] | None) -> str:
+        return f'{depth.value}:{",".join(fields or [])}'
+
+    async def read_many_selected(self,
+                                 depth: MenuDepth,
+                                 fields: list[str] | None,
+                                 background_tasks: BackgroundTasks
+                                 ) -> list[dict]:
+        """
+        Method returns menus list loaded only to requested depth with only
+        requested fields. Each variant is cached separately, menus depth is
+        counted by database without loading submenus, submenu depth loads
+        submenus with dishes counts but without dishes
+        """
+        variant = self.make_variant(depth, fields)
+        cached = await self.cache_manager.get_menus_variant(variant)
+        if cached is not None:
+            return cached
+
+        if depth is MenuDepth.dish:
+            menus = await self.read_many(background_tasks)
+            exclude = None
+        elif depth is MenuDepth.submenu:
+            menus_db, dishes_counts = (
+                await self.database_manager.read_menus_with_submenus())
+            menus = []
+            for menu in menus_db:
+                # Only columns are copied, dishes relationship is not loaded
+                menu_schema = MenuRead(id=menu.id,
+                                       title=menu.title,
+                                       description=menu.description)
+                menu_schema.submenus = [
+                    SubmenuRead(id=submenu.id,
+                                title=submenu.title,
+                                description=submenu.description,
+                                dishes_count=dishes_counts.get(submenu.id, 0))
+                    for submenu in menu.submenus
+                ]
+                menus.append(menu_schema.get_counts())
+            exclude = {'submenus': {'__all__': {'dishes'}}}
+        else:
+            menus = [MenuRead(id=menu.id,
+                              title=menu.title,
+                              description=menu.description,
+                              submenus_count=menu.submenu_count,
+                              dishes_count=menu.dish_count)
+                     for menu in
+                     await self.database_manager.read_menus_with_counts()]
+            exclude = {'submenus'}
+
+        include = set(fields) if fields else None
+        result = [menu.model_dump(mode='json', include=include,
+                                  exclude=exclude) for menu in menus]
+        background_tasks.add_task(
+            self.cache_manager.set_menus_variant,
+            variant,
+            result
+        )
+        return result
+
     async def create(self,
                      menu_schema: MenuCreate,
                      background_tasks: BackgroundTasks
@@ -110,11 +196,7 @@ class MenuService:
         menu_schema = MenuRead(**new_menu.__dict__)
         menu_schema.submenus = []
 
-        background_tasks.add_task(
-            self.cache_manager.create_menu_cache,
-            menu_schema.id,
-            menu_schema
-        )
+        await self.cache_manager.add_menu(menu_schema)
         return menu_schema
 
     async def read(self,
@@ -126,10 +208,12 @@ class MenuService:
         otherwise sends menu id to database controller serializes into
         pydantic model and returns
         """
+        path = self.cache_manager.make_path(target_id)
         if _no_cache is False:
             cached = await self.cache_manager.get_model_cache(
                 target_id,
-                MenuRead
+                MenuRead,
+                path
             )
             if cached is not None:
                 return cached
@@ -142,11 +226,10 @@ class MenuService:
         submenus_schemas = []
         for submenu in object_db.submenus:
             submenu_schema = SubmenuRead(**submenu.__dict__)
-            # if __no_cache is true then this called from celery task, so no
-            # need to verify available sale
+            # if __no_cache is true then this called from celery task, which
+            # compares dishes prices with the sheet ones, so no discount
             if _no_cache is False:
-                dishes_schemas = [await (DishRead(**dish.__dict__)
-                                         .check_sale(self.cache_manager))
+                dishes_schemas = [DishRead(**dish.__dict__).apply_discount()
                                   for dish in submenu.dishes]
             else:
                 dishes_schemas = [DishRead(**dish.__dict__)
@@ -163,7 +246,8 @@ class MenuService:
             background_tasks.add_task(
                 self.cache_manager.set_model_cache,
                 target_id,
-                menu_schema
+                menu_schema,
+                path
             )
         return menu_schema
 
@@ -175,18 +259,14 @@ class MenuService:
         Function takes menu id and send it to database manager and deletes
         cache with cache manager then returns deleted menu id
         """
-        menu = await self.database_manager.read_object(
-            object_class=Menu,
-            object_id=target_id
-        )
-        background_tasks.add_task(
-            self.cache_manager.invalidate_menu_cache,
-            MenuRead(**menu.__dict__)
-        )
-        await self.database_manager.delete_object(
-            object_class=Menu,
-            object_id=target_id
-        )
+        if settings.MENU_TOMBSTONES:
+            deleted = await self.database_manager.mark_menu_deleted(target_id)
+        else:
+            deleted = await self.database_manager.delete_tree(
+                object_class=Menu,
+                object_id=target_id
+            )
+        await self.cache_manager.remove_menu(deleted)
         return MenuIdOnly(menu_id=target_id)
 
     async def patch(self,
@@ -204,9 +284,5 @@ class MenuService:
             object_schema=menu_update
         )
         menu_schema = MenuRead(**update_result.__dict__)
-        background_tasks.add_task(
-            self.cache_manager.update_menu_cache,
-            target_id,
-            menu_schema
-        )
+        await self.cache_manager.patch_menu(menu_schema)
         return menu_schema
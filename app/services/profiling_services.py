@@ -0,0 +1,87 @@
+import hmac
+import os
+import re
+import time
+import uuid
+from datetime import datetime, timezone
+
+from fastapi import Header, HTTPException
+
+import settings
+from app.schemas.profiling_schemas import ProfileRead
+
+PROFILE_EXTENSIONS = {'html': 'html', 'speedscope': 'speedscope.json'}
+
+# Names of saved profiles: time, short id, duration, method and route
+PROFILE_NAME_PATTERN = re.compile(
+    r'\d{8}T\d{6}_[0-9a-f]{8}_\d+ms_[A-Z]+_[\w.-]*\.(html|speedscope\.json)')
+
+
+def is_profiling_authorized(token: str | None) -> bool:
+    """Function compares given token with configured profiling token"""
+    if not settings.PROFILING_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode(),
+                               settings.PROFILING_TOKEN.encode())
+
+
+async def check_profiling_token(
+        x_profile: str | None = Header(default=None)) -> None:
+    """Dependency hiding profiles from requests without profiling token"""
+    if not is_profiling_authorized(x_profile):
+        raise HTTPException(status_code=404, detail='Not Found')
+
+
+class ProfilingService:
+
+    @staticmethod
+    def make_profile_name(method: str, path: str, duration: float) -> str:
+        """Method makes file name of the profile of a request"""
+        route = re.sub(r'[^\w.-]+', '-', path).strip('-')[:80]
+        extension = PROFILE_EXTENSIONS[settings.PROFILING_FORMAT]
+        return (f'{time.strftime("%Y%m%dT%H%M%S", time.gmtime())}_'
+                f'{uuid.uuid4().hex[:8]}_{round(duration * 1000)}ms_'
+                f'{method}_{route}.{extension}')
+
+    def save_profile(self, name: str, content: str) -> None:
+        """
+        Method writes profile to profiles directory and removes the oldest
+        profiles over the kept number
+        """
+        os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+        with open(os.path.join(settings.PROFILING_DIR, name), 'w',
+                  encoding='utf-8') as profile_file:
+            profile_file.write(content)
+        for profile in self.list_profiles()[settings.PROFILING_KEEP:]:
+            try:
+                os.remove(os.path.join(settings.PROFILING_DIR, profile.name))
+            except FileNotFoundError:
+                pass
+
+    def list_profiles(self, limit: int | None = None) -> list[ProfileRead]:
+        """Method returns saved profiles, newest first"""
+        try:
+            entries = list(os.scandir(settings.PROFILING_DIR))
+        except FileNotFoundError:
+            return []
+        profiles = []
+        for entry in entries:
+            if not PROFILE_NAME_PATTERN.fullmatch(entry.name):
+                continue
+            stat = entry.stat()
+            profiles.append(ProfileRead(
+                name=entry.name,
+                size=stat.st_size,
+                created_at=datetime.fromtimestamp(stat.st_mtime,
+                                                  tz=timezone.utc)))
+        profiles.sort(key=lambda profile: (profile.created_at, profile.name),
+                      reverse=True)
+        return profiles[:limit]
+
+    def get_profile_path(self, name: str) -> str:
+        """Method returns path of saved profile, raises 404 if there is none"""
+        path = os.path.join(settings.PROFILING_DIR, name)
+        if (not PROFILE_NAME_PATTERN.fullmatch(name)
+                or not os.path.isfile(path)):
+            raise HTTPException(status_code=404, detail='profile not found')
+        return path
@@ -1,9 +1,10 @@
 from uuid import UUID
 
-from fastapi import BackgroundTasks, Depends
+from fastapi import BackgroundTasks, Depends, HTTPException
 
 from app.db.models import Menu, SubMenu
 from app.db.repository.crud import MenuCrud
+from app.monitoring.timing import instrument_service
 from app.schemas.dish_schemas import DishRead
 from app.schemas.submenu_schemas import (
     SubmenuCreate,
@@ -14,6 +15,7 @@ from app.schemas.submenu_schemas import (
 from app.services.cache.cache_service import SubmenuCacheService
 
 
+@instrument_service
 class SubmenuService:
 
     def __init__(self,
@@ -45,8 +47,7 @@ class SubmenuService:
         submenus_schemas = []
         for submenu in menu_db.submenus:
             submenu_schema = SubmenuRead(**submenu.__dict__)
-            dishes_schemas = [await (DishRead(**dish.__dict__)
-                                     .check_sale(self.cache_manager))
+            dishes_schemas = [DishRead(**dish.__dict__).apply_discount()
                               for dish in submenu.dishes]
             submenu_schema.dishes = dishes_schemas
             submenu_schema.get_dishes_count()
@@ -73,12 +74,9 @@ class SubmenuService:
             parent_id=submenu_schema.menu_id,
             parent_class=Menu
         )
-        background_tasks.add_task(
-            self.cache_manager.update_submenu_cache,
-            target_menu_id,
-            SubmenuRead(**new_submenu.__dict__)
-        )
-        return SubmenuRead(**new_submenu.__dict__)
+        submenu = SubmenuRead(**new_submenu.__dict__)
+        await self.cache_manager.add_submenu(target_menu_id, submenu)
+        return submenu
 
     async def read(self,
                    target_submenu_id: UUID,
@@ -90,9 +88,11 @@ class SubmenuService:
         database manager, then saves with cache manager and returns
         submenu schema
         """
+        path = self.cache_manager.make_path(target_menu_id, target_submenu_id)
         cached = await self.cache_manager.get_model_cache(
             target_submenu_id,
-            SubmenuRead
+            SubmenuRead,
+            path
         )
         if cached is not None:
             return cached
@@ -101,16 +101,20 @@ class SubmenuService:
             object_id=target_submenu_id,
             object_class=SubMenu)
         )
+        if target_submenu.menu_id != target_menu_id:
+            raise HTTPException(status_code=404, detail='submenu not found')
         submenu_schema = SubmenuRead(**target_submenu.__dict__)
 
-        submenu_schema.dishes = [await (DishRead(**dish.__dict__)
-                                        .check_sale(self.cache_manager))
+        submenu_schema.dishes = [DishRead(**dish.__dict__).apply_discount()
                                  for dish in target_submenu.dishes]
+        # Cached with dishes count, so pre-rendered body matches route output
+        submenu_schema.get_dishes_count()
 
         background_tasks.add_task(
             self.cache_manager.set_model_cache,
-            target_menu_id,
-            submenu_schema
+            target_submenu_id,
+            submenu_schema,
+            path
         )
         return submenu_schema
 
@@ -122,19 +126,11 @@ class SubmenuService:
         Method takes submenu id and sends it to database manager and
         deletes cache with cache manager
         """
-        submenu = await self.database_manager.read_object(
+        deleted = await self.database_manager.delete_tree(
             object_id=target_submenu_id,
             object_class=SubMenu
         )
-        await self.database_manager.delete_object(
-            object_id=target_submenu_id,
-            object_class=SubMenu
-        )
-        background_tasks.add_task(
-            self.cache_manager.invalidate_submenu_cache,
-            SubmenuRead(**submenu.__dict__),
-            target_menu_id
-        )
+        await self.cache_manager.remove_submenu(target_menu_id, deleted)
         return SubmenuIdOnly(submenu_id=target_submenu_id)
 
     async def patch(self,
@@ -153,9 +149,5 @@ class SubmenuService:
         )
         update_schema = SubmenuRead(**update_result.__dict__)
 
-        background_tasks.add_task(
-            self.cache_manager.update_submenu_cache,
-            target_menu_id,
-            update_schema
-        )
+        await self.cache_manager.patch_submenu(target_menu_id, update_schema)
         return update_schema
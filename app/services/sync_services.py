@@ -0,0 +1,19 @@
+from fastapi import Depends
+
+from app.schemas.sync_schemas import SyncRunRead
+from app.services.cache.cache_service import SyncRunCacheService
+
+
+class SyncService:
+
+    def __init__(self,
+                 cache_manager: SyncRunCacheService = Depends()) -> None:
+        self.cache_manager = cache_manager
+
+    async def read_runs(self, limit: int) -> list[SyncRunRead]:
+        """
+        Method returns telemetry of the latest sheet synchronization runs,
+        newest first
+        """
+        runs = await self.cache_manager.get_sync_runs(limit)
+        return [SyncRunRead(**run) for run in runs]
@@ -17,6 +17,7 @@ from app.services.dish_services import DishService
 from app.services.menu_services import MenuService
 from app.services.submenu_services import SubmenuService
 from app.db.repository.utils import AdvancedMenuRepository
+from app.services.task_services.telemetry import count, sync_stage
 
 
 class MenuSyncHelper:
@@ -39,18 +40,30 @@ class MenuSyncHelper:
         self.DishService = DishService(self.database_manager,
                                        DishCacheService(self.redis))
 
+        # Bulk changes invalidate cached trees, patching them on every
+        # created dish would rewrite the same entries again and again
+        for service in (self.MenuService, self.SubmenuService):
+            service.cache_manager.write_through = False
+        self.DishService.cache.write_through = False
+
     async def delete_menus_which_must_not_exist(
             self, correct_menus: list[str]) -> None:
         """
         Deletes menus from the database that are not in the correct_menus list.
         """
         db_menus_ids = await self.database_manager.get_all_ids(Menu)
+        correct_menus_ids = set(correct_menus)
 
         for menu_id in db_menus_ids:
-            if menu_id not in correct_menus:
-                await self.MenuService.delete(menu_id,
-                                              self.background_tasks)
-        await self.background_tasks()
+            if menu_id not in correct_menus_ids:
+                await self.delete_menu(menu_id)
+        await self.run_background_tasks()
+
+    async def delete_menu(self, menu_id: str) -> None:
+        """Deletes menu replaced or removed in the sheet from the database"""
+        with sync_stage('delete'):
+            await self.MenuService.delete(menu_id, self.background_tasks)
+        count('menus_deleted')
 
     async def populate_menus_which_must_exist(
             self, menus_to_be_created: list[dict]) -> None:
@@ -64,10 +77,27 @@ class MenuSyncHelper:
             return None
 
         for menu in menus_to_be_created:
-            logging.warning(f'Trying to populate menu {menu}')
-            new_menu = await self.create_menu(menu)
-            await self.create_submenus(new_menu, menu['submenus'])
-        await self.background_tasks()
+            await self.populate_menu(menu)
+        await self.run_background_tasks()
+
+    async def populate_menu(self, menu_data: dict) -> MenuRead:
+        """Create menu with its submenus and dishes in database"""
+        logging.warning(f'Trying to populate menu {menu_data}')
+        new_menu = await self.create_menu(menu_data)
+        await self.create_submenus(new_menu, menu_data['submenus'])
+        return new_menu
+
+    async def run_background_tasks(self) -> None:
+        """
+        Runs collected background tasks and forgets them, so tasks are not
+        executed again on the next call and do not pile up during sync
+        """
+        tasks = list(self.background_tasks.tasks)
+        self.background_tasks.tasks.clear()
+        with sync_stage('background_tasks'):
+            for task in tasks:
+                await task()
+        count('background_tasks', len(tasks))
 
     async def create_menu(self, menu_data: dict) -> MenuRead:
         """Create specific menu in database"""
@@ -1,10 +1,11 @@
-import json
 from uuid import UUID
 
 import aioredis
 
 from app.db.models import Dish
 from app.db.repository.utils import AdvancedMenuRepository
+from app.services.cache.cache_service import PriceCacheService
+from app.services.task_services.telemetry import count
 
 
 class SalesManager:
@@ -14,44 +15,49 @@ class SalesManager:
                  database_manager: AdvancedMenuRepository) -> None:
         self.redis = redis
         self.database_manager = database_manager
+        self.cache = PriceCacheService(redis)
 
-    async def delete_old_sales(self) -> None:
-        """Method deletes old sales data"""
-        old_sales = await self.get_old_sales_data()
-        if old_sales is not None:
-            for sale in old_sales:
-                await self.redis.delete(sale)
-        await self.redis.delete('sales_data', 'menus')
-
-    async def fill_new_sales(self, sale_dishes: list[dict]) -> None:
-        """Method creates new sales data"""
-        new_sales_data = await self.create_new_sales(sale_dishes)
-        await self.redis.set('sales_data', str(new_sales_data))
-
-    async def get_old_sales_data(self) -> dict | None:
-        """Method gets old sales data"""
-        old_sales = await self.redis.get('sales_data')
-        if old_sales is not None:
-            return json.loads(old_sales.replace("'", '"'))
-        return None
-
-    async def create_new_sales(self, sale_dishes: list[dict]) -> dict:
+    async def update_sales(self, sale_dishes: list[dict]) -> None:
         """
-        Method create sales_data dict and fills it with dish id: sale value
-        then sets 'sales_data' key in cache
+        Method is the pricing stage of synchronization. It stores discounts
+        of sale dishes in database with one batch update, which returns only
+        dishes whose discount changed, then rewrites effective prices of these
+        dishes in cached entries containing them
         """
+        new_sales = await self.create_new_sales(sale_dishes)
+        changed_dishes = await self.database_manager.update_dish_discounts(
+            new_sales)
+        count('sale_prices_changed', len(changed_dishes))
+        if changed_dishes:
+            await self.cache.update_dish_prices(changed_dishes)
+
+    async def create_new_sales(self, sale_dishes: list[dict]
+                               ) -> dict[UUID, float]:
+        """
+        Method create sales dict and fills it with dish id: sale discount for
+        dishes found in database
+        """
+        dish_ids = await self.get_dish_ids(sale_dishes)
         new_sales_data = {}
         for dish in sale_dishes:
-            dish_id = await self.get_dish_id(dish['title'],
-                                             dish['description'])
-            new_sales_data[str(dish_id)] = dish['sale']
-        await self.redis.set('sales_data', str(new_sales_data))
+            dish_id = dish_ids.get((dish['title'], dish['description']))
+            if dish_id is not None:
+                new_sales_data[dish_id] = self.parse_discount(dish['sale'])
         return new_sales_data
 
-    async def get_dish_id(self, title: str, description: str) -> str | UUID:
-        """Method to get dish id by title and description with db manager"""
-        dish_id = await self.database_manager.read_by_title_description(
+    async def get_dish_ids(self, sale_dishes: list[dict]
+                           ) -> dict[tuple[str, str], UUID]:
+        """
+        Method to get ids of all sale dishes by title and description with
+        single db manager query
+        """
+        dish_ids = await self.database_manager.read_ids_by_titles_descriptions(
             obj_class=Dish,
-            title=title,
-            description=description)
-        return dish_id
+            pairs=[(dish['title'], dish['description'])
+                   for dish in sale_dishes])
+        return dish_ids
+
+    @staticmethod
+    def parse_discount(sale: str) -> float:
+        """Method converts sheet sale value like '10', '7,5' or '15%'"""
+        return float(str(sale).replace(',', '.').rstrip('%'))
@@ -1,3 +1,6 @@
+from collections.abc import AsyncIterable, AsyncIterator
+
+
 class SheetDeserializationService:
 
     @staticmethod
@@ -37,26 +40,24 @@ class SheetDeserializationService:
         }
 
     @classmethod
-    async def create_objects_from_sheet_rows(cls,
-                                             sheet_data: list[list]) -> dict:
+    async def iterate_menus_from_sheet_rows(
+            cls,
+            sheet_rows: AsyncIterable[list],
+            sales: list[dict]) -> AsyncIterator[dict]:
         """
-        Method iterates over each row in the sheet data and creates Menu,
-        Submenu, Dish, and Sale objects based on the content of each row.
-        It organizes the objects into a hierarchical structure representing the
-        menu data.The created objects are stored in lists and dictionaries for
-        easy access and manipulation.Finally, it returns a dictionary
-        containing the parsed menus and sales data.
+        Method consumes sheet rows as they arrive and yields each menu with
+        its submenus and dishes as soon as the next menu row starts or the
+        rows end, so only one menu subtree is kept in memory at a time.
+        Sale objects are appended to the passed sales list.
         """
-
-        menus = []
-        sales = []
-        current_menu: dict = {}
+        current_menu: dict | None = None
         current_submenu: dict = {}
 
-        for row in sheet_data:
+        async for row in sheet_rows:
             if row[0]:
+                if current_menu is not None:
+                    yield current_menu
                 current_menu = cls.create_menu(row)
-                menus.append(current_menu)
                 current_submenu = {}
             elif row[1]:
                 current_submenu = cls.create_submenu(row)
@@ -68,4 +69,27 @@ class SheetDeserializationService:
                 sale = cls.create_sale(row)
                 sales.append(sale)
 
+        if current_menu is not None:
+            yield current_menu
+
+    @classmethod
+    async def create_objects_from_sheet_rows(cls,
+                                             sheet_data: list[list]) -> dict:
+        """
+        Method iterates over each row in the sheet data and creates Menu,
+        Submenu, Dish, and Sale objects based on the content of each row.
+        It organizes the objects into a hierarchical structure representing the
+        menu data.The created objects are stored in lists and dictionaries for
+        easy access and manipulation.Finally, it returns a dictionary
+        containing the parsed menus and sales data.
+        """
+
+        async def iterate_rows() -> AsyncIterator[list]:
+            for row in sheet_data:
+                yield row
+
+        sales: list[dict] = []
+        menus = [menu async for menu in
+                 cls.iterate_menus_from_sheet_rows(iterate_rows(), sales)]
+
         return {'menus': menus, 'sales': sales}
@@ -1,21 +1,148 @@
+import asyncio
+import csv
+import os
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from itertools import islice
+from typing import Any, Optional
+
 import gspread
 from gspread.client import Client
-from typing import Optional
 
+# Columns used by the deserialization: menu, submenu, dish marks and titles,
+# descriptions, price and sale
+SHEET_ROW_WIDTH = 7
+
+
+class SheetSource(ABC):
+    """
+    Base class for sources of menu sheet rows. Sources deliver rows one by
+    one, so consumers can start working before the whole sheet is read, and
+    never block the event loop with file or network I/O.
+    """
+
+    def __init__(self, chunk_size: int = 500) -> None:
+        self.chunk_size = chunk_size
+
+    @abstractmethod
+    def iterate_rows(self) -> AsyncIterator[list[str]]:
+        """Method yields normalized sheet rows"""
 
-class SheetParsingInterface:
+    async def parse_sheet(self) -> list[list[str]]:
+        """Method reads all the sheet rows into list"""
+        return [row async for row in self.iterate_rows()]
 
-    def __init__(self):
+    @staticmethod
+    def normalize_row(row: Iterable[Any]) -> list[str]:
+        """Method converts cells to strings and pads row to sheet width"""
+        cells = ['' if cell is None else str(cell) for cell in row]
+        cells.extend([''] * (SHEET_ROW_WIDTH - len(cells)))
+        return cells
+
+    async def iterate_in_thread(self, rows: Iterator) -> AsyncIterator[list[str]]:
+        """
+        Method pulls rows from blocking iterator in a worker thread by chunks
+        and yields them normalized
+        """
+        while True:
+            chunk = await asyncio.to_thread(
+                lambda: list(islice(rows, self.chunk_size)))
+            if not chunk:
+                return
+            for row in chunk:
+                yield self.normalize_row(row)
+
+
+class GoogleSheetSource(SheetSource):
+    """
+    Source reading the first worksheet of Google Sheets document. Blocking
+    gspread calls are made in a thread pool and are limited by timeout.
+    """
+
+    def __init__(self,
+                 creds_file_path: str,
+                 url: str,
+                 timeout: float = 30,
+                 chunk_size: int = 500) -> None:
+        super().__init__(chunk_size)
+        self.creds_file_path = creds_file_path
+        self.url = url
+        self.timeout = timeout
         self.sheet_access: Optional[Client] = None
 
-    async def authenticate(self, creds_file_path: str) -> gspread.client.Client:
+    async def run_blocking(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Method runs blocking call in a thread and waits for it with timeout"""
+        return await asyncio.wait_for(
+            asyncio.to_thread(func, *args, **kwargs),
+            timeout=self.timeout
+        )
+
+    async def authenticate(self) -> Client:
         """Method to authenticate with credentials from file"""
-        self.sheet_access = gspread.service_account(filename=creds_file_path)
+        self.sheet_access = await self.run_blocking(
+            gspread.service_account, filename=self.creds_file_path)
+        self.sheet_access.http_client.set_timeout(self.timeout)
         return self.sheet_access
 
-    async def parse_sheet(self, url: str) -> list[list]:
-        """Method to parse the sheet"""
-        sheet = self.sheet_access.open_by_url(url)
-        worksheet = sheet.get_worksheet(0)
-        sheet_data = worksheet.get_all_values()
-        return sheet_data
+    async def iterate_rows(self) -> AsyncIterator[list[str]]:
+        """Method downloads the sheet by ranges of chunk size rows"""
+        if self.sheet_access is None:
+            await self.authenticate()
+
+        worksheet = await self.run_blocking(self.open_worksheet)
+        for start in range(1, worksheet.row_count + 1, self.chunk_size):
+            end = min(start + self.chunk_size - 1, worksheet.row_count)
+            chunk = await self.run_blocking(
+                worksheet.get_values, f'A{start}:G{end}')
+            for row in chunk:
+                yield self.normalize_row(row)
+
+    def open_worksheet(self) -> gspread.Worksheet:
+        sheet = self.sheet_access.open_by_url(self.url)
+        return sheet.get_worksheet(0)
+
+
+class LocalFileSheetSource(SheetSource):
+    """
+    Source reading menu sheet exported to local CSV or XLSX file, used for
+    offline runs and benchmarks of the synchronization
+    """
+
+    def __init__(self, path: str, chunk_size: int = 500) -> None:
+        super().__init__(chunk_size)
+        self.path = path
+
+    async def iterate_rows(self) -> AsyncIterator[list[str]]:
+        extension = os.path.splitext(self.path)[1].lower()
+        if extension == '.csv':
+            rows = self.iterate_rows_from(self.read_csv)
+        elif extension == '.xlsx':
+            rows = self.iterate_rows_from(self.read_xlsx)
+        else:
+            raise ValueError(f'Unsupported sheet file format {extension}')
+        async for row in rows:
+            yield row
+
+    async def iterate_rows_from(self,
+                                reader: Callable[[], Iterator]
+                                ) -> AsyncIterator[list[str]]:
+        rows = reader()
+        try:
+            async for row in self.iterate_in_thread(rows):
+                yield row
+        finally:
+            await asyncio.to_thread(rows.close)
+
+    def read_csv(self) -> Iterator[list[str]]:
+        with open(self.path, newline='', encoding='utf-8') as file:
+            yield from csv.reader(file)
+
+    def read_xlsx(self) -> Iterator[tuple]:
+        # openpyxl is only needed when menu is read from XLSX file
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            yield from workbook.worksheets[0].iter_rows(values_only=True)
+        finally:
+            workbook.close()
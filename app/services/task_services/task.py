@@ -1,37 +1,40 @@
+import asyncio
+import contextlib
 import logging
-from typing import Any
+from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator
 
-import aioredis
 from fastapi import BackgroundTasks
 
+import settings
 from app.db.models import Menu
 from app.services.menu_services import MenuService
 from app.db.repository.utils import AdvancedMenuRepository
 
-from .menu_utils import MenuModifier
+from .menu_utils import MenuModifier, MenuSyncHelper
 from .sheet_deserialization_service import SheetDeserializationService
-from .sheet_parsing_service import SheetParsingInterface
-from ..cache.cache_service import CacheService
+from .telemetry import count, sync_stage, timed_stream
+from .sheet_parsing_service import (
+    GoogleSheetSource,
+    LocalFileSheetSource,
+    SheetSource,
+)
 
 
-async def parse_data(creds_path: str, url: str) -> list[list]:
+def get_sheet_source(creds_path: str, url: str) -> SheetSource:
     """
-    Function takes path to credentials file and url for sheet, then authenticates
-    user with giver credentials and return parsed data
+    Function makes sheet source configured in settings, Google Sheets document
+    is read with given credentials and url, local file is read from path set
+    in settings
     """
-    parser = SheetParsingInterface()
-    await parser.authenticate(creds_path)
-    data = await parser.parse_sheet(url)
-    return data
-
-
-async def prepare_data(sheet_data: list[list]) -> dict[list[dict], list[dict]]:
-    """
-    Function takes sheet data and makes dict of menus and sales
-    """
-    interface = SheetDeserializationService()
-    objects = await interface.create_objects_from_sheet_rows(sheet_data)
-    return objects
+    if settings.TASK_SHEET_SOURCE == 'google':
+        return GoogleSheetSource(creds_path,
+                                 url,
+                                 timeout=settings.TASK_SHEET_TIMEOUT,
+                                 chunk_size=settings.TASK_SHEET_CHUNK_SIZE)
+    if settings.TASK_SHEET_SOURCE == 'file':
+        return LocalFileSheetSource(settings.TASK_SHEET_FILE_PATH,
+                                    chunk_size=settings.TASK_SHEET_CHUNK_SIZE)
+    raise ValueError(f'Unknown sheet source {settings.TASK_SHEET_SOURCE}')
 
 
 async def prepare_menu_for_comparison(menu: dict[str, str]) -> dict[str, str]:
@@ -44,49 +47,114 @@ async def prepare_menu_for_comparison(menu: dict[str, str]) -> dict[str, str]:
     return menu
 
 
-async def compare_sheet_and_db(sheet_objects: list,
-                               db_manager: AdvancedMenuRepository,
-                               cache_manager: type(CacheService),
-                               background_tasks: BackgroundTasks) -> dict[str, Any]:
+async def find_equal_menu_in_db(menu_sheet: dict,
+                                db_manager: AdvancedMenuRepository,
+                                menu_service: MenuService,
+                                background_tasks: BackgroundTasks
+                                ) -> tuple[str | None, bool]:
     """
-    This function iterates over list with menus from sheet and compares each
-    menu against existing  values in database, then fill 2 lists:
-    1. Existing menus list is filled with the ids of menus which are both in
-    database and in the sheet
-    2. Menus to create list is filled when object from sheet has no appropriate
-    value in database
+    Function looks for menu with the same title and description in database
+    and returns its id, if there is one, and whether the whole menu tree is
+    equal to menu from sheet
     """
-    menu_service = MenuService(db_manager, cache_manager)
-
-    existing_menus = []
-    menus_to_create = sheet_objects.copy()
-
-    for menu_sheet in sheet_objects:
-
-        db_menu_id = await db_manager.read_by_title_description(
-            Menu,
-            menu_sheet['title'],
-            menu_sheet['description']
-        )
-        if not db_menu_id:
-            continue
+    db_menu_id = await db_manager.read_by_title_description(
+        Menu,
+        menu_sheet['title'],
+        menu_sheet['description']
+    )
+    if not db_menu_id:
+        return None, False
+
+    try:
+        menu_schema = (await menu_service.read(
+            target_id=db_menu_id,
+            background_tasks=background_tasks,
+            _no_cache=True
+        )).model_dump()
+        menu_db = await prepare_menu_for_comparison(menu_schema.copy())
+
+        if menu_sheet == menu_db:
+            logging.warning('Found equal menus!')
+            return str(menu_schema['id']), True
+        logging.warning('Found not equal menus!')
+    except Exception as e:
+        logging.warning(f'Error reading menu with service ! {e}')
+    return str(db_menu_id), False
+
+
+async def prefetch_rows(rows: AsyncGenerator[list, None],
+                        size: int) -> AsyncIterator[list]:
+    """
+    Function reads rows from source in a separate task into bounded queue,
+    so the next rows are downloaded while database works on previous ones
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+    end_of_rows = object()
 
+    async def produce() -> None:
         try:
-            menu_schema = (await menu_service.read(
-                target_id=db_menu_id,
-                background_tasks=background_tasks,
-                _no_cache=True
-            )).model_dump()
-            menu_db = await prepare_menu_for_comparison(menu_schema.copy())
-
-            if menu_sheet == menu_db:
-                logging.warning('Found equal menus!')
-                existing_menus.append(str(menu_schema['id']))
-                menus_to_create.remove(menu_sheet)
-            else:
-                logging.warning('Found not equal menus!')
-        except Exception as e:
-            logging.warning(f'Error reading menu with service ! {e}')
-
-    return {'menus_to_create': menus_to_create,
-            'existing_menus': existing_menus}
+            async for row in rows:
+                await queue.put(row)
+            await queue.put(end_of_rows)
+        except Exception as error:
+            await queue.put(error)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is end_of_rows:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        producer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await producer
+        # Closes file or HTTP stream of the source when consumer stops early
+        await rows.aclose()
+
+
+async def synchronize_menus_with_sheet_rows(
+        sheet_rows: AsyncIterable[list],
+        db_manager: AdvancedMenuRepository,
+        sync_helper: MenuSyncHelper) -> list[dict]:
+    """
+    Function synchronizes database with sheet while its rows stream in.
+    Every finished menu subtree is compared with database at once, menus
+    without equal database copy are created right away and their changed
+    copy is deleted as soon as the replacement exists, so neither a running
+    sync nor a broken download leaves both copies. When the sheet ends,
+    database menus absent from it are deleted. Returns sales from the sheet.
+    """
+    sales: list[dict] = []
+    menus_to_keep = []
+
+    menus_sheet = timed_stream(
+        'prepare_data',
+        SheetDeserializationService.iterate_menus_from_sheet_rows(
+            sheet_rows, sales),
+        'menus')
+    async for menu_sheet in menus_sheet:
+        with sync_stage('compare_sheet_and_db'):
+            db_menu_id, is_equal = await find_equal_menu_in_db(
+                menu_sheet,
+                db_manager,
+                sync_helper.MenuService,
+                sync_helper.background_tasks)
+        if not is_equal:
+            with sync_stage('populate'):
+                new_menu = await sync_helper.populate_menu(menu_sheet)
+            # Menu created earlier in this run for a sheet menu with the same
+            # title is kept
+            if db_menu_id is not None and db_menu_id not in menus_to_keep:
+                await sync_helper.delete_menu(db_menu_id)
+            db_menu_id = str(new_menu.id)
+            count('menus_created')
+        menus_to_keep.append(db_menu_id)
+        await sync_helper.run_background_tasks()
+
+    await sync_helper.delete_menus_which_must_not_exist(menus_to_keep)
+    count('sales', len(sales))
+    return sales
@@ -0,0 +1,130 @@
+import time
+from collections import defaultdict
+from collections.abc import AsyncGenerator, AsyncIterator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any
+
+from aioredis import Redis
+
+import settings
+from app.monitoring.queries import QueryAccount
+
+# Telemetry of the sync run executing in current context, database and cache
+# hooks below report into it
+current_telemetry: ContextVar['SyncTelemetry | None'] = ContextVar(
+    'current_sync_telemetry', default=None)
+
+# Commands which take several keys, other commands are counted as touching
+# one key
+MULTI_KEY_COMMANDS = {'DEL', 'UNLINK', 'EXISTS', 'MGET', 'TOUCH'}
+
+
+class SyncTelemetry:
+    """
+    Collects timings of synchronization stages and volumes of one sync run:
+    sheet rows, menus, queries issued and cache keys touched, and its outcome.
+    Stage durations are accumulated, because streamed stages interleave.
+    """
+
+    def __init__(self) -> None:
+        self.started_at = datetime.now(timezone.utc)
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.outcome = 'running'
+        self.error: str | None = None
+        self.stages: dict[str, float] = defaultdict(float)
+        self.counters: dict[str, int] = defaultdict(int)
+        self.queries = QueryAccount('sheet synchronization',
+                                    repeat_limit=settings.QUERY_REPEAT_LIMIT)
+
+    @contextmanager
+    def activate(self) -> Iterator['SyncTelemetry']:
+        """Makes telemetry current for the code running inside the block"""
+        token = current_telemetry.set(self)
+        try:
+            with self.queries.activate():
+                yield self
+        finally:
+            current_telemetry.reset(token)
+
+    def finish(self, error: Exception | None = None) -> None:
+        self.duration = time.perf_counter() - self.started
+        self.counters['queries'] = self.queries.count
+        self.stages['queries'] = self.queries.duration
+        self.queries.finish()
+        if error is None:
+            self.outcome = 'success'
+        else:
+            self.outcome = 'failed'
+            self.error = repr(error)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'started_at': self.started_at.isoformat(),
+            'duration': round(self.duration, 6),
+            'outcome': self.outcome,
+            'error': self.error,
+            'stages': {name: round(value, 6)
+                       for name, value in self.stages.items()},
+            'counters': dict(self.counters),
+        }
+
+
+@contextmanager
+def sync_stage(name: str) -> Iterator[None]:
+    """Adds time spent inside the block to the stage of current sync run"""
+    telemetry = current_telemetry.get()
+    if telemetry is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        telemetry.stages[name] += time.perf_counter() - started
+
+
+def count(name: str, value: int = 1) -> None:
+    """Increments counter of current sync run"""
+    telemetry = current_telemetry.get()
+    if telemetry is not None:
+        telemetry.counters[name] += value
+
+
+async def timed_stream(name: str,
+                       items: AsyncGenerator[Any, None],
+                       counter: str) -> AsyncIterator[Any]:
+    """
+    Adds waiting for every item of the stream to stage and counts items,
+    closing the stream passes to the wrapped one
+    """
+    try:
+        while True:
+            with sync_stage(name):
+                try:
+                    item = await items.__anext__()
+                except StopAsyncIteration:
+                    return
+            count(counter)
+            yield item
+    finally:
+        await items.aclose()
+
+
+class TelemetryRedis(Redis):
+    """Redis client which reports commands and keys to current sync run"""
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        command = str(args[0]).upper()
+        count('cache_commands')
+        if command in MULTI_KEY_COMMANDS:
+            count('cache_keys', len(args) - 1)
+        elif command == 'MSET':
+            count('cache_keys', (len(args) - 1) // 2)
+        elif command in ('EVAL', 'EVALSHA'):
+            count('cache_keys', int(args[2]))
+        elif len(args) > 1:
+            count('cache_keys')
+        return await super().execute_command(*args, **options)
@@ -0,0 +1,45 @@
+import uuid
+
+from app.schemas.dish_schemas import DishRead
+from app.schemas.menu_schemas import MenuRead
+from app.schemas.submenu_schemas import SubmenuRead
+
+
+def build_menu_tree(menus: int,
+                    submenus: int,
+                    dishes: int,
+                    sale_ratio: float = 0.0) -> list[MenuRead]:
+    """
+    Function builds catalog of menus schemas shaped as menus x submenus x
+    dishes, as it is returned by GET /api/v1/menus
+    """
+    sale_every = round(1 / sale_ratio) if sale_ratio else 0
+    result = []
+    dish_number = 0
+    for menu_number in range(menus):
+        submenus_schemas = []
+        for submenu_number in range(submenus):
+            dishes_schemas = []
+            for _ in range(dishes):
+                dish_number += 1
+                discount = 10.0 if sale_every and not dish_number % sale_every else None
+                dishes_schemas.append(DishRead(
+                    id=uuid.uuid4(),
+                    title=f'Dish {dish_number}',
+                    description=f'Description of dish {dish_number}',
+                    price=100 + dish_number % 50,
+                    discount=discount
+                ).apply_discount())
+            submenus_schemas.append(SubmenuRead(
+                id=uuid.uuid4(),
+                title=f'Submenu {menu_number}.{submenu_number}',
+                description='Submenu description',
+                dishes=dishes_schemas
+            ).get_dishes_count())
+        result.append(MenuRead(
+            id=uuid.uuid4(),
+            title=f'Menu {menu_number}',
+            description='Menu description',
+            submenus=submenus_schemas
+        ).get_counts())
+    return result
@@ -0,0 +1,155 @@
+"""
+Seeds database with synthetic catalog shaped as menus x submenus x dishes,
+part of dishes put on sale. Writes manifest with ids of created objects for
+the load driver and optionally the same catalog as sheet file, so a local
+file synchronization (TASK_SHEET_SOURCE=file) has real work to compare.
+Cache is flushed after seeding, because rows are inserted past services.
+
+Usage: python -m benchmarks.generator --menus 20 --submenus 10 --dishes 30 \
+    --sale-ratio 0.1 --manifest catalog.json --sheet menu.csv --clear
+"""
+import argparse
+import asyncio
+import csv
+import json
+import random
+import uuid
+from dataclasses import dataclass, field
+
+from sqlalchemy import insert, text
+
+from app.db.models import Dish, Menu, SubMenu
+from app.db.session import engine, get_redis
+
+# Rows per INSERT statement, keeps statements below asyncpg parameters limit
+INSERT_CHUNK_SIZE = 1000
+
+
+@dataclass
+class Catalog:
+    menus: list[dict] = field(default_factory=list)
+    submenus: list[dict] = field(default_factory=list)
+    dishes: list[dict] = field(default_factory=list)
+
+
+def generate_catalog(menus: int, submenus: int, dishes: int,
+                     sale_ratio: float, seed: int) -> Catalog:
+    """Function builds rows of all catalog tables with random prices"""
+    generator = random.Random(seed)
+    catalog = Catalog()
+    for menu_number in range(menus):
+        menu_id = uuid.UUID(int=generator.getrandbits(128), version=4)
+        catalog.menus.append({
+            'id': menu_id,
+            'title': f'Menu {menu_number}',
+            'description': f'Description of menu {menu_number}',
+        })
+        for submenu_number in range(submenus):
+            submenu_id = uuid.UUID(int=generator.getrandbits(128), version=4)
+            catalog.submenus.append({
+                'id': submenu_id,
+                'menu_id': menu_id,
+                'title': f'Submenu {menu_number}.{submenu_number}',
+                'description': f'Description of submenu {submenu_number}',
+            })
+            for dish_number in range(dishes):
+                on_sale = generator.random() < sale_ratio
+                catalog.dishes.append({
+                    'id': uuid.UUID(int=generator.getrandbits(128),
+                                    version=4),
+                    'submenu_id': submenu_id,
+                    'title': f'Dish {menu_number}.{submenu_number}.'
+                             f'{dish_number}',
+                    'description': f'Description of dish {dish_number}',
+                    'price': round(generator.uniform(50, 1500), 2),
+                    'discount': generator.choice((5.0, 10.0, 25.0))
+                    if on_sale else None,
+                })
+    return catalog
+
+
+async def seed_database(catalog: Catalog, clear: bool) -> None:
+    async with engine.begin() as connection:
+        if clear:
+            await connection.execute(
+                text('TRUNCATE TABLE menus, submenus, dishes CASCADE'))
+        for model, rows in ((Menu, catalog.menus),
+                            (SubMenu, catalog.submenus),
+                            (Dish, catalog.dishes)):
+            for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+                await connection.execute(
+                    insert(model.__table__),
+                    rows[start:start + INSERT_CHUNK_SIZE])
+    await get_redis().flushdb()
+
+
+def make_manifest(catalog: Catalog) -> dict:
+    """Function makes ids of objects for every route the load driver calls"""
+    menu_of_submenu = {submenu['id']: submenu['menu_id']
+                       for submenu in catalog.submenus}
+    return {
+        'menus': [str(menu['id']) for menu in catalog.menus],
+        'submenus': [[str(submenu['menu_id']), str(submenu['id'])]
+                     for submenu in catalog.submenus],
+        'dishes': [[str(menu_of_submenu[dish['submenu_id']]),
+                    str(dish['submenu_id']), str(dish['id'])]
+                   for dish in catalog.dishes],
+    }
+
+
+def write_sheet(catalog: Catalog, path: str) -> None:
+    """Function writes catalog as menu sheet, in the layout sync parses"""
+    submenus_of_menu: dict[uuid.UUID, list[dict]] = {}
+    for submenu in catalog.submenus:
+        submenus_of_menu.setdefault(submenu['menu_id'], []).append(submenu)
+    dishes_of_submenu: dict[uuid.UUID, list[dict]] = {}
+    for dish in catalog.dishes:
+        dishes_of_submenu.setdefault(dish['submenu_id'], []).append(dish)
+
+    with open(path, 'w', newline='', encoding='utf-8') as sheet_file:
+        writer = csv.writer(sheet_file)
+        for menu_number, menu in enumerate(catalog.menus, 1):
+            writer.writerow([menu_number, menu['title'], menu['description'],
+                             '', '', '', ''])
+            for submenu_number, submenu in enumerate(
+                    submenus_of_menu.get(menu['id'], []), 1):
+                writer.writerow(['', submenu_number, submenu['title'],
+                                 submenu['description'], '', '', ''])
+                for dish_number, dish in enumerate(
+                        dishes_of_submenu.get(submenu['id'], []), 1):
+                    writer.writerow([
+                        '', '', dish_number, dish['title'],
+                        dish['description'], f"{dish['price']:.2f}",
+                        f"{dish['discount']:g}" if dish['discount'] else ''])
+
+
+async def main(args: argparse.Namespace) -> None:
+    catalog = generate_catalog(args.menus, args.submenus, args.dishes,
+                               args.sale_ratio, args.seed)
+    await seed_database(catalog, args.clear)
+    with open(args.manifest, 'w', encoding='utf-8') as manifest_file:
+        json.dump(make_manifest(catalog), manifest_file)
+    if args.sheet:
+        write_sheet(catalog, args.sheet)
+    print(json.dumps({'menus': len(catalog.menus),
+                      'submenus': len(catalog.submenus),
+                      'dishes': len(catalog.dishes),
+                      'dishes_on_sale': sum(dish['discount'] is not None
+                                            for dish in catalog.dishes),
+                      'manifest': args.manifest,
+                      'sheet': args.sheet}, indent=2))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--menus', type=int, default=20)
+    parser.add_argument('--submenus', type=int, default=10)
+    parser.add_argument('--dishes', type=int, default=30)
+    parser.add_argument('--sale-ratio', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--manifest', default='catalog.json')
+    parser.add_argument('--sheet', default=None,
+                        help='Also write catalog as CSV menu sheet')
+    parser.add_argument('--clear', action='store_true',
+                        help='Truncate catalog tables before seeding')
+    asyncio.run(main(parser.parse_args()))
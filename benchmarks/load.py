@@ -0,0 +1,214 @@
+"""
+Load driver which sends a weighted mix of menu, submenu and dish reads to
+running API with given concurrency and reports p50/p95/p99 latency and
+requests per second, overall and per route, as JSON. Catalog ids are taken
+from manifest written by benchmarks.generator.
+
+- cold: cache is flushed before the run
+- warm: every url of the catalog is requested once before the run
+- --sync: sheet synchronization runs in a loop in a background thread for
+  the whole run, configure its source with TASK_SHEET_SOURCE/_FILE_PATH
+
+Usage: python -m benchmarks.load --manifest catalog.json --mix app \
+    --mode warm --concurrency 32 --duration 30 --output results.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import threading
+import time
+from collections import Counter, defaultdict
+
+import aioredis
+from httpx import AsyncClient, Limits
+
+PREFIX = '/api/v1'
+
+# Share of each route in request mixes
+MIXES = {
+    # client opening menus screen, then going down to dishes
+    'app': {'menus': 20, 'menu': 10, 'counts': 5, 'submenus': 15,
+            'submenu': 10, 'dishes': 25, 'dish': 15},
+    # clients polling whole catalog
+    'catalog': {'menus': 80, 'menu': 10, 'counts': 10},
+    # deep links to single objects
+    'detail': {'menu': 20, 'submenu': 30, 'dish': 50},
+}
+
+
+def make_urls(manifest: dict) -> dict[str, list[str]]:
+    """Function makes urls of every route for objects of the catalog"""
+    menu_urls = [f'{PREFIX}/menus/{menu_id}' for menu_id in manifest['menus']]
+    submenu_urls = [f'{PREFIX}/menus/{menu_id}/submenus/{submenu_id}'
+                    for menu_id, submenu_id in manifest['submenus']]
+    return {
+        'menus': [f'{PREFIX}/menus'],
+        'menu': menu_urls,
+        'counts': [f'{url}/counts' for url in menu_urls],
+        'submenus': [f'{url}/submenus' for url in menu_urls],
+        'submenu': submenu_urls,
+        'dishes': [f'{url}/dishes' for url in submenu_urls],
+        'dish': [f'{PREFIX}/menus/{menu_id}/submenus/{submenu_id}'
+                 f'/dishes/{dish_id}'
+                 for menu_id, submenu_id, dish_id in manifest['dishes']],
+    }
+
+
+def percentile(latencies: list[float], share: float) -> float:
+    """Function returns nearest-rank percentile of sorted latencies in ms"""
+    if not latencies:
+        return 0.0
+    index = max(0, int(round(share * len(latencies))) - 1)
+    return round(latencies[index] * 1000, 3)
+
+
+def summarize(latencies: list[float], elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'requests_per_second': round(len(latencies) / elapsed, 2),
+        'p50_ms': percentile(latencies, 0.50),
+        'p95_ms': percentile(latencies, 0.95),
+        'p99_ms': percentile(latencies, 0.99),
+        'max_ms': round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+class SyncLoop:
+    """Runs sheet synchronization again and again in a thread"""
+
+    def __init__(self) -> None:
+        self.stopped = threading.Event()
+        self.runs = 0
+        self.errors = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self) -> None:
+        # Imported here, celery app is only needed with --sync
+        from celery_conf.celery_app import synchronize_sheet_with_db
+
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        while not self.stopped.is_set():
+            try:
+                synchronize_sheet_with_db()
+                self.runs += 1
+            except Exception:
+                self.errors += 1
+
+    def __enter__(self) -> 'SyncLoop':
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stopped.set()
+        self.thread.join()
+
+
+async def prepare_cache(client: AsyncClient, urls: dict[str, list[str]],
+                        args: argparse.Namespace) -> None:
+    # Own client, application pools are used by sync thread event loop
+    async with aioredis.from_url(args.redis_url) as redis:
+        await redis.flushdb()
+    if args.mode == 'warm':
+        for route_urls in urls.values():
+            for url in route_urls:
+                await client.get(url)
+        # let background tasks of the last responses fill cache
+        await asyncio.sleep(0.5)
+
+
+async def run_load(client: AsyncClient, urls: dict[str, list[str]],
+                   mix: dict[str, int], args: argparse.Namespace) -> dict:
+    routes = [route for route in mix if urls[route]]
+    weights = [mix[route] for route in routes]
+    generator = random.Random(args.seed)
+    latencies: dict[str, list[float]] = defaultdict(list)
+    statuses: Counter = Counter()
+    deadline = time.perf_counter() + args.duration
+    remaining = args.requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while time.perf_counter() < deadline and remaining != 0:
+            remaining -= 1
+            route = generator.choices(routes, weights)[0]
+            url = generator.choice(urls[route])
+            started = time.perf_counter()
+            response = await client.get(url)
+            latencies[route].append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'total': summarize([latency for route_latencies in latencies.values()
+                            for latency in route_latencies], elapsed),
+        'routes': {route: summarize(route_latencies, elapsed)
+                   for route, route_latencies in sorted(latencies.items())},
+        'statuses': {str(status): number
+                     for status, number in sorted(statuses.items())},
+    }
+
+
+def current_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> None:
+    with open(args.manifest, encoding='utf-8') as manifest_file:
+        urls = make_urls(json.load(manifest_file))
+    limits = Limits(max_connections=args.concurrency,
+                    max_keepalive_connections=args.concurrency)
+    async with AsyncClient(base_url=args.base_url, limits=limits,
+                           timeout=args.timeout) as client:
+        await prepare_cache(client, urls, args)
+        if args.sync:
+            with SyncLoop() as sync_loop:
+                result = await run_load(client, urls, MIXES[args.mix], args)
+            result['sync_runs'] = {'runs': sync_loop.runs,
+                                   'errors': sync_loop.errors}
+        else:
+            result = await run_load(client, urls, MIXES[args.mix], args)
+
+    result = {
+        'commit': current_commit(),
+        'mix': args.mix,
+        'mode': args.mode,
+        'sync': args.sync,
+        'concurrency': args.concurrency,
+        **result,
+    }
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            output_file.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--redis-url', default='redis://redis:6379')
+    parser.add_argument('--manifest', default='catalog.json')
+    parser.add_argument('--mix', choices=sorted(MIXES), default='app')
+    parser.add_argument('--mode', choices=('cold', 'warm'), default='warm')
+    parser.add_argument('--sync', action='store_true',
+                        help='Run sheet synchronization during the load')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30,
+                        help='Seconds to run')
+    parser.add_argument('--requests', type=int, default=-1,
+                        help='Stop after this many requests, -1 no limit')
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,75 @@
+"""
+Throughput of GET /api/v1/menus encoding on a large catalog, before and after
+PydanticJSONResponse. Both variants serve the same prebuilt catalog, so only
+response validation and encoding are measured:
+
+- before: route returns schemas, FastAPI validates them against
+  response_model, encodes with jsonable_encoder and JSONResponse
+- after: route returns PydanticJSONResponse, schemas are dumped once by
+  pydantic-core
+
+Usage: python -m benchmarks.menus_response --menus 10 --submenus 10 --dishes 20
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from app.routing.responses import PydanticJSONResponse
+from app.schemas.menu_schemas import MenuRead
+from benchmarks.catalog import build_menu_tree
+
+
+def make_apps(catalog: list[MenuRead]) -> dict[str, FastAPI]:
+    before = FastAPI()
+    after = FastAPI(default_response_class=PydanticJSONResponse)
+
+    @before.get('/api/v1/menus', response_model=list[MenuRead])
+    async def read_all_menus_before() -> list[MenuRead]:
+        return catalog
+
+    @after.get('/api/v1/menus', response_model=list[MenuRead])
+    async def read_all_menus_after() -> PydanticJSONResponse:
+        return PydanticJSONResponse(catalog)
+
+    return {'before': before, 'after': after}
+
+
+async def measure(app: FastAPI, requests: int) -> dict:
+    async with AsyncClient(app=app, base_url='http://benchmark') as client:
+        body = (await client.get('/api/v1/menus')).content
+        started = time.perf_counter()
+        for _ in range(requests):
+            await client.get('/api/v1/menus')
+        elapsed = time.perf_counter() - started
+    return {
+        'requests_per_second': round(requests / elapsed, 2),
+        'mean_latency_ms': round(elapsed / requests * 1000, 3),
+        'body_bytes': len(body),
+        'body': json.loads(body),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    catalog = build_menu_tree(args.menus, args.submenus, args.dishes,
+                              args.sale_ratio)
+    results = {name: await measure(app, args.requests)
+               for name, app in make_apps(catalog).items()}
+    assert results['before'].pop('body') == results['after'].pop('body'), \
+        'Responses differ'
+    results['speedup'] = round(results['after']['requests_per_second']
+                               / results['before']['requests_per_second'], 2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--menus', type=int, default=10)
+    parser.add_argument('--submenus', type=int, default=10)
+    parser.add_argument('--dishes', type=int, default=20)
+    parser.add_argument('--sale-ratio', type=float, default=0.1)
+    parser.add_argument('--requests', type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
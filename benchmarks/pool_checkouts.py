@@ -0,0 +1,155 @@
+"""
+Database pool checkouts and sessions created per request for a mix of menu,
+submenu and dish reads at given cache hit ratio. Misses are made by
+invalidating cache entry of the route before request. Variants:
+
+- eager: every request creates AsyncSession as get_db did before
+- lazy: get_db with LazySession, session is created on first query only
+
+Routes are called with and without response cache middleware, because the
+middleware answers hits before dependencies are resolved at all.
+Needs running database and Redis, seeds its own catalog through the API.
+
+Usage: python -m benchmarks.pool_checkouts --requests 2000 --hit-ratio 0.95
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections.abc import AsyncGenerator, Callable
+
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.types import ASGIApp
+
+from app.db.session import (
+    LazySession,
+    async_session,
+    engine,
+    get_db,
+    get_redis
+)
+from app.middleware.response_cache import ResponseCacheMiddleware
+from app.services.cache.cache_service import CacheService
+from main import app
+
+PREFIX = '/api/v1'
+
+
+class Counters:
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.sessions = 0
+
+    def on_checkout(self, *args) -> None:
+        self.checkouts += 1
+
+    def session_factory(self) -> AsyncSession:
+        self.sessions += 1
+        return async_session()
+
+
+def make_get_db(variant: str, counters: Counters) -> Callable:
+    async def get_eager_db() -> AsyncGenerator:
+        session = counters.session_factory()
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    async def get_lazy_db() -> AsyncGenerator:
+        session = LazySession(counters.session_factory)
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    return get_eager_db if variant == 'eager' else get_lazy_db
+
+
+async def seed_catalog(client: AsyncClient, menus: int, submenus: int,
+                       dishes: int) -> list[str]:
+    """Function creates catalog through the API and returns urls to read"""
+    urls = [f'{PREFIX}/menus']
+    for menu_number in range(menus):
+        menu = (await client.post(f'{PREFIX}/menus', json={
+            'title': f'Benchmark menu {menu_number}',
+            'description': 'description'})).json()
+        menu_url = f"{PREFIX}/menus/{menu['id']}"
+        urls += [menu_url, f'{menu_url}/counts', f'{menu_url}/submenus']
+        for submenu_number in range(submenus):
+            submenu = (await client.post(f'{menu_url}/submenus', json={
+                'title': f'Benchmark submenu {menu_number}.{submenu_number}',
+                'description': 'description'})).json()
+            submenu_url = f"{menu_url}/submenus/{submenu['id']}"
+            urls += [submenu_url, f'{submenu_url}/dishes']
+            for dish_number in range(dishes):
+                dish = (await client.post(f'{submenu_url}/dishes', json={
+                    'title': f'Benchmark dish {submenu_number}.{dish_number}',
+                    'description': 'description',
+                    'price': 100})).json()
+                urls.append(f"{submenu_url}/dishes/{dish['id']}")
+    return urls
+
+
+async def delete_catalog(client: AsyncClient, urls: list[str]) -> None:
+    for url in urls:
+        if url.count('/') == 4:
+            await client.delete(url)
+
+
+async def measure(asgi_app: ASGIApp, urls: list[str], requests: int,
+                  hit_ratio: float, counters: Counters) -> dict:
+    cache = CacheService(get_redis())
+    miss_every = round(1 / (1 - hit_ratio)) if hit_ratio < 1 else 0
+    async with AsyncClient(app=asgi_app, base_url='http://benchmark') as client:
+        for url in urls:
+            await client.get(url)
+        counters.checkouts = counters.sessions = 0
+        started = time.perf_counter()
+        for number in range(requests):
+            url = urls[number % len(urls)]
+            if miss_every and not number % miss_every:
+                await cache.delete(ResponseCacheMiddleware.make_cache_key(
+                    url.removeprefix(PREFIX)))
+            response = await client.get(url)
+            assert response.status_code == 200, response.text
+        elapsed = time.perf_counter() - started
+    return {
+        'pool_checkouts_per_request': round(counters.checkouts / requests, 4),
+        'sessions_per_request': round(counters.sessions / requests, 4),
+        'requests_per_second': round(requests / elapsed, 2),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    counters = Counters()
+    event.listen(engine.sync_engine.pool, 'checkout', counters.on_checkout)
+    async with AsyncClient(app=app, base_url='http://benchmark') as client:
+        urls = await seed_catalog(client, args.menus, args.submenus,
+                                  args.dishes)
+    results = {'hit_ratio': args.hit_ratio, 'requests': args.requests}
+    try:
+        for variant in ('eager', 'lazy'):
+            app.dependency_overrides[get_db] = make_get_db(variant, counters)
+            for name, asgi_app in (('with_response_cache', app),
+                                   ('without_response_cache', app.router)):
+                results[f'{variant}_{name}'] = await measure(
+                    asgi_app, urls, args.requests, args.hit_ratio, counters)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        async with AsyncClient(app=app, base_url='http://benchmark') as client:
+            await delete_catalog(client, urls)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--menus', type=int, default=3)
+    parser.add_argument('--submenus', type=int, default=3)
+    parser.add_argument('--dishes', type=int, default=5)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--hit-ratio', type=float, default=0.95)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,130 @@
+"""
+Microbenchmarks of per-request CPU work on menu trees of growing size, each
+step timed separately: building MenuRead -> SubmenuRead -> DishRead trees
+from ORM objects, counts, price formatting, JSON encoding of responses,
+cache serialization and parsing, and compression of cached bodies.
+
+Usage: pytest benchmarks/test_schemas.py --benchmark-group-by=group,param:shape
+Compare with saved run: --benchmark-autosave, then --benchmark-compare
+"""
+import json
+import uuid
+
+import pytest
+
+from app.db.models import Dish, Menu, SubMenu
+from app.services.cache.encoding import compress_body, render_json
+from app.schemas.dish_schemas import DishRead
+from app.schemas.menu_schemas import MenuRead
+from app.services.batch_services import BatchService
+
+# menus x submenus x dishes
+SHAPES = {
+    'small': (1, 5, 10),
+    'medium': (5, 10, 20),
+    'large': (20, 10, 30),
+}
+
+
+def build_orm_catalog(menus: int, submenus: int, dishes: int) -> list[Menu]:
+    """Function builds transient ORM objects as they are loaded by queries"""
+    catalog = []
+    dish_number = 0
+    for menu_number in range(menus):
+        menu = Menu(id=uuid.uuid4(), title=f'Menu {menu_number}',
+                    description='Menu description')
+        for submenu_number in range(submenus):
+            submenu = SubMenu(id=uuid.uuid4(), menu_id=menu.id,
+                              title=f'Submenu {submenu_number}',
+                              description='Submenu description')
+            for _ in range(dishes):
+                dish_number += 1
+                submenu.dishes.append(Dish(
+                    id=uuid.uuid4(), submenu_id=submenu.id,
+                    title=f'Dish {dish_number}',
+                    description='Dish description',
+                    price=100 + dish_number % 50,
+                    discount=10.0 if dish_number % 10 == 0 else None))
+            menu.submenus.append(submenu)
+        catalog.append(menu)
+    return catalog
+
+
+def build_schemas(catalog: list[Menu]) -> list[MenuRead]:
+    return [BatchService.make_schema('menu', menu) for menu in catalog]
+
+
+@pytest.fixture(params=list(SHAPES), ids=list(SHAPES))
+def shape(request) -> str:
+    return request.param
+
+
+@pytest.fixture
+def orm_catalog(shape: str) -> list[Menu]:
+    return build_orm_catalog(*SHAPES[shape])
+
+
+@pytest.fixture
+def menus(orm_catalog: list[Menu]) -> list[MenuRead]:
+    return build_schemas(orm_catalog)
+
+
+@pytest.fixture
+def dishes(menus: list[MenuRead]) -> list[DishRead]:
+    return [dish for menu in menus for submenu in menu.submenus
+            for dish in submenu.dishes]
+
+
+@pytest.fixture
+def cached_list(menus: list[MenuRead]) -> str:
+    return json.dumps([menu.model_dump_json() for menu in menus])
+
+
+def test_build_tree(benchmark, orm_catalog):
+    benchmark.group = 'build tree from ORM'
+    benchmark(build_schemas, orm_catalog)
+
+
+def test_counts(benchmark, menus):
+    benchmark.group = 'get_counts / get_dishes_count'
+
+    def count_all():
+        for menu in menus:
+            for submenu in menu.submenus:
+                submenu.get_dishes_count()
+            menu.get_counts()
+
+    benchmark(count_all)
+
+
+def test_round_price(benchmark, dishes):
+    benchmark.group = 'round_price'
+    benchmark(lambda: [dish.round_price() for dish in dishes])
+
+
+def test_effective_price(benchmark, dishes):
+    benchmark.group = 'make_effective_price'
+    prices = [(float(dish.price), 10.0) for dish in dishes]
+    benchmark(lambda: [DishRead.make_effective_price(price, discount)
+                       for price, discount in prices])
+
+
+def test_render_response(benchmark, menus):
+    benchmark.group = 'render_json response body'
+    benchmark(render_json, menus)
+
+
+def test_serialize_cache(benchmark, menus):
+    benchmark.group = 'cache serialization'
+    benchmark(lambda: json.dumps([menu.model_dump_json() for menu in menus]))
+
+
+def test_parse_cache(benchmark, cached_list):
+    benchmark.group = 'cache parsing'
+    benchmark(lambda: [MenuRead(**json.loads(menu))
+                       for menu in json.loads(cached_list)])
+
+
+def test_compress_body(benchmark, menus):
+    benchmark.group = 'compress cached body'
+    benchmark(compress_body, render_json(menus))
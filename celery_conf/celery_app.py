@@ -1,7 +1,21 @@
+from asyncio import get_event_loop
+
+from aioredis import Redis
 from celery import Celery
 
+from app.db.repository.utils import AdvancedMenuRepository
+from app.db.session import async_session, redis_pool
+from app.services.cache.cache_service import SyncRunCacheService
+from app.services.task_services.telemetry import SyncTelemetry
 from celery_conf.helpers.refresh_db import RefreshDatabaseTaskHelper
-from settings import TASK_CREDENTIALS_FILE_PATH, TASK_SHEET_URL
+from celery_conf.helpers.task_lock import TaskRunLock
+from settings import (
+    MENU_PURGE_BATCH_SIZE,
+    MENU_PURGE_INTERVAL,
+    SYNC_LOCK_TIMEOUT,
+    TASK_CREDENTIALS_FILE_PATH,
+    TASK_SHEET_URL,
+)
 
 app = Celery('tasks')
 
@@ -12,27 +26,85 @@ app.conf.beat_schedule = {
         {
             'task': 'celery_conf.celery_app.refresh_db_data',
             'schedule': 15.0,
+        },
+    # Removes rows of menus deleted in tombstone mode
+    'purge-deleted-menus':
+        {
+            'task': 'celery_conf.celery_app.purge_deleted_menus',
+            'schedule': MENU_PURGE_INTERVAL,
         }
 }
 
 
+def synchronize_sheet_with_db() -> None:
+    """
+    Refreshes the database data by comparing sheet menus with existing
+    database menus as the sheet streams in, creating new menus that should
+    exist and deleting menus that should not exist. It also deletes old sales
+    data and creates new sales data. Stage timings and volumes of the run
+    are stored in cache.
+    """
+    telemetry = SyncTelemetry()
+    error = None
+    with telemetry.activate():
+        try:
+            task_helper = RefreshDatabaseTaskHelper(
+                TASK_CREDENTIALS_FILE_PATH,
+                TASK_SHEET_URL)
+
+            sales = task_helper.synchronize_db_with_sheet_stream()
+
+            task_helper.manage_sales(sales)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            telemetry.finish(error)
+            get_event_loop().run_until_complete(
+                SyncRunCacheService(Redis(connection_pool=redis_pool))
+                .add_sync_run(telemetry.to_dict()))
+
+
 @app.task
 def refresh_db_data():
     """
-    Refreshes the database data by comparing sheet objects with existing
-    database menus, deleting menus that should not exist, and creating new
-    menus that should exist. It also deletes old sales data and creates new
-    sales data.
+    Runs sheet synchronization under a Redis lease lock, so runs fired by
+    beat never overlap. When the lock is held the run only requests a
+    follow-up, and the lock holder executes at most one follow-up after it
+    finishes its own run.
     """
-    task_helper = RefreshDatabaseTaskHelper(TASK_CREDENTIALS_FILE_PATH,
-                                            TASK_SHEET_URL)
+    event_loop = get_event_loop().run_until_complete
+    lock = TaskRunLock(Redis(connection_pool=redis_pool),
+                       'refresh_db_data',
+                       SYNC_LOCK_TIMEOUT)
 
-    parsed_menus_and_sales = task_helper.parse_sheet_make_objects()
+    if not event_loop(lock.acquire()):
+        event_loop(lock.request_follow_up())
+        return
 
-    compared_menus = task_helper.compare_sheet_and_db(
-        parsed_menus_and_sales['menus']  # type: ignore
-    )
+    try:
+        # This run already covers follow-ups requested before it started
+        event_loop(lock.pop_follow_up())
+        synchronize_sheet_with_db()
+        while event_loop(lock.pop_follow_up()):
+            event_loop(lock.extend())
+            synchronize_sheet_with_db()
+    finally:
+        event_loop(lock.release())
 
-    task_helper.synchronize_db_with_sheet(compared_menus)
 
-    task_helper.manage_sales(parsed_menus_and_sales['sales'])  # type: ignore
+@app.task
+def purge_deleted_menus():
+    """
+    Removes dishes, submenus and rows of menus marked deleted in batches of
+    configured size until nothing is left, every batch is committed
+    separately, so locks are held only for one batch
+    """
+    event_loop = get_event_loop().run_until_complete
+    repository = AdvancedMenuRepository(async_session())
+    try:
+        while event_loop(
+                repository.purge_deleted_menus(MENU_PURGE_BATCH_SIZE)):
+            pass
+    finally:
+        event_loop(repository.db_session.close())
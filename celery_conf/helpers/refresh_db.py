@@ -1,24 +1,29 @@
 from asyncio import get_event_loop
 
-from aioredis import Redis
 from fastapi import BackgroundTasks
 
 from app.db.repository.utils import AdvancedMenuRepository
 from app.db.session import async_session, redis_pool
 from app.services.task_services.menu_utils import MenuSyncHelper
 from app.services.task_services.sales_manager import SalesManager
+from app.services.task_services.telemetry import (
+    TelemetryRedis,
+    sync_stage,
+    timed_stream,
+)
 from app.services.task_services.task import (
-    compare_sheet_and_db,
-    parse_data,
-    prepare_data,
+    get_sheet_source,
+    prefetch_rows,
+    synchronize_menus_with_sheet_rows,
 )
+from settings import TASK_SHEET_CHUNK_SIZE
 
 
 class RefreshDatabaseTaskHelper:
 
     def __init__(self, credentials_path: str, sheet_url: str) -> None:
         self.background_tasks = BackgroundTasks()
-        self.redis = Redis(connection_pool=redis_pool)
+        self.redis = TelemetryRedis(connection_pool=redis_pool)
         self.db_manager = AdvancedMenuRepository(async_session())
         self.event_loop = get_event_loop().run_until_complete
         self.credentials_path: str = credentials_path
@@ -32,60 +37,32 @@ class RefreshDatabaseTaskHelper:
 
     def make_background_tasks(self) -> None:
         """Method to make event loop call background tasks"""
-        self.event_loop(self.background_tasks())
-
-    def parse_sheet_make_objects(self) -> dict[list[dict], list[dict]]:
-
-        parsed_sheet_data = self.event_loop(
-            parse_data(self.credentials_path, self.sheet_url)
-        )
+        self.event_loop(self.sync_helper.run_background_tasks())
 
-        menus_and_sales = self.event_loop(
-            prepare_data(parsed_sheet_data)
-        )
-
-        return menus_and_sales
-
-    def compare_sheet_and_db(
-            self,
-            parsed_menus: list[dict]
-    ) -> dict[list[dict], list[dict]]:
+    def synchronize_db_with_sheet_stream(self) -> list[dict]:
         """
-        Compares the parsed menus with the data in the database and returns
-        a dictionary containing lists of existing menus and menus to create.
+        Streams sheet rows from configured source and synchronizes database
+        menu by menu while the sheet is downloading, then calls background
+        tasks and returns sales from the sheet.
         """
-        compared_menus = self.event_loop(compare_sheet_and_db(
-            parsed_menus,
+        source = get_sheet_source(self.credentials_path, self.sheet_url)
+        sales = self.event_loop(synchronize_menus_with_sheet_rows(
+            prefetch_rows(
+                timed_stream('sheet_download', source.iterate_rows(), 'rows'),
+                TASK_SHEET_CHUNK_SIZE),
             self.db_manager,
-            self.redis,
-            self.background_tasks)
+            self.sync_helper)
         )
-        return compared_menus
-
-    def synchronize_db_with_sheet(self, compared_menus: dict) -> None:
-        """
-        Deletes menus that should not exist in the database and populates
-        menus that should exist based on the comparison result. It also
-        calls background tasks.
-        """
-        self.event_loop(
-            self.sync_helper.delete_menus_which_must_not_exist(
-                compared_menus['existing_menus'])
-        )
-
-        self.event_loop(
-            self.sync_helper.populate_menus_which_must_exist(
-                compared_menus['menus_to_create'])
-        )
-
         self.make_background_tasks()
+        return sales
 
     def manage_sales(self, sales: list[dict]) -> None:
         """
-        Manages sales data by deleting old sales records, creating new sales
-        records, and initiating background tasks.
+        Manages sales data by initiating background tasks, then storing new
+        sale discounts and updating effective prices of changed dishes in
+        cache.
         """
         self.make_background_tasks()
 
-        self.event_loop(self.sales_manager.delete_old_sales())
-        self.event_loop(self.sales_manager.create_new_sales(sales))
+        with sync_stage('sales'):
+            self.event_loop(self.sales_manager.update_sales(sales))
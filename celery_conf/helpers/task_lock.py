@@ -0,0 +1,78 @@
+import uuid
+
+from aioredis import Redis
+
+# Scripts compare lock token before touching the key, so a run which lost its
+# lease can not release or extend the lock of the run that took it over
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+EXTEND_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class TaskRunLock:
+    """
+    Redis lease lock which keeps only one run of a task in flight.
+
+    Runs which are started while the lock is held do not wait for it, they
+    request a follow-up run instead. Any number of requests made during one
+    run are coalesced into a single follow-up which is executed by the lock
+    holder. Requests which were merged into an already queued follow-up are
+    counted as skipped.
+    """
+
+    def __init__(self, redis: Redis, name: str, timeout: float) -> None:
+        self.redis = redis
+        self.lock_key = f'{name}_lock'
+        self.follow_up_key = f'{name}_follow_up'
+        self.queued_key = f'{name}_queued'
+        self.skipped_key = f'{name}_skipped'
+        self.timeout_ms = int(timeout * 1000)
+        self.token = str(uuid.uuid4())
+
+    async def acquire(self) -> bool:
+        """Method takes the lease if no other run holds it"""
+        acquired = await self.redis.set(self.lock_key, self.token,
+                                        nx=True, px=self.timeout_ms)
+        return bool(acquired)
+
+    async def extend(self) -> bool:
+        """Method renews the lease of the current holder"""
+        extended = await self.redis.eval(EXTEND_SCRIPT, 1, self.lock_key,
+                                         self.token, self.timeout_ms)
+        return bool(extended)
+
+    async def release(self) -> bool:
+        """Method releases the lease if it is still held by this run"""
+        released = await self.redis.eval(RELEASE_SCRIPT, 1, self.lock_key,
+                                         self.token)
+        return bool(released)
+
+    async def request_follow_up(self) -> bool:
+        """
+        Method queues a follow-up run for the lock holder and returns True,
+        returns False when a follow-up is already queued
+        """
+        queued = await self.redis.set(self.follow_up_key, 1,
+                                      nx=True, px=self.timeout_ms)
+        await self.redis.incr(self.queued_key if queued else self.skipped_key)
+        return bool(queued)
+
+    async def pop_follow_up(self) -> bool:
+        """Method takes queued follow-up run if there is one"""
+        return bool(await self.redis.delete(self.follow_up_key))
+
+    async def get_stats(self) -> dict[str, int]:
+        """Method returns counters of queued and skipped runs"""
+        queued, skipped = await self.redis.mget(self.queued_key,
+                                                self.skipped_key)
+        return {'queued': int(queued or 0), 'skipped': int(skipped or 0)}
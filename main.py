@@ -1,11 +1,31 @@
 from fastapi import FastAPI
 
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.query_budget import QueryBudgetMiddleware
+from app.middleware.response_cache import ResponseCacheMiddleware
+from app.middleware.server_timing import ServerTimingMiddleware
+from app.routing.batch_routes import batch_router
 from app.routing.dish_routes import dish_router
 from app.routing.menu_routes import menu_router
+from app.routing.metrics_routes import metrics_router
+from app.routing.profiling_routes import profiling_router
+from app.routing.responses import PydanticJSONResponse
 from app.routing.submenu_routes import submenu_router
+from app.routing.sync_routes import sync_router
 
-app = FastAPI(title='Menu')
+app = FastAPI(title='Menu', default_response_class=PydanticJSONResponse)
+app.add_middleware(QueryBudgetMiddleware)
+app.add_middleware(ResponseCacheMiddleware, prefix='/api/v1')
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(MetricsMiddleware)
+# Outermost, so profiles include answers from response cache
+app.add_middleware(ProfilingMiddleware, prefix='/api/v1')
 
 app.include_router(menu_router, prefix='/api/v1')
 app.include_router(submenu_router, prefix='/api/v1')
 app.include_router(dish_router, prefix='/api/v1')
+app.include_router(sync_router, prefix='/api/v1')
+app.include_router(batch_router, prefix='/api/v1')
+app.include_router(profiling_router, prefix='/api/v1')
+app.include_router(metrics_router)
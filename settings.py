@@ -6,3 +6,78 @@ TEST_DATABASE_URL = os.environ['TEST_DATABASE_URL']
 TASK_CREDENTIALS_FILE_PATH = 'creds.json'
 TASK_SHEET_URL = ('https://docs.google.com/spreadsheets/d/1CSA6uv3DJa383_CAvk'
                   'nhTmrDbIV3VtSz_WmfcCnFSyw/edit#gid=0')
+
+# Lease of the lock which keeps only one sheet synchronization run in flight,
+# it must outlive the longest expected run
+SYNC_LOCK_TIMEOUT = float(os.environ.get('SYNC_LOCK_TIMEOUT', 300))
+
+# Source of the menu sheet: 'google' for Google Sheets document or 'file'
+# for CSV/XLSX export stored locally
+TASK_SHEET_SOURCE = os.environ.get('TASK_SHEET_SOURCE', 'google')
+TASK_SHEET_FILE_PATH = os.environ.get('TASK_SHEET_FILE_PATH', 'menu.xlsx')
+TASK_SHEET_TIMEOUT = float(os.environ.get('TASK_SHEET_TIMEOUT', 30))
+TASK_SHEET_CHUNK_SIZE = int(os.environ.get('TASK_SHEET_CHUNK_SIZE', 500))
+
+# Number of the last sync runs which telemetry is kept in cache for
+SYNC_TELEMETRY_HISTORY = int(os.environ.get('SYNC_TELEMETRY_HISTORY', 100))
+
+# Maximum number of resource reads in one batch request
+BATCH_MAX_READS = int(os.environ.get('BATCH_MAX_READS', 100))
+
+# Compression levels of response bodies compressed once when cache entry is
+# filled
+CACHE_GZIP_LEVEL = int(os.environ.get('CACHE_GZIP_LEVEL', 6))
+CACHE_BROTLI_QUALITY = int(os.environ.get('CACHE_BROTLI_QUALITY', 5))
+
+# Profiling of single requests: requests carrying the token in X-Profile
+# header are profiled, as well as a sampled share of all requests. Profiling
+# is off while token is empty and sample rate is 0
+PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN', '')
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0))
+# Sampling interval of the profiler in seconds
+PROFILING_INTERVAL = float(os.environ.get('PROFILING_INTERVAL', 0.001))
+# Directory profiles are saved to, 'html' or 'speedscope' output and number
+# of the latest profiles kept there
+PROFILING_DIR = os.environ.get('PROFILING_DIR', 'profiles')
+PROFILING_FORMAT = os.environ.get('PROFILING_FORMAT', 'html')
+PROFILING_KEEP = int(os.environ.get('PROFILING_KEEP', 200))
+
+# Server-Timing header with Redis, Postgres, schema building and encoding
+# time of the request, and a JSON log line with the same timings per request
+SERVER_TIMING = os.environ.get('SERVER_TIMING', '1') == '1'
+SERVER_TIMING_LOG = os.environ.get('SERVER_TIMING_LOG', '0') == '1'
+
+# Statements of one request over the budget, or the same statement executed
+# more times than the repeat limit (N+1), are logged as warnings, sync runs
+# are checked against the repeat limit only. Strict mode raises instead, it
+# is enabled in tests. 0 disables a check
+QUERY_BUDGET = int(os.environ.get('QUERY_BUDGET', 20))
+QUERY_REPEAT_LIMIT = int(os.environ.get('QUERY_REPEAT_LIMIT', 5))
+QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT', '0') == '1'
+# Statements slower than this are logged with their parameters
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 200))
+
+# Cache invalidations are published to a Redis Stream and applied by the
+# consumer group: keys published within the window after the first one are
+# merged and deleted in pipelined batches of given size. Entries left
+# unacknowledged by a stopped consumer are claimed after the idle time
+INVALIDATION_WINDOW_MS = int(os.environ.get('INVALIDATION_WINDOW_MS', 50))
+INVALIDATION_BATCH_SIZE = int(os.environ.get('INVALIDATION_BATCH_SIZE', 500))
+INVALIDATION_CLAIM_IDLE_MS = int(
+    os.environ.get('INVALIDATION_CLAIM_IDLE_MS', 30000))
+
+# Attempts to patch cached trees in a WATCH/MULTI transaction after a write
+# before the entries are invalidated instead
+CACHE_PATCH_RETRIES = int(os.environ.get('CACHE_PATCH_RETRIES', 3))
+
+# Dish search results are cached for a short time instead of being
+# invalidated on writes, pages are limited to the maximum size
+DISH_SEARCH_CACHE_TTL = int(os.environ.get('DISH_SEARCH_CACHE_TTL', 30))
+DISH_SEARCH_MAX_LIMIT = int(os.environ.get('DISH_SEARCH_MAX_LIMIT', 100))
+
+# Tombstone mode: deleted menus are only marked and hidden from reads, purge
+# task run by beat every interval seconds removes their dishes, submenus and
+# the menus in batches of given size, each batch in its own transaction
+MENU_TOMBSTONES = os.environ.get('MENU_TOMBSTONES', '0') == '1'
+MENU_PURGE_BATCH_SIZE = int(os.environ.get('MENU_PURGE_BATCH_SIZE', 1000))
+MENU_PURGE_INTERVAL = float(os.environ.get('MENU_PURGE_INTERVAL', 30))
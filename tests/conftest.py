@@ -12,6 +12,8 @@ from sqlalchemy.sql import text
 
 import settings
 from app.db.session import get_db
+from app.db.session import get_redis as get_app_redis
+from app.services.cache.invalidation_consumer import InvalidationConsumer
 from main import app
 
 # create async engine for interaction with database
@@ -25,6 +27,9 @@ test_async_session = sessionmaker(
     class_=AsyncSession
 )
 
+# Routes going over query budget fail tests instead of logging a warning
+settings.QUERY_BUDGET_STRICT = True
+
 CLEAN_TABLES = [
     'menus', 'submenus', 'dishes'
 ]
@@ -97,6 +102,14 @@ async def redis_client() -> AsyncGenerator:
         yield redis
 
 
+async def _apply_invalidations(response) -> None:
+    """
+    Applies invalidations published by the request as the consumer would,
+    so tests read cache after every response without waiting for it
+    """
+    await InvalidationConsumer(get_app_redis(), 'tests').drain()
+
+
 @pytest.fixture(scope='function')
 async def client() -> AsyncGenerator[AsyncClient, Any]:
     """
@@ -107,7 +120,9 @@ async def client() -> AsyncGenerator[AsyncClient, Any]:
     app.dependency_overrides[get_db] = _get_test_db
 
     async with AsyncClient(app=app,
-                           base_url='http://localhost:8000') as client:
+                           base_url='http://localhost:8000',
+                           event_hooks={'response': [
+                               _apply_invalidations]}) as client:
         yield client
 
 
@@ -0,0 +1,61 @@
+import aioredis
+import pytest
+
+import settings
+from app.services.cache.cache_service import INVALIDATION_STREAM, CacheService
+from app.services.cache.invalidation_consumer import InvalidationConsumer
+
+
+class TestInvalidationConsumer:
+
+    # Test that keys published several times are deleted once with companions
+    @pytest.mark.asyncio
+    async def test_duplicates_are_merged(self,
+                                         redis_client: aioredis.Redis,
+                                         clean_cache):
+        cache = CacheService(redis_client)
+        await cache.set_value('menus', '[]', b'[]')
+        await cache.set_value('menu_id', '{}', b'{}')
+        for _ in range(10):
+            await cache.invalidate('menus', 'menu_id')
+
+        consumer = InvalidationConsumer(redis_client, 'test')
+        assert await consumer.drain() == 10
+        values = await redis_client.mget(
+            CacheService.make_delete_keys(['menus', 'menu_id']))
+        assert all(value is None for value in values)
+        assert await redis_client.xlen(INVALIDATION_STREAM) == 0
+
+    # Test that entries read by a stopped consumer are applied by another
+    @pytest.mark.asyncio
+    async def test_stale_entries_are_claimed(self,
+                                             redis_client: aioredis.Redis,
+                                             clean_cache,
+                                             monkeypatch):
+        monkeypatch.setattr(settings, 'INVALIDATION_CLAIM_IDLE_MS', 0)
+        cache = CacheService(redis_client)
+        await cache.set_value('menus', '[]', b'[]')
+        await cache.invalidate('menus')
+
+        stopped = InvalidationConsumer(redis_client, 'stopped')
+        await stopped.ensure_group()
+        assert len(await stopped.read_new(10, None)) == 1
+
+        await InvalidationConsumer(redis_client, 'test').drain()
+        assert await redis_client.get('menus') is None
+        assert await redis_client.xlen(INVALIDATION_STREAM) == 0
+
+    # Test that malformed entry is acknowledged and does not stop the others
+    @pytest.mark.asyncio
+    async def test_malformed_entry_is_skipped(self,
+                                              redis_client: aioredis.Redis,
+                                              clean_cache):
+        cache = CacheService(redis_client)
+        await cache.set_value('menus', '[]', b'[]')
+        await redis_client.xadd(INVALIDATION_STREAM, {'keys': 'not json'})
+        await redis_client.xadd(INVALIDATION_STREAM, {'other': '[]'})
+        await cache.invalidate('menus')
+
+        assert await InvalidationConsumer(redis_client, 'test').drain() == 3
+        assert await redis_client.get('menus') is None
+        assert await redis_client.xlen(INVALIDATION_STREAM) == 0
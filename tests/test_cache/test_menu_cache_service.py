@@ -216,7 +216,7 @@ class TestMenuCacheServiceUpdate(TestMenuCacheService):
         assert menu_new_cache['id'] == update_menu_json['id']
 
     @pytest.mark.asyncio
-    async def test_when_update_menu_then_menu_counts_cache_deletes(
+    async def test_when_update_menu_then_menu_counts_cache_patches(
             self,
             client: AsyncClient,
             redis_client: aioredis.Redis,
@@ -235,7 +235,9 @@ class TestMenuCacheServiceUpdate(TestMenuCacheService):
             await reverse('menu-patch', target_menu_id=menu.json()['id']),
             json={'title': 'new-title', 'description': 'new-description'})
         assert update_menu.status_code == 200
-        menu_new_counts_cache = await redis_client.get(
-            f"{menu.json()['id']}_counts")
-        assert menu_new_counts_cache is None
-        assert menu_new_counts_cache != menu_counts_cache
+        menu_new_counts_cache = json.loads(await redis_client.get(
+            f"{menu.json()['id']}_counts"))
+        assert menu_new_counts_cache['title'] == 'new-title'
+        assert menu_new_counts_cache['description'] == 'new-description'
+        assert menu_new_counts_cache['submenus_count'] == \
+            menu_counts.json()['submenus_count']
@@ -36,7 +36,7 @@ class TestSubmenuCacheServiceCreate(TestSubmenuCacheService):
         assert submenu_cache['id'] == submenu.json()['id']
 
     @pytest.mark.asyncio
-    async def test_when_create_submenu_then_menu_cache_deletes(
+    async def test_when_create_submenu_then_menu_cache_patches(
             self,
             client: AsyncClient,
             redis_client: aioredis.Redis,
@@ -74,21 +74,25 @@ class TestSubmenuCacheServiceCreate(TestSubmenuCacheService):
                                           'description': 'description'})
         assert submenu.status_code == 201
 
-        menu_cache_new = await redis_client.get(menu.json()['id'])
-        menu_submenus_cache_new = await redis_client.get(
-            f"{menu.json()['id']}_submenus")
-        menu_counts_cache_new = await redis_client.get(
-            f"{menu.json()['id']}_counts")
+        menu_cache_new = json.loads(
+            await redis_client.get(menu.json()['id']))
+        menu_submenus_cache_new = json.loads(
+            await redis_client.get(f"{menu.json()['id']}_submenus"))
+        menu_counts_cache_new = json.loads(
+            await redis_client.get(f"{menu.json()['id']}_counts"))
 
-        assert menu_cache_new is None
-        assert menu_submenus_cache_new is None
-        assert menu_counts_cache_new is None
+        assert menu_cache_new['submenus_count'] == \
+            menu_cache['submenus_count'] + 1
+        assert [json.loads(item)['id'] for item in menu_submenus_cache_new] \
+            == [submenu.json()['id']]
+        assert menu_counts_cache_new['submenus_count'] == \
+            menu_counts_cache['submenus_count'] + 1
 
 
 class TestSubmenuCacheServiceDelete:
 
     @pytest.mark.asyncio
-    async def test_when_delete_submenu_then_menu_cache_deletes(
+    async def test_when_delete_submenu_then_menu_cache_patches(
             self,
             client: AsyncClient,
             redis_client: aioredis.Redis,
@@ -111,10 +115,11 @@ class TestSubmenuCacheServiceDelete:
                                                        'id'],
                                                    target_submenu_id=submenu.json()['id']))
         assert delete.status_code == 200
-        assert await redis_client.get(f'{menu.json()}') is None
+        menu_cache = json.loads(await redis_client.get(f"{menu.json()['id']}"))
+        assert menu_cache['submenus_count'] == 0
 
     @pytest.mark.asyncio
-    async def test_when_delete_submenu_then_menu_submenus_cache_deletes(
+    async def test_when_delete_submenu_then_menu_submenus_cache_patches(
             self,
             client: AsyncClient,
             redis_client: aioredis.Redis,
@@ -139,10 +144,11 @@ class TestSubmenuCacheServiceDelete:
                                                        'id'],
                                                    target_submenu_id=submenu.json()['id']))
         assert delete.status_code == 200
-        assert await redis_client.get(f'{menu.json()["id"]}_submenus') is None
+        assert json.loads(
+            await redis_client.get(f'{menu.json()["id"]}_submenus')) == []
 
     @pytest.mark.asyncio
-    async def test_when_delete_submenu_then_menus_cache_deletes(
+    async def test_when_delete_submenu_then_menus_cache_patches(
             self,
             client: AsyncClient,
             redis_client: aioredis.Redis,
@@ -164,10 +170,12 @@ class TestSubmenuCacheServiceDelete:
                                                        'id'],
                                                    target_submenu_id=submenu.json()['id']))
         assert delete.status_code == 200
-        assert await redis_client.get('menus') is None
+        menus_cache = [json.loads(item) for item in
+                       json.loads(await redis_client.get('menus'))]
+        assert menus_cache[0]['submenus_count'] == 0
 
     @pytest.mark.asyncio
-    async def test_when_delete_submenu_then_menu_counts_cache_deletes(
+    async def test_when_delete_submenu_then_menu_counts_cache_patches(
             self,
             client: AsyncClient,
             redis_client: aioredis.Redis,
@@ -192,4 +200,6 @@ class TestSubmenuCacheServiceDelete:
                                                    target_menu_id=menu.json()[
                                                        'id']))
         assert delete.status_code == 200
-        assert await redis_client.get(f"{menu.json()['id']}_counts") is None
+        menu_counts_cache = json.loads(
+            await redis_client.get(f"{menu.json()['id']}_counts"))
+        assert menu_counts_cache['submenus_count'] == 0
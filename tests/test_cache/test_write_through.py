@@ -0,0 +1,72 @@
+import json
+
+import aioredis
+import pytest
+from httpx import AsyncClient
+
+from tests.test_routes.test_menu_depth import create_menu_tree
+from tests.utils import reverse
+
+
+async def warm_tree(client: AsyncClient, ids: dict) -> str:
+    """Reads entries holding the dish and returns url of the submenu"""
+    submenu_url = (f"/api/v1/menus/{ids['menu_id']}"
+                   f"/submenus/{ids['submenu_id']}")
+    for url in (await reverse('menus-read'),
+                await reverse('menu-read', target_menu_id=ids['menu_id']),
+                await reverse('menu-read-counts',
+                              target_menu_id=ids['menu_id']),
+                submenu_url, f'{submenu_url}/dishes'):
+        assert (await client.get(url)).status_code == 200
+    return submenu_url
+
+
+class TestWriteThrough:
+
+    # Test that changed dish is patched inside cached trees of its parents
+    @pytest.mark.asyncio
+    async def test_when_patch_dish_then_trees_patched(
+            self,
+            client: AsyncClient,
+            redis_client: aioredis.Redis,
+            clean_tables,
+            clean_cache):
+        ids = await create_menu_tree(client)
+        submenu_url = await warm_tree(client, ids)
+        response = await client.patch(
+            f"{submenu_url}/dishes/{ids['dish_id']}",
+            json={'title': 'new-title', 'description': 'description',
+                  'price': 100})
+        assert response.status_code == 200
+
+        dishes = json.loads(
+            await redis_client.get(f"{ids['submenu_id']}_dishes"))
+        assert json.loads(dishes[0])['title'] == 'new-title'
+        menu = json.loads(await redis_client.get(ids['menu_id']))
+        assert menu['submenus'][0]['dishes'][0]['title'] == 'new-title'
+        assert menu['dishes_count'] == 1
+        response = await client.get(f'{submenu_url}/dishes')
+        assert response.json()[0]['title'] == 'new-title'
+
+    # Test that created dish is appended and counts of its menu are shifted
+    @pytest.mark.asyncio
+    async def test_when_create_dish_then_counts_shifted(
+            self,
+            client: AsyncClient,
+            redis_client: aioredis.Redis,
+            clean_tables,
+            clean_cache):
+        ids = await create_menu_tree(client)
+        submenu_url = await warm_tree(client, ids)
+        response = await client.post(
+            f'{submenu_url}/dishes',
+            json={'title': 'second', 'description': 'description',
+                  'price': 50})
+        assert response.status_code == 201
+
+        counts = json.loads(await redis_client.get(f"{ids['menu_id']}_counts"))
+        assert counts['dishes_count'] == 2
+        submenu = json.loads(await redis_client.get(ids['submenu_id']))
+        assert submenu['dishes_count'] == 2
+        menus = json.loads(await redis_client.get('menus'))
+        assert json.loads(menus[0])['dishes_count'] == 2
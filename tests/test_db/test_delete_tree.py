@@ -0,0 +1,42 @@
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from app.db.models import Menu
+from app.db.repository.crud import MenuCrud
+from app.monitoring.queries import QueryAccount
+from tests.test_routes.test_menu_depth import create_menu_tree
+
+
+class TestDeleteTree:
+
+    # Test that menu, submenus and dishes go in one statement returning ids
+    @pytest.mark.asyncio
+    async def test_delete_menu_returns_ids(self,
+                                           client: AsyncClient,
+                                           async_session_test,
+                                           clean_tables,
+                                           clean_cache):
+        ids = await create_menu_tree(client)
+        account = QueryAccount('test')
+        with account.activate():
+            async with async_session_test() as session:
+                deleted = await MenuCrud(session).delete_tree(
+                    object_class=Menu, object_id=ids['menu_id'])
+
+        assert account.count == 1
+        assert deleted == {'menu': [UUID(ids['menu_id'])],
+                           'submenu': [UUID(ids['submenu_id'])],
+                           'dish': [UUID(ids['dish_id'])]}
+
+    # Test that deleting missing menu answers 404 and deletes nothing
+    @pytest.mark.asyncio
+    async def test_delete_missing_menu(self, async_session_test,
+                                       clean_tables):
+        async with async_session_test() as session:
+            with pytest.raises(HTTPException) as error:
+                await MenuCrud(session).delete_tree(object_class=Menu,
+                                                    object_id=uuid4())
+        assert error.value.status_code == 404
@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy import text
+
+from app.db.session import LazySession
+
+
+class TestLazySession:
+
+    # Test that session is not created when it is never used
+    @pytest.mark.asyncio
+    async def test_unused_session_is_not_created(self, async_session_test):
+        created = []
+
+        def session_factory():
+            created.append(True)
+            return async_session_test()
+
+        session = LazySession(session_factory)
+        await session.close()
+        assert created == []
+
+    # Test that session is created on first query and releases connection
+    @pytest.mark.asyncio
+    async def test_session_created_on_first_use(self, async_session_test):
+        session = LazySession(async_session_test)
+        assert session.session is None
+
+        result = await session.execute(text('SELECT 1'))
+        assert result.scalar() == 1
+        await session.commit()
+        assert session.session is not None
+        assert not session.in_transaction()
+        await session.close()
@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import text
+
+from app.monitoring.queries import QueryAccount, QueryBudgetExceeded
+
+
+class TestQueryBudget:
+
+    # Test that statements and their time are counted in active account
+    @pytest.mark.asyncio
+    async def test_statements_are_counted(self, async_session_test):
+        account = QueryAccount('test')
+        with account.activate():
+            async with async_session_test() as session:
+                await session.execute(text('SELECT 1'))
+                await session.execute(text('SELECT 2'))
+
+        assert account.count == 2
+        assert account.duration > 0
+        assert account.check() == []
+
+    # Test that strict account raises on the statement over the budget
+    @pytest.mark.asyncio
+    async def test_strict_budget(self, async_session_test):
+        account = QueryAccount('test', budget=2, strict=True)
+        with account.activate():
+            async with async_session_test() as session:
+                await session.execute(text('SELECT 1'))
+                await session.execute(text('SELECT 2'))
+                with pytest.raises(QueryBudgetExceeded):
+                    await session.execute(text('SELECT 3'))
+
+    # Test that the same statement executed in a loop is reported
+    @pytest.mark.asyncio
+    async def test_repeated_statement(self, async_session_test):
+        account = QueryAccount('test', repeat_limit=2)
+        with account.activate():
+            async with async_session_test() as session:
+                for number in range(3):
+                    await session.execute(text('SELECT :number'),
+                                          {'number': number})
+
+        problems = account.check()
+        assert len(problems) == 1
+        assert 'executed 3 times' in problems[0]
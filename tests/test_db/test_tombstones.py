@@ -0,0 +1,64 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+
+import settings
+from app.db.repository.utils import AdvancedMenuRepository
+from tests.test_routes.test_menu_depth import create_menu_tree
+from tests.utils import reverse
+
+
+class TestTombstones:
+
+    # Test that deleted menu is hidden at once and rows are purged by batches
+    @pytest.mark.asyncio
+    async def test_menu_hidden_then_purged(self,
+                                           client: AsyncClient,
+                                           async_session_test,
+                                           monkeypatch,
+                                           clean_tables,
+                                           clean_cache):
+        monkeypatch.setattr(settings, 'MENU_TOMBSTONES', True)
+        ids = await create_menu_tree(client)
+        response = await client.delete(
+            await reverse('menu-delete', target_menu_id=ids['menu_id']))
+        assert response.status_code == 200
+
+        response = await client.get(
+            await reverse('menu-read', target_menu_id=ids['menu_id']))
+        assert response.status_code == 404
+        response = await client.get(await reverse('menus-read'))
+        assert response.json() == []
+        response = await client.get(await reverse('dishes-read'))
+        assert response.json()['items'] == []
+        response = await client.delete(
+            await reverse('menu-delete', target_menu_id=ids['menu_id']))
+        assert response.status_code == 404
+
+        async with async_session_test() as session:
+            repository = AdvancedMenuRepository(session)
+            purged = [await repository.purge_deleted_menus(1)
+                      for _ in range(4)]
+            rows = (await session.execute(text(
+                'SELECT (SELECT count(*) FROM menus) + '
+                '(SELECT count(*) FROM submenus) + '
+                '(SELECT count(*) FROM dishes)'))).scalar()
+        assert purged == [1, 1, 1, 0]
+        assert rows == 0
+
+    # Test that submenu of deleted menu can not be deleted, as for patches
+    @pytest.mark.asyncio
+    async def test_submenu_of_deleted_menu_is_not_found(self,
+                                                        client: AsyncClient,
+                                                        monkeypatch,
+                                                        clean_tables,
+                                                        clean_cache):
+        monkeypatch.setattr(settings, 'MENU_TOMBSTONES', True)
+        ids = await create_menu_tree(client)
+        await client.delete(
+            await reverse('menu-delete', target_menu_id=ids['menu_id']))
+
+        response = await client.delete(
+            await reverse('submenu-delete', target_menu_id=ids['menu_id'],
+                          target_submenu_id=ids['submenu_id']))
+        assert response.status_code == 404
@@ -0,0 +1,55 @@
+import uuid
+
+import aioredis
+import pytest
+from httpx import AsyncClient
+
+from tests.test_routes.test_menu_depth import create_menu_tree
+from tests.utils import reverse
+
+
+class TestBatchRead:
+
+    # Test that objects of all types are read in one request in order
+    @pytest.mark.asyncio
+    async def test_batch_read(self,
+                              client: AsyncClient,
+                              redis_client: aioredis.Redis,
+                              clean_tables,
+                              clean_cache):
+        ids = await create_menu_tree(client)
+        await redis_client.flushdb()
+        missing_id = str(uuid.uuid4())
+        reads = [{'type': 'dish', 'id': ids['dish_id']},
+                 {'type': 'menu', 'id': ids['menu_id']},
+                 {'type': 'submenu', 'id': ids['submenu_id']},
+                 {'type': 'dish', 'id': missing_id}]
+
+        response = await client.post(await reverse('batch-read'),
+                                     json={'reads': reads})
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert [(result['id'], result['status']) for result in results] == [
+            (ids['dish_id'], 200), (ids['menu_id'], 200),
+            (ids['submenu_id'], 200), (missing_id, 404)]
+        assert results[0]['data']['price'] == '100.00'
+        assert results[1]['data']['dishes_count'] == 1
+        assert results[2]['data']['dishes_count'] == 1
+        assert results[3]['data'] is None
+        assert await redis_client.get(ids['menu_id']) is not None
+
+        cached_response = await client.post(await reverse('batch-read'),
+                                            json={'reads': reads})
+        assert cached_response.json() == response.json()
+
+    # Test that id of object of another type is not found
+    @pytest.mark.asyncio
+    async def test_batch_read_wrong_type(self,
+                                         client: AsyncClient,
+                                         clean_tables,
+                                         clean_cache):
+        ids = await create_menu_tree(client)
+        response = await client.post(
+            await reverse('batch-read'),
+            json={'reads': [{'type': 'dish', 'id': ids['menu_id']}]})
+        assert response.json()['results'][0]['status'] == 404
@@ -0,0 +1,57 @@
+import gzip
+
+import aioredis
+import brotli
+import pytest
+from httpx import AsyncClient
+
+from tests.test_routes.test_menu_depth import create_menu_tree
+from tests.utils import reverse
+
+
+class TestPrecompressedResponses:
+
+    # Test that cached menus list is sent with body compressed on fill
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('encoding, decompress', [
+        ('br', brotli.decompress),
+        ('gzip', gzip.decompress),
+    ])
+    async def test_menus_compressed(self,
+                                    client: AsyncClient,
+                                    redis_client: aioredis.Redis,
+                                    clean_tables,
+                                    clean_cache,
+                                    encoding,
+                                    decompress):
+        await create_menu_tree(client)
+        url = await reverse('menus-read')
+        identity = await client.get(url,
+                                    headers={'Accept-Encoding': 'identity'})
+        assert 'Content-Encoding' not in identity.headers
+
+        async with client.stream('GET', url, headers={
+                'Accept-Encoding': encoding}) as response:
+            raw_body = b''.join([chunk async for chunk
+                                 in response.aiter_raw()])
+        assert response.headers['Content-Encoding'] == encoding
+        assert response.headers['Vary'] == 'Accept-Encoding'
+        assert decompress(raw_body) == identity.content
+
+    # Test that compressed representation can be revalidated
+    @pytest.mark.asyncio
+    async def test_compressed_not_modified(self,
+                                           client: AsyncClient,
+                                           clean_tables,
+                                           clean_cache):
+        ids = await create_menu_tree(client)
+        url = await reverse('dish_read', target_menu_id=ids['menu_id'],
+                            target_submenu_id=ids['submenu_id'],
+                            target_dish_id=ids['dish_id'])
+        headers = {'Accept-Encoding': 'gzip'}
+        etag = (await client.get(url, headers=headers)).headers['ETag']
+        assert etag.endswith('-gzip"')
+
+        response = await client.get(url, headers={**headers,
+                                                  'If-None-Match': etag})
+        assert response.status_code == 304
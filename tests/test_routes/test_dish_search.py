@@ -0,0 +1,53 @@
+import aioredis
+import pytest
+from httpx import AsyncClient
+
+from tests.test_routes.test_menu_depth import create_menu_tree
+from tests.utils import reverse
+
+
+class TestDishSearch:
+
+    # Test that dishes are found by unfinished words with parents and prices
+    @pytest.mark.asyncio
+    async def test_search_by_prefix(self,
+                                    client: AsyncClient,
+                                    clean_tables,
+                                    clean_cache):
+        ids = await create_menu_tree(client)
+        response = await client.get(await reverse('dish-search'),
+                                    params={'q': 'tit desc'})
+        assert response.status_code == 200
+        assert response.json() == {
+            'items': [{'id': ids['dish_id'],
+                       'title': 'title',
+                       'description': 'description',
+                       'price': '100.00',
+                       'menu_id': ids['menu_id'],
+                       'submenu_id': ids['submenu_id']}],
+            'limit': 20,
+            'offset': 0,
+            'next_offset': None}
+
+        response = await client.get(await reverse('dish-search'),
+                                    params={'q': 'missing'})
+        assert response.json()['items'] == []
+
+    # Test that pages are cached with TTL and queries without words rejected
+    @pytest.mark.asyncio
+    async def test_search_cached_with_ttl(self,
+                                          client: AsyncClient,
+                                          redis_client: aioredis.Redis,
+                                          clean_tables,
+                                          clean_cache):
+        await create_menu_tree(client)
+        response = await client.get(await reverse('dish-search'),
+                                    params={'q': 'title', 'limit': 1})
+        assert response.status_code == 200
+        keys = await redis_client.keys('dish_search_*')
+        assert len(keys) == 1
+        assert 0 < await redis_client.ttl(keys[0])
+
+        response = await client.get(await reverse('dish-search'),
+                                    params={'q': '?!'})
+        assert response.status_code == 422
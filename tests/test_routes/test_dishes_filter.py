@@ -0,0 +1,71 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.sql import text
+
+from tests.test_routes.test_menu_depth import create_menu_tree
+from tests.utils import reverse
+
+
+async def create_dishes(client: AsyncClient) -> dict:
+    """Creates menu tree with dishes priced 100, 50 and 300"""
+    ids = await create_menu_tree(client)
+    for title, price in (('cheap', 50), ('expensive', 300)):
+        dish = await client.post(
+            await reverse('dish-create', target_menu_id=ids['menu_id'],
+                          target_submenu_id=ids['submenu_id']),
+            json={'title': title, 'description': 'description',
+                  'price': price})
+        ids[title] = dish.json()['id']
+    return ids
+
+
+class TestDishesFilter:
+
+    # Test that pages follow each other in price order without gaps
+    @pytest.mark.asyncio
+    async def test_keyset_pages(self,
+                                client: AsyncClient,
+                                clean_tables,
+                                clean_cache):
+        ids = await create_dishes(client)
+        first = await client.get(await reverse('dishes-read'),
+                                 params={'limit': 2})
+        assert first.status_code == 200
+        assert [dish['price'] for dish in first.json()['items']] == \
+            ['50.00', '100.00']
+        assert first.json()['items'][0]['menu_id'] == ids['menu_id']
+
+        second = await client.get(await reverse('dishes-read'), params={
+            'limit': 2, 'cursor': first.json()['next_cursor']})
+        assert [dish['id'] for dish in second.json()['items']] == \
+            [ids['expensive']]
+        assert second.json()['next_cursor'] is None
+
+        by_title = await client.get(await reverse('dishes-read'), params={
+            'sort': '-title', 'cursor': first.json()['next_cursor']})
+        assert by_title.status_code == 422
+
+    # Test that price filter uses discounted price and sale filter works
+    @pytest.mark.asyncio
+    async def test_price_and_sale_filters(self,
+                                          client: AsyncClient,
+                                          async_session_test,
+                                          clean_tables,
+                                          clean_cache):
+        ids = await create_dishes(client)
+        async with async_session_test() as session:
+            async with session.begin():
+                await session.execute(
+                    text('UPDATE dishes SET discount = 50 WHERE id = :id'),
+                    {'id': ids['expensive']})
+
+        response = await client.get(await reverse('dishes-read'), params={
+            'min_price': 100, 'max_price': 200, 'sort': '-price',
+            'submenu_id': ids['submenu_id']})
+        assert [dish['price'] for dish in response.json()['items']] == \
+            ['150.00', '100.00']
+
+        response = await client.get(await reverse('dishes-read'),
+                                    params={'on_sale': True})
+        assert [dish['id'] for dish in response.json()['items']] == \
+            [ids['expensive']]
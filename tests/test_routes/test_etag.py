@@ -0,0 +1,65 @@
+import aioredis
+import pytest
+from httpx import AsyncClient
+
+from tests.utils import reverse
+
+
+class TestConditionalRead:
+
+    # Test that cached menus list is answered with 304 for matching ETag
+    @pytest.mark.asyncio
+    async def test_menus_not_modified(self,
+                                      client: AsyncClient,
+                                      redis_client: aioredis.Redis,
+                                      clean_tables,
+                                      clean_cache):
+        url = await reverse('menus-read')
+        headers = {'Accept-Encoding': 'identity'}
+        await client.get(url, headers=headers)
+        response = await client.get(url, headers=headers)
+        etag = response.headers['ETag']
+        assert etag == await redis_client.get('menus_etag')
+
+        response = await client.get(url, headers={**headers,
+                                                  'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+        assert response.content == b''
+
+    # Test that ETag changes once cached entry is invalidated
+    @pytest.mark.asyncio
+    async def test_etag_changes_after_update(self,
+                                             client: AsyncClient,
+                                             redis_client: aioredis.Redis,
+                                             clean_tables,
+                                             clean_cache):
+        menu = await client.post(await reverse('menu-create'),
+                                 json={'title': 'title',
+                                       'description': 'description'})
+        url = await reverse('menu-read', target_menu_id=menu.json()['id'])
+        etag = (await client.get(url)).headers['ETag']
+
+        await client.patch(url, json={'title': 'new title',
+                                      'description': 'description'})
+        response = await client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.json()['title'] == 'new title'
+        assert response.headers['ETag'] != etag
+
+    # Test that deleting entry deletes its ETag too
+    @pytest.mark.asyncio
+    async def test_etag_deleted_with_entry(self,
+                                           client: AsyncClient,
+                                           redis_client: aioredis.Redis,
+                                           clean_tables,
+                                           clean_cache):
+        menu = await client.post(await reverse('menu-create'),
+                                 json={'title': 'title',
+                                       'description': 'description'})
+        menu_id = menu.json()['id']
+        assert await redis_client.get(f'{menu_id}_etag') is not None
+
+        await client.delete(await reverse('menu-delete',
+                                          target_menu_id=menu_id))
+        assert await redis_client.get(f'{menu_id}_etag') is None
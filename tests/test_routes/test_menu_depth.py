@@ -0,0 +1,96 @@
+import aioredis
+import pytest
+from httpx import AsyncClient
+
+from tests.utils import reverse
+
+
+async def create_menu_tree(client: AsyncClient) -> dict:
+    """Creates menu with one submenu and one dish and returns their ids"""
+    menu = await client.post(await reverse('menu-create'),
+                             json={'title': 'title',
+                                   'description': 'description'})
+    submenu = await client.post(
+        await reverse('submenu-create', target_menu_id=menu.json()['id']),
+        json={'title': 'title', 'description': 'description'})
+    dish = await client.post(
+        await reverse('dish-create',
+                      target_menu_id=menu.json()['id'],
+                      target_submenu_id=submenu.json()['id']),
+        json={'title': 'title', 'description': 'description', 'price': 100})
+    return {'menu_id': menu.json()['id'],
+            'submenu_id': submenu.json()['id'],
+            'dish_id': dish.json()['id']}
+
+
+class TestMenusDepth:
+
+    # Test that menu depth returns menus with counts and without submenus
+    @pytest.mark.asyncio
+    async def test_menu_depth(self,
+                              client: AsyncClient,
+                              clean_tables,
+                              clean_cache):
+        ids = await create_menu_tree(client)
+        response = await client.get(await reverse('menus-read'),
+                                    params={'depth': 'menu'})
+        assert response.status_code == 200
+        assert response.json() == [{'id': ids['menu_id'],
+                                    'title': 'title',
+                                    'description': 'description',
+                                    'dishes_count': 1,
+                                    'submenus_count': 1}]
+
+    # Test that submenu depth returns submenus with counts and without dishes
+    @pytest.mark.asyncio
+    async def test_submenu_depth(self,
+                                 client: AsyncClient,
+                                 clean_tables,
+                                 clean_cache):
+        ids = await create_menu_tree(client)
+        response = await client.get(await reverse('menus-read'),
+                                    params={'depth': 'submenu'})
+        submenus = response.json()[0]['submenus']
+        assert submenus == [{'id': ids['submenu_id'],
+                             'title': 'title',
+                             'description': 'description',
+                             'dishes_count': 1}]
+
+    # Test that only selected fields are returned and unknown are rejected
+    @pytest.mark.asyncio
+    async def test_fields_selection(self,
+                                    client: AsyncClient,
+                                    clean_tables,
+                                    clean_cache):
+        ids = await create_menu_tree(client)
+        response = await client.get(await reverse('menus-read'),
+                                    params={'depth': 'menu',
+                                            'fields': 'id,title'})
+        assert response.json() == [{'id': ids['menu_id'], 'title': 'title'}]
+
+        response = await client.get(await reverse('menus-read'),
+                                    params={'depth': 'menu',
+                                            'fields': 'submenus'})
+        assert response.status_code == 422
+
+    # Test that variant is cached and invalidated with menus list
+    @pytest.mark.asyncio
+    async def test_variant_cache_invalidated(self,
+                                             client: AsyncClient,
+                                             redis_client: aioredis.Redis,
+                                             clean_tables,
+                                             clean_cache):
+        ids = await create_menu_tree(client)
+        url = await reverse('menus-read')
+        await client.get(url, params={'depth': 'menu'})
+        assert await redis_client.hget('menus_variants', 'menu:') is not None
+
+        await client.post(
+            await reverse('dish-create',
+                          target_menu_id=ids['menu_id'],
+                          target_submenu_id=ids['submenu_id']),
+            json={'title': 'other', 'description': 'description',
+                  'price': 100})
+        assert await redis_client.exists('menus_variants') == 0
+        response = await client.get(url, params={'depth': 'menu'})
+        assert response.json()[0]['dishes_count'] == 2
@@ -0,0 +1,26 @@
+import pytest
+from httpx import AsyncClient
+
+from tests.test_routes.test_menu_depth import create_menu_tree
+from tests.utils import reverse
+
+
+class TestMetrics:
+
+    # Test that requests are measured by route template
+    @pytest.mark.asyncio
+    async def test_latency_by_route_template(self,
+                                             client: AsyncClient,
+                                             clean_tables,
+                                             clean_cache):
+        ids = await create_menu_tree(client)
+        await client.get(await reverse('menu-read',
+                                       target_menu_id=ids['menu_id']))
+
+        response = await client.get(await reverse('metrics-read'))
+        assert response.status_code == 200
+        assert ('http_request_duration_seconds_count{method="GET",'
+                'route="/api/v1/menus/{target_menu_id}",status="200"}'
+                ) in response.text
+        assert 'db_pool_checked_out_connections' in response.text
+        assert 'redis_pool_connections_in_use' in response.text
@@ -0,0 +1,86 @@
+import pytest
+from httpx import AsyncClient
+
+import settings
+from app.services.menu_services import MenuService
+from tests.utils import reverse
+
+
+@pytest.fixture
+def profiling(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, 'PROFILING_TOKEN', 'token')
+    monkeypatch.setattr(settings, 'PROFILING_SAMPLE_RATE', 0)
+    monkeypatch.setattr(settings, 'PROFILING_DIR', str(tmp_path))
+
+
+class TestProfiling:
+
+    # Test that request with token is profiled and profile is listed
+    @pytest.mark.asyncio
+    async def test_profiled_request_is_listed(self,
+                                              client: AsyncClient,
+                                              clean_tables,
+                                              clean_cache,
+                                              profiling):
+        url = await reverse('menus-read')
+        response = await client.get(url, headers={'X-Profile': 'token'})
+        assert response.status_code == 200
+        profile_name = response.headers['X-Profile-Id']
+
+        response = await client.get(await reverse('profiles-read'),
+                                    headers={'X-Profile': 'token'})
+        assert response.status_code == 200
+        assert [profile['name'] for profile in response.json()] == [
+            profile_name]
+
+        response = await client.get(
+            await reverse('profile-read', profile_name=profile_name),
+            headers={'X-Profile': 'token'})
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith('text/html')
+
+    # Test that requests without token in header are neither profiled nor
+    # listed
+    @pytest.mark.asyncio
+    async def test_requests_without_token(self,
+                                          client: AsyncClient,
+                                          clean_tables,
+                                          clean_cache,
+                                          profiling):
+        response = await client.get(await reverse('menus-read'),
+                                    headers={'X-Profile': 'wrong'})
+        assert 'X-Profile-Id' not in response.headers
+
+        response = await client.get(await reverse('menus-read'),
+                                    params={'profile': 'token'})
+        assert 'X-Profile-Id' not in response.headers
+
+        response = await client.get(await reverse('profiles-read'))
+        assert response.status_code == 404
+
+    # Test that request with token to cached route is handled by the service
+    @pytest.mark.asyncio
+    async def test_profiled_request_skips_response_cache(self,
+                                                         client: AsyncClient,
+                                                         clean_tables,
+                                                         clean_cache,
+                                                         profiling,
+                                                         monkeypatch):
+        url = await reverse('menus-read')
+        await client.get(url)
+
+        calls = []
+        read_many = MenuService.read_many
+
+        async def counted_read_many(service, *args, **kwargs):
+            calls.append(args)
+            return await read_many(service, *args, **kwargs)
+
+        monkeypatch.setattr(MenuService, 'read_many', counted_read_many)
+        await client.get(url)
+        assert calls == []
+
+        response = await client.get(url, headers={'X-Profile': 'token'})
+        assert response.status_code == 200
+        assert 'X-Profile-Id' in response.headers
+        assert len(calls) == 1
@@ -0,0 +1,81 @@
+import pytest
+from httpx import AsyncClient
+
+from app.db.session import get_db
+from main import app
+from tests.test_routes.test_menu_depth import create_menu_tree
+from tests.utils import reverse
+
+
+async def _get_unavailable_db():
+    raise AssertionError('Database session must not be opened')
+    yield
+
+
+class TestResponseCacheMiddleware:
+
+    # Test that cached responses are served without database session
+    @pytest.mark.asyncio
+    async def test_hit_skips_dependencies(self,
+                                          client: AsyncClient,
+                                          clean_tables,
+                                          clean_cache):
+        ids = await create_menu_tree(client)
+        urls = [
+            await reverse('menus-read'),
+            await reverse('menu-read', target_menu_id=ids['menu_id']),
+            await reverse('submenu-read-list',
+                          target_menu_id=ids['menu_id']),
+            await reverse('dish-list', target_menu_id=ids['menu_id'],
+                          target_submenu_id=ids['submenu_id']),
+        ]
+        expected = [(await client.get(url)).json() for url in urls]
+
+        db_override = app.dependency_overrides[get_db]
+        app.dependency_overrides[get_db] = _get_unavailable_db
+        try:
+            for url, body in zip(urls, expected):
+                response = await client.get(url)
+                assert response.status_code == 200
+                assert response.json() == body
+        finally:
+            app.dependency_overrides[get_db] = db_override
+
+    # Test that entry rewritten by service on update is served
+    @pytest.mark.asyncio
+    async def test_invalidated_entry_is_not_served(self,
+                                                   client: AsyncClient,
+                                                   clean_tables,
+                                                   clean_cache):
+        ids = await create_menu_tree(client)
+        url = await reverse('menu-read', target_menu_id=ids['menu_id'])
+        await client.get(url)
+        await client.patch(url, json={'title': 'new title',
+                                      'description': 'description'})
+
+        response = await client.get(url)
+        assert response.json()['title'] == 'new title'
+
+    # Test that cached submenu is not served as a menu or under other menu
+    @pytest.mark.asyncio
+    async def test_entry_of_other_path_is_not_served(self,
+                                                     client: AsyncClient,
+                                                     clean_tables,
+                                                     clean_cache):
+        ids = await create_menu_tree(client)
+        other_menu = await client.post(await reverse('menu-create'),
+                                       json={'title': 'other',
+                                             'description': 'description'})
+        submenu_url = await reverse('submenu_read',
+                                    target_menu_id=ids['menu_id'],
+                                    target_submenu_id=ids['submenu_id'])
+        assert (await client.get(submenu_url)).status_code == 200
+
+        response = await client.get(
+            await reverse('menu-read', target_menu_id=ids['submenu_id']))
+        assert response.status_code == 404
+        response = await client.get(
+            await reverse('submenu_read',
+                          target_menu_id=other_menu.json()['id'],
+                          target_submenu_id=ids['submenu_id']))
+        assert response.status_code == 404
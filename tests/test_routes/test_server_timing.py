@@ -0,0 +1,34 @@
+import re
+
+import pytest
+from httpx import AsyncClient
+
+from tests.test_routes.test_menu_depth import create_menu_tree
+from tests.utils import reverse
+
+
+def parse_server_timing(header: str) -> dict[str, str]:
+    # Descriptions are quoted and may contain commas
+    return dict(re.findall(r'(\w+);([^,"]*(?:"[^"]*")?)', header))
+
+
+class TestServerTiming:
+
+    # Test that miss reports database time and hit reports only Redis time
+    @pytest.mark.asyncio
+    async def test_miss_and_hit_breakdown(self,
+                                          client: AsyncClient,
+                                          clean_tables,
+                                          clean_cache):
+        ids = await create_menu_tree(client)
+        url = await reverse('menu-read', target_menu_id=ids['menu_id'])
+
+        miss = parse_server_timing((await client.get(url)).headers[
+            'Server-Timing'])
+        assert {'redis', 'db', 'schema', 'render', 'total'} <= set(miss)
+
+        hit = parse_server_timing((await client.get(url)).headers[
+            'Server-Timing'])
+        assert 'redis' in hit
+        assert 'db' not in hit
+        assert 'render' not in hit
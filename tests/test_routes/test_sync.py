@@ -0,0 +1,36 @@
+import aioredis
+import pytest
+from httpx import AsyncClient
+
+from app.services.cache.cache_service import SyncRunCacheService
+from app.services.task_services.telemetry import (
+    SyncTelemetry,
+    count,
+    sync_stage,
+)
+from tests.utils import reverse
+
+
+class TestSyncRuns:
+
+    # Test that telemetry of stored runs is returned newest first
+    @pytest.mark.asyncio
+    async def test_read_sync_runs(self,
+                                  client: AsyncClient,
+                                  redis_client: aioredis.Redis,
+                                  clean_cache):
+        cache = SyncRunCacheService(redis_client)
+        for rows in (10, 20):
+            telemetry = SyncTelemetry()
+            with telemetry.activate():
+                with sync_stage('sheet_download'):
+                    count('rows', rows)
+            telemetry.finish()
+            await cache.add_sync_run(telemetry.to_dict())
+
+        response = await client.get(await reverse('sync-runs-read'))
+        assert response.status_code == 200
+        runs = response.json()
+        assert [run['counters']['rows'] for run in runs] == [20, 10]
+        assert runs[0]['outcome'] == 'success'
+        assert 'sheet_download' in runs[0]['stages']
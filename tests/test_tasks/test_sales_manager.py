@@ -0,0 +1,98 @@
+import json
+from uuid import UUID
+
+import aioredis
+import pytest
+from httpx import AsyncClient
+
+from app.db.repository.utils import AdvancedMenuRepository
+from app.services.task_services.sales_manager import SalesManager
+from tests.utils import reverse
+
+
+async def create_dishes(client: AsyncClient, titles: list[str]) -> dict:
+    """Creates dishes in one submenu and returns their ids with parent ids"""
+    menu = await client.post(await reverse('menu-create'),
+                             json={'title': 'title',
+                                   'description': 'description'})
+    submenu = await client.post(
+        await reverse('submenu-create', target_menu_id=menu.json()['id']),
+        json={'title': 'title', 'description': 'description'})
+    dishes = {}
+    for title in titles:
+        dish = await client.post(
+            await reverse('dish-create',
+                          target_menu_id=menu.json()['id'],
+                          target_submenu_id=submenu.json()['id']),
+            json={'title': title, 'description': 'description', 'price': 100})
+        dishes[title] = dish.json()['id']
+    dishes['menu_id'] = menu.json()['id']
+    dishes['submenu_id'] = submenu.json()['id']
+    return dishes
+
+
+class TestSalesManager:
+
+    # Test that all sale dishes ids are resolved in one batch
+    @pytest.mark.asyncio
+    async def test_sale_dishes_ids_are_resolved(
+            self,
+            client: AsyncClient,
+            async_session_test,
+            redis_client: aioredis.Redis,
+            clean_tables,
+            clean_cache):
+        dishes = await create_dishes(client, ['first', 'second'])
+        sheet_sales = [
+            {'title': 'first', 'description': 'description', 'sale': '10'},
+            {'title': 'second', 'description': 'description', 'sale': '20'},
+            {'title': 'missing', 'description': 'description', 'sale': '5'},
+        ]
+        async with async_session_test() as session:
+            sales_manager = SalesManager(redis_client,
+                                         AdvancedMenuRepository(session))
+            sales = await sales_manager.create_new_sales(sheet_sales)
+
+        assert sales == {UUID(dishes['first']): 10.0,
+                         UUID(dishes['second']): 20.0}
+
+    # Test that effective price is patched into cached entries with the dish
+    @pytest.mark.asyncio
+    async def test_sale_prices_are_patched_in_cache(
+            self,
+            client: AsyncClient,
+            async_session_test,
+            redis_client: aioredis.Redis,
+            clean_tables,
+            clean_cache):
+        dishes = await create_dishes(client, ['first', 'second'])
+        dishes_url = await reverse('dish-list',
+                                   target_menu_id=dishes['menu_id'],
+                                   target_submenu_id=dishes['submenu_id'])
+        await client.get(dishes_url)
+        await client.get(await reverse('menus-read'))
+        async with async_session_test() as session:
+            sales_manager = SalesManager(redis_client,
+                                         AdvancedMenuRepository(session))
+            await sales_manager.update_sales([
+                {'title': 'first', 'description': 'description', 'sale': '10'}
+            ])
+
+        cached_dishes = [json.loads(dish) for dish in json.loads(
+            await redis_client.get(f"{dishes['submenu_id']}_dishes"))]
+        assert {dish['title']: dish['price'] for dish in cached_dishes} == {
+            'first': '90.00', 'second': '100.00'}
+        cached_menus = json.loads(await redis_client.get('menus'))
+        assert '"90.00"' in cached_menus[0]
+        response = await client.get(dishes_url)
+        assert {dish['title']: dish['price'] for dish in response.json()} == {
+            'first': '90.00', 'second': '100.00'}
+
+        async with async_session_test() as session:
+            await SalesManager(redis_client, AdvancedMenuRepository(session)
+                               ).update_sales([])
+
+        response = await client.get(
+            await reverse('menus-read'))
+        dish = response.json()[0]['submenus'][0]['dishes'][0]
+        assert dish['price'] == '100.00'
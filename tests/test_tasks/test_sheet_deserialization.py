@@ -0,0 +1,59 @@
+import pytest
+
+from app.services.task_services.sheet_deserialization_service import (
+    SheetDeserializationService,
+)
+from app.services.task_services.task import prefetch_rows
+
+SHEET_ROWS = [
+    ['1', 'Menu 1', 'Menu description', '', '', '', ''],
+    ['', '1', 'Submenu 1', 'Submenu description', '', '', ''],
+    ['', '', '1', 'Dish 1', 'Dish description', '12,50', '10'],
+    ['2', 'Menu 2', 'Menu description', '', '', '', ''],
+    ['', '1', 'Submenu 2', 'Submenu description', '', '', ''],
+    ['', '', '1', 'Dish 2', 'Dish description', '100', ''],
+]
+
+
+async def iterate_rows(rows: list[list]):
+    for row in rows:
+        yield row
+
+
+class TestSheetDeserializationStream:
+
+    # Test that menu subtree is yielded before rows of the next menu are read
+    @pytest.mark.asyncio
+    async def test_menu_is_yielded_when_next_menu_starts(self):
+        consumed_rows = []
+
+        async def tracked_rows():
+            for row in SHEET_ROWS:
+                consumed_rows.append(row)
+                yield row
+
+        sales: list[dict] = []
+        menus = SheetDeserializationService.iterate_menus_from_sheet_rows(
+            tracked_rows(), sales)
+
+        first_menu = await menus.__anext__()
+        assert first_menu['title'] == 'Menu 1'
+        assert first_menu['submenus'][0]['dishes'][0]['price'] == 12.5
+        assert len(consumed_rows) == 4
+
+        second_menu = await menus.__anext__()
+        assert second_menu['title'] == 'Menu 2'
+        assert sales == [{'title': 'Dish 1',
+                          'description': 'Dish description',
+                          'sale': '10'}]
+
+    # Test that streaming and whole sheet deserialization build the same tree
+    @pytest.mark.asyncio
+    async def test_stream_matches_whole_sheet_deserialization(self):
+        sales: list[dict] = []
+        menus = [menu async for menu in
+                 SheetDeserializationService.iterate_menus_from_sheet_rows(
+                     prefetch_rows(iterate_rows(SHEET_ROWS), 2), sales)]
+        objects = (await SheetDeserializationService
+                   .create_objects_from_sheet_rows(SHEET_ROWS))
+        assert objects == {'menus': menus, 'sales': sales}
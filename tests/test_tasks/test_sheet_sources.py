@@ -0,0 +1,38 @@
+import csv
+
+import pytest
+
+from app.services.task_services.sheet_parsing_service import (
+    LocalFileSheetSource,
+)
+
+SHEET_ROWS = [
+    ['1', 'Menu', 'Menu description'],
+    ['', '1', 'Submenu', 'Submenu description'],
+    ['', '', '1', 'Dish', 'Dish description', '12,50', '10'],
+]
+
+
+class TestLocalFileSheetSource:
+
+    # Test that rows are read from csv file in chunks and padded to sheet width
+    @pytest.mark.asyncio
+    async def test_csv_rows_are_streamed_normalized(self, tmp_path):
+        path = tmp_path / 'menu.csv'
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            csv.writer(file).writerows(SHEET_ROWS)
+
+        source = LocalFileSheetSource(str(path), chunk_size=2)
+        rows = await source.parse_sheet()
+
+        assert len(rows) == len(SHEET_ROWS)
+        assert all(len(row) == 7 for row in rows)
+        assert rows[0] == ['1', 'Menu', 'Menu description', '', '', '', '']
+        assert rows[2][5] == '12,50'
+
+    # Test that unsupported file format is rejected
+    @pytest.mark.asyncio
+    async def test_unsupported_format_raises_exception(self, tmp_path):
+        source = LocalFileSheetSource(str(tmp_path / 'menu.json'))
+        with pytest.raises(ValueError):
+            await source.parse_sheet()
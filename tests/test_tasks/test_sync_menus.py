@@ -0,0 +1,56 @@
+import aioredis
+import pytest
+from fastapi import BackgroundTasks
+from httpx import AsyncClient
+
+from app.db.repository.utils import AdvancedMenuRepository
+from app.services.task_services.menu_utils import MenuSyncHelper
+from app.services.task_services.task import (
+    prefetch_rows,
+    synchronize_menus_with_sheet_rows,
+)
+from tests.test_routes.test_menu_depth import create_menu_tree
+from tests.utils import reverse
+
+# Menu created by create_menu_tree with changed dish price, followed by the
+# first row of the next menu, so the changed menu is synchronized
+CHANGED_MENU_ROWS = [
+    ['1', 'title', 'description', '', '', '', ''],
+    ['', '1', 'title', 'description', '', '', ''],
+    ['', '', '1', 'title', 'description', '200', ''],
+    ['2', 'Menu 2', 'Menu description', '', '', '', ''],
+]
+
+
+async def broken_download():
+    for row in CHANGED_MENU_ROWS:
+        yield row
+    raise TimeoutError('Sheet download timed out')
+
+
+class TestSynchronizeMenus:
+
+    # Test that changed menu is replaced at once and download failure does
+    # not leave its old copy
+    @pytest.mark.asyncio
+    async def test_changed_menu_is_replaced_before_failure(
+            self,
+            client: AsyncClient,
+            async_session_test,
+            redis_client: aioredis.Redis,
+            clean_tables,
+            clean_cache):
+        ids = await create_menu_tree(client)
+        async with async_session_test() as session:
+            db_manager = AdvancedMenuRepository(session)
+            sync_helper = MenuSyncHelper(db_manager, redis_client,
+                                         BackgroundTasks())
+            with pytest.raises(TimeoutError):
+                await synchronize_menus_with_sheet_rows(
+                    prefetch_rows(broken_download(), 2), db_manager,
+                    sync_helper)
+
+        menus = (await client.get(await reverse('menus-read'))).json()
+        assert len(menus) == 1
+        assert menus[0]['id'] != ids['menu_id']
+        assert menus[0]['submenus'][0]['dishes'][0]['price'] == '200.00'
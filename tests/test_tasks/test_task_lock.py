@@ -0,0 +1,34 @@
+import aioredis
+import pytest
+
+from celery_conf.helpers.task_lock import TaskRunLock
+
+
+class TestTaskRunLock:
+
+    # Test that second run can not take the lease while first holds it
+    @pytest.mark.asyncio
+    async def test_lock_is_exclusive(self,
+                                     redis_client: aioredis.Redis,
+                                     clean_cache):
+        first = TaskRunLock(redis_client, 'test_task', 10)
+        second = TaskRunLock(redis_client, 'test_task', 10)
+        assert await first.acquire() is True
+        assert await second.acquire() is False
+        assert await second.release() is False
+        assert await first.release() is True
+        assert await second.acquire() is True
+
+    # Test that runs requested during one run are coalesced into one follow-up
+    @pytest.mark.asyncio
+    async def test_follow_ups_are_coalesced_and_counted(
+            self,
+            redis_client: aioredis.Redis,
+            clean_cache):
+        lock = TaskRunLock(redis_client, 'test_task', 10)
+        assert await lock.request_follow_up() is True
+        assert await lock.request_follow_up() is False
+        assert await lock.request_follow_up() is False
+        assert await lock.get_stats() == {'queued': 1, 'skipped': 2}
+        assert await lock.pop_follow_up() is True
+        assert await lock.pop_follow_up() is False